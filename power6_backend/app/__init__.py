@@ -1,3 +1,11 @@
-from .main import app
-
 __all__ = ["app"]
+
+
+def __getattr__(name):
+    # Build the ASGI app only when it is asked for (``from app import app``), so
+    # scripts and the migrations CLI importing ``app.*`` skip router set-up.
+    if name == "app":
+        from .main import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
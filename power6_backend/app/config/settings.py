@@ -1,5 +1,11 @@
 import os
-from typing import List, Optional
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+# Same .env that app.database loads; read here too so settings never race it
+load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
 
 class Settings:
     # --- Stripe core ---
@@ -38,9 +44,70 @@ class Settings:
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60))
     REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 7))
 
+    # --- Password hashing (bcrypt) ---
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    HASH_WORKERS: int = int(os.getenv("HASH_WORKERS", 2))
+    HASH_MAX_PENDING: int = int(os.getenv("HASH_MAX_PENDING", 64))
+
+    # --- Authenticated user cache ---
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", 60))
+    USER_CACHE_MAX_ENTRIES: int = int(os.getenv("USER_CACHE_MAX_ENTRIES", 10000))
+    # Tier/admin claims in an access token are trusted for this long after it
+    # was issued; older tokens are re-checked against the cache/users table
+    TOKEN_CLAIMS_MAX_AGE_SECONDS: float = float(os.getenv("TOKEN_CLAIMS_MAX_AGE_SECONDS", 60))
+
+    # --- Pro analytics cache ---
+    # Redis entries are invalidated for every worker, so they can live long
+    ANALYTICS_CACHE_TTL_SECONDS: float = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", 300))
+    # In-process entries are only invalidated on the worker that handled the
+    # write; this TTL bounds how stale the other workers can be
+    ANALYTICS_CACHE_LOCAL_TTL_SECONDS: float = float(os.getenv("ANALYTICS_CACHE_LOCAL_TTL_SECONDS", 15))
+    ANALYTICS_CACHE_MAX_ENTRIES: int = int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", 5000))
+    # Optional shared backend (redis://...); empty keeps the cache in process
+    ANALYTICS_CACHE_REDIS_URL: Optional[str] = os.getenv("ANALYTICS_CACHE_REDIS_URL") or None
+
+    # --- Analytics event write-behind buffer ---
+    EVENT_BUFFER_MAX_EVENTS: int = int(os.getenv("EVENT_BUFFER_MAX_EVENTS", 10000))
+    EVENT_FLUSH_BATCH_SIZE: int = int(os.getenv("EVENT_FLUSH_BATCH_SIZE", 500))
+    EVENT_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("EVENT_FLUSH_INTERVAL_SECONDS", 1.0))
+    EVENT_BATCH_MAX_ITEMS: int = int(os.getenv("EVENT_BATCH_MAX_ITEMS", 100))
+
+    # --- Daily new-task quota (see app/services/task_quota.py) ---
+    DAILY_NEW_TASK_LIMIT: int = int(os.getenv("DAILY_NEW_TASK_LIMIT", 6))
+    # Per-tier overrides, e.g. "pro=10,elite=20,admin=1000"
+    DAILY_NEW_TASK_LIMITS: Optional[str] = os.getenv("DAILY_NEW_TASK_LIMITS")
+
+    # --- POST /tasks/bulk ---
+    TASK_BULK_MAX_OPERATIONS: int = int(os.getenv("TASK_BULK_MAX_OPERATIONS", 100))
+
+    # --- user_events retention (see app/services/event_partitions.py) ---
+    EVENT_RETENTION_DAYS: int = int(os.getenv("EVENT_RETENTION_DAYS", 395))
+    EVENT_ARCHIVE_DIR: str = os.getenv("EVENT_ARCHIVE_DIR", "archive/user_events")
+    EVENT_PARTITION_MONTHS_AHEAD: int = int(os.getenv("EVENT_PARTITION_MONTHS_AHEAD", 3))
+
     # --- CORS / DB ---
     ALLOWED_ORIGINS: Optional[str] = os.getenv("ALLOWED_ORIGINS", "*")
     DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
+    # Async engine for async routes; set 0 to serve everything from the sync engine
+    DB_ASYNC_ENABLED: bool = os.getenv("DB_ASYNC_ENABLED", "1").lower() not in {"0", "false", "no"}
+
+    # Apply pending schema migrations during app startup instead of via
+    # `python -m app.migrations upgrade`; unset means only for SQLite
+    DB_MIGRATE_ON_BOOT: Optional[bool] = (
+        None
+        if not os.getenv("DB_MIGRATE_ON_BOOT", "").strip()
+        else os.getenv("DB_MIGRATE_ON_BOOT", "").lower() not in {"0", "false", "no"}
+    )
+
+    # --- DB connection pool (applies to each engine, sync and async) ---
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    # Recycle before managed Postgres proxies drop idle connections; -1 disables
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "1").lower() not in {"0", "false", "no"}
+    # Server-side statement_timeout in milliseconds (Postgres only); 0 disables
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
 
     # --- Apple App Store Server API ---
     APPLE_IAP_ISSUER_ID: Optional[str] = os.getenv("APPLE_IAP_ISSUER_ID")
@@ -56,4 +123,13 @@ class Settings:
             return ["*"]
         return [o.strip() for o in raw.split(",") if o.strip()]
 
+    @property
+    def daily_new_task_limits(self) -> Dict[str, int]:
+        limits: Dict[str, int] = {}
+        for item in (self.DAILY_NEW_TASK_LIMITS or "").split(","):
+            tier, sep, value = item.partition("=")
+            if sep and tier.strip() and value.strip():
+                limits[tier.strip().lower()] = int(value)
+        return limits
+
 settings = Settings()
@@ -1,9 +1,17 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 import os
 from dotenv import load_dotenv
 from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar, Union
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config.settings import settings
+from app.utils.db_pool import engine_options, pool_status, statement_timeout_connect_args
+from app.utils.metrics import register_metrics
 
 # Explicit path to .env in Power6Backend
 env_path = Path(__file__).resolve().parent.parent / ".env"
@@ -14,7 +22,13 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL is None:
     raise ValueError("DATABASE_URL is not set in the .env file")
 
-engine = create_engine(DATABASE_URL)
+_backend = make_url(DATABASE_URL).get_backend_name()
+
+engine = create_engine(
+    DATABASE_URL,
+    connect_args=statement_timeout_connect_args(_backend),
+    **engine_options(_backend),
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -25,3 +39,103 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ---------------------------------------------------------------------------
+# Async engine (asyncpg on Postgres, aiosqlite on SQLite)
+# ---------------------------------------------------------------------------
+
+T = TypeVar("T")
+
+
+def _async_url(url: str) -> tuple[Optional[str], dict]:
+    """Map a sync DATABASE_URL onto its async driver, plus any connect_args."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    connect_args: dict = {}
+
+    if backend == "postgresql":
+        query = dict(parsed.query)
+        sslmode = query.pop("sslmode", None)
+        if sslmode:
+            # asyncpg takes ``ssl`` instead of libpq's ``sslmode``
+            connect_args["ssl"] = sslmode
+        parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    else:
+        return None, connect_args
+    return parsed.render_as_string(hide_password=False), connect_args
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC_ENABLED:
+    try:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        ASYNC_DATABASE_URL, _async_connect_args = _async_url(DATABASE_URL)
+        if ASYNC_DATABASE_URL:
+            _async_connect_args.update(statement_timeout_connect_args(_backend, is_async=True))
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                connect_args=_async_connect_args,
+                **engine_options(_backend, is_async=True),
+            )
+            AsyncSessionLocal = async_sessionmaker(
+                async_engine,
+                autoflush=False,
+                expire_on_commit=False,
+            )
+    except ImportError as _e:  # async driver not installed; keep serving on the sync path
+        print("database: async engine disabled:", _e)
+        async_engine = None
+        AsyncSessionLocal = None
+
+def db_pool_stats() -> dict:
+    return {
+        "sync": pool_status(engine.pool),
+        "async": pool_status(async_engine.sync_engine.pool if async_engine is not None else None),
+    }
+
+
+register_metrics("db_pool", db_pool_stats)
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    DbSession = Union[AsyncSession, Session]
+except ImportError:  # pragma: no cover
+    AsyncSession = None  # type: ignore[assignment,misc]
+    DbSession = Session  # type: ignore[misc]
+
+
+async def get_async_db():
+    """Request-scoped session for ``async def`` routes.
+
+    Yields an AsyncSession when the async engine is available, otherwise a
+    plain Session (DB_ASYNC_ENABLED=0 or missing driver). Either way, route
+    code hands its ORM work to ``run_db``.
+    """
+    if AsyncSessionLocal is None:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+        return
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def run_db(db: Any, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``fn(sync_session, *args, **kwargs)`` without blocking the event loop.
+
+    On an AsyncSession this is ``run_sync`` (sync ORM code over the async
+    driver); on a plain Session it falls back to the threadpool.
+    """
+    if AsyncSession is not None and isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
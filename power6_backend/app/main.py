@@ -1,132 +1,39 @@
 from __future__ import annotations
 
 import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
-from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
 
 # --- DB imports (safe on local/test) ---
 try:
-    from app.database import Base, engine  # type: ignore
+    from app.database import engine  # type: ignore
+    from app.migrations import check_schema
 except ImportError:  # pragma: no cover
-    Base = None
     engine = None
 
 # --- Core routers ---
 from app.routes import api_router
+from app.services.event_buffer import event_buffer
+from app.utils.routing import ApiPrefixMiddleware
 try:
     from app.routes.stripe import router as stripe_router
 except Exception:  # pragma: no cover
     stripe_router = None  # type: ignore
 
 
-# ---------------------------------------------------------------------------
-# Minimal bootstrap migration so fresh DBs don't miss critical columns
-# ---------------------------------------------------------------------------
-
-from sqlalchemy import inspect
-
-def _bootstrap_migrations(db_engine) -> None:
-    """Ensure critical columns exist in production DB.
-
-    Uses SQLAlchemy's inspector to avoid IDE SQL warnings and to work
-    regardless of whether a schema name is configured. Falls back to
-    direct ALTER TABLE if needed.
-    """
-    if not db_engine:
-        return
-
-    schema = os.getenv("DB_SCHEMA", "public").strip() or None
-
-    try:
-        inspector = inspect(db_engine)
-        # Prefer explicit schema if provided; also check default schema
-        tables = set()
-        try:
-            if schema:
-                tables.update(inspector.get_table_names(schema=schema))
-        except Exception:
-            pass
-        try:
-            tables.update(inspector.get_table_names())
-        except Exception:
-            pass
-
-        target_table = "tasks"
-        has_tasks = target_table in tables
-
-        with db_engine.begin() as conn:
-            if not has_tasks:
-                # If table not visible via inspector (permissions/caching), try creating metadata at least
-                # but don't create here—`Base.metadata.create_all` above handles that. Continue column path.
-                pass
-
-            # Collect existing column names (try both with and without schema)
-            existing_cols = set()
-            try:
-                if schema:
-                    existing_cols.update(c["name"] for c in inspector.get_columns(target_table, schema=schema))
-            except Exception:
-                pass
-            try:
-                existing_cols.update(c["name"] for c in inspector.get_columns(target_table))
-            except Exception:
-                pass
-
-            # Ensure core columns exist
-            ident = f'{schema+"." if schema else ""}{target_table}'
-
-            def ensure(col: str, ddl: str):
-                try:
-                    if col not in existing_cols:
-                        conn.execute(text(f"ALTER TABLE {ident} ADD COLUMN IF NOT EXISTS {col} {ddl}"))
-                        existing_cols.add(col)
-                except Exception as _e:
-                    # continue boot even if one statement fails
-                    print(f"bootstrap: skip {col}:", _e)
-
-            ensure("reviewed_at",  "timestamptz NULL")
-            ensure("scheduled_for", "timestamptz NULL")
-            ensure("streak_bound",  "boolean NOT NULL DEFAULT true")
-            ensure("completed_at",  "timestamptz NULL")
-            ensure("updated_at",    "timestamptz NULL")
-
-            if db_engine.dialect.name == "postgresql":
-                try:
-                    conn.execute(text("""
-                        DO $$
-                        DECLARE
-                            constraint_name text;
-                        BEGIN
-                            SELECT conname INTO constraint_name
-                            FROM pg_constraint
-                            WHERE conrelid = 'subscriptions'::regclass
-                              AND contype = 'f'
-                              AND pg_get_constraintdef(oid) LIKE '%REFERENCES users%';
-
-                            IF constraint_name IS NOT NULL THEN
-                                EXECUTE format('ALTER TABLE subscriptions DROP CONSTRAINT IF EXISTS %I', constraint_name);
-                            END IF;
-
-                            ALTER TABLE subscriptions
-                            ADD CONSTRAINT subscriptions_user_id_fkey
-                            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
-                        END $$;
-                    """))
-                except Exception as _e:
-                    print("bootstrap: skip subscriptions FK cascade:", _e)
-
-    except SQLAlchemyError as e:  # pragma: no cover
-        print("⚠️  Skipped bootstrap migration:", e)
-
-
-# ---------------------------------------------------------------------------
-# Application factory
-# ---------------------------------------------------------------------------
+@asynccontextmanager
+async def _lifespan(_application: FastAPI):
+    yield
+    # flush (not close) the write-behind buffer so a later app instance in the
+    # same process keeps working; the atexit hook closes it for good
+    await run_in_threadpool(event_buffer.flush)
+
 
 def build_app() -> FastAPI:
-    application = FastAPI(title="Power6 API")
+    application = FastAPI(title="Power6 API", lifespan=_lifespan)
 
     # --- CORS ---
     # Allow a strict list in prod, but enable a one-switch wildcard for debugging
@@ -170,30 +77,22 @@ def build_app() -> FastAPI:
     application.add_middleware(CORSMiddleware, **cors_kwargs)
 
     # --- Routes ---
-    application.include_router(api_router, prefix="")
-    application.include_router(api_router, prefix="/api")
+    # Mounted once; /api/... is served by the same routes via the middleware
+    application.add_middleware(ApiPrefixMiddleware, prefix="/api")
+    application.include_router(api_router)
 
     if stripe_router is not None:
         application.include_router(stripe_router, prefix="/stripe")
-        application.include_router(stripe_router, prefix="/api/stripe")
 
-    # --- DB metadata + bootstrap ---
-    if Base is not None and engine is not None:
-        try:
-            Base.metadata.create_all(bind=engine)  # type: ignore[attr-defined]
-        except SQLAlchemyError:
-            pass
-        _bootstrap_migrations(engine)
+    # --- Schema version check (migrations run via `python -m app.migrations upgrade`) ---
+    if engine is not None:
+        check_schema(engine)
 
     # --- Health checks ---
     @application.get("/health")
     def health() -> dict[str, str]:
         return {"status": "ok"}
 
-    @application.get("/api/health")
-    def api_health() -> dict[str, str]:
-        return {"status": "ok"}
-
     return application
 
 
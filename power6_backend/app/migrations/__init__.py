@@ -0,0 +1,13 @@
+from .runner import applied, check_schema, current_version, schema_migrations, upgrade
+from .versions import HEAD_VERSION, MIGRATIONS, Migration
+
+__all__ = [
+    "HEAD_VERSION",
+    "MIGRATIONS",
+    "Migration",
+    "applied",
+    "check_schema",
+    "current_version",
+    "schema_migrations",
+    "upgrade",
+]
@@ -0,0 +1,43 @@
+"""Schema migration CLI.
+
+    python -m app.migrations upgrade [--to VERSION]
+    python -m app.migrations current
+    python -m app.migrations history
+"""
+
+import argparse
+
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.migrations import HEAD_VERSION, MIGRATIONS, applied, current_version, upgrade
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+    up = sub.add_parser("upgrade", help="apply pending migrations")
+    up.add_argument("--to", type=int, default=None, help="stop at this version")
+    sub.add_parser("current", help="print the applied and head versions")
+    sub.add_parser("history", help="list migrations and when they were applied")
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        versions = upgrade(engine, args.to)
+        print(f"Applied {versions or 'nothing'}; schema at version {current_version(engine)}")
+        if engine.dialect.name == "postgresql":
+            from app.services.event_partitions import ensure_partitions
+
+            with Session(engine) as db:
+                ensure_partitions(db)
+    elif args.command == "current":
+        print(f"current={current_version(engine)} head={HEAD_VERSION}")
+    else:
+        done = {version: applied_at for version, _name, applied_at in applied(engine)}
+        for migration in MIGRATIONS:
+            when = done.get(migration.version)
+            print(f"{migration.version:>4}  {'applied ' + when.isoformat() if when else 'pending':<40} {migration.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Apply ``versions.MIGRATIONS`` and record them in ``schema_migrations``.
+
+``upgrade`` runs from the CLI once per deploy. Worker boot only calls
+``check_schema``, which is a single ``SELECT max(version)``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config.settings import settings
+from app.migrations.versions import HEAD_VERSION, MIGRATIONS
+
+# Kept off Base.metadata so test drop_all/create_all cycles leave it alone
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+# pg_advisory_xact_lock key serializing concurrent upgrade runs
+_LOCK_KEY = 0x50365F4D  # "P6_M"
+
+
+def current_version(engine: Engine) -> Optional[int]:
+    """Highest applied version, or None when the version table does not exist."""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+    except SQLAlchemyError:
+        return None
+
+
+def applied(engine: Engine) -> list[tuple[int, str, datetime]]:
+    if current_version(engine) is None:
+        return []
+    with engine.connect() as conn:
+        return [
+            tuple(row)
+            for row in conn.execute(select(schema_migrations).order_by(schema_migrations.c.version))
+        ]
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> list[int]:
+    """Apply pending migrations up to ``target`` (default: head); returns versions applied."""
+    target = HEAD_VERSION if target is None else target
+    _metadata.create_all(bind=engine)
+
+    done: list[int] = []
+    for migration in MIGRATIONS:
+        if migration.version > target:
+            break
+        with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+            already = conn.execute(
+                select(schema_migrations.c.version).where(schema_migrations.c.version == migration.version)
+            ).first()
+            if already:
+                continue
+            migration.apply(conn)
+            conn.execute(
+                schema_migrations.insert().values(
+                    version=migration.version,
+                    name=migration.name,
+                    applied_at=datetime.now(timezone.utc),
+                )
+            )
+        done.append(migration.version)
+    return done
+
+
+def migrate_on_boot(engine: Engine) -> bool:
+    if settings.DB_MIGRATE_ON_BOOT is not None:
+        return settings.DB_MIGRATE_ON_BOOT
+    # local SQLite databases have no deploy step to run the CLI
+    return engine.dialect.name == "sqlite"
+
+
+def check_schema(engine: Engine) -> Optional[int]:
+    """Boot-time check: compare the recorded version with HEAD_VERSION.
+
+    Upgrades in place only when DB_MIGRATE_ON_BOOT allows it; otherwise a
+    stale schema is reported and the worker keeps starting.
+    """
+    version = current_version(engine)
+    if version is not None and version >= HEAD_VERSION:
+        return version
+
+    if migrate_on_boot(engine):
+        upgrade(engine)
+        return HEAD_VERSION
+
+    print(
+        f"⚠️  Database schema is at version {version or 0}, code expects {HEAD_VERSION}; "
+        "run `python -m app.migrations upgrade`."
+    )
+    return version
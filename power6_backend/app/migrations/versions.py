@@ -0,0 +1,115 @@
+"""Ordered schema migrations.
+
+Each migration is a function of a Connection that runs inside its own
+transaction and must be idempotent, because databases that predate the
+runner replay every step once. Append new steps with the next version
+number; never renumber or edit an applied one.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import datetime, time, timezone
+from typing import Callable, NamedTuple
+
+from sqlalchemy import Date, func, insert, inspect, literal, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex
+
+from app.database import Base
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+def _create_tables(conn: Connection) -> None:
+    # checkfirst: existing tables are left untouched
+    import app.models  # noqa: F401  - register every model on Base.metadata
+
+    Base.metadata.create_all(bind=conn)
+
+
+def _task_columns(conn: Connection) -> None:
+    """Columns added to ``tasks`` after the first production deploy."""
+    schema = os.getenv("DB_SCHEMA", "public").strip() or None
+    if conn.dialect.name != "postgresql":
+        schema = None
+    inspector = inspect(conn)
+    existing = {c["name"] for c in inspector.get_columns("tasks", schema=schema)}
+    ident = f'{schema + "." if schema else ""}tasks'
+
+    for column, ddl in (
+        ("reviewed_at", "timestamptz NULL"),
+        ("scheduled_for", "timestamptz NULL"),
+        ("streak_bound", "boolean NOT NULL DEFAULT true"),
+        ("completed_at", "timestamptz NULL"),
+        ("updated_at", "timestamptz NULL"),
+    ):
+        if column not in existing:
+            conn.execute(text(f"ALTER TABLE {ident} ADD COLUMN {column} {ddl}"))
+
+
+def _subscriptions_fk_cascade(conn: Connection) -> None:
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(text("""
+        DO $$
+        DECLARE
+            constraint_name text;
+        BEGIN
+            SELECT conname INTO constraint_name
+            FROM pg_constraint
+            WHERE conrelid = 'subscriptions'::regclass
+              AND contype = 'f'
+              AND pg_get_constraintdef(oid) LIKE '%REFERENCES users%';
+
+            IF constraint_name IS NOT NULL THEN
+                EXECUTE format('ALTER TABLE subscriptions DROP CONSTRAINT IF EXISTS %I', constraint_name);
+            END IF;
+
+            ALTER TABLE subscriptions
+            ADD CONSTRAINT subscriptions_user_id_fkey
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+        END $$;
+    """))
+
+
+def _model_indexes(conn: Connection) -> None:
+    """Indexes declared on models after their table existed (create_all skips those)."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def _daily_task_quotas(conn: Connection) -> None:
+    """Create the quota table and seed today's counts from the tasks created so far."""
+    from app.models.models import Task, UserDailyTaskQuota
+
+    table = UserDailyTaskQuota.__table__
+    table.create(bind=conn, checkfirst=True)
+    today = datetime.now(timezone.utc).date()
+    day_start = datetime.combine(today, time.min, tzinfo=timezone.utc)
+    if conn.execute(select(func.count()).select_from(table).where(table.c.day == today)).scalar_one():
+        return
+    conn.execute(
+        insert(table).from_select(
+            ["user_id", "day", "created"],
+            select(Task.user_id, literal(today, Date), func.count())
+            .where(Task.created_at >= day_start)
+            .group_by(Task.user_id),
+        )
+    )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "create tables", _create_tables),
+    Migration(2, "tasks: review/schedule/streak/timestamp columns", _task_columns),
+    Migration(3, "subscriptions: user FK on delete cascade", _subscriptions_fk_cascade),
+    Migration(4, "model indexes", _model_indexes),
+    Migration(5, "user_daily_task_quotas, seeded from today's tasks", _daily_task_quotas),
+]
+
+HEAD_VERSION = MIGRATIONS[-1].version
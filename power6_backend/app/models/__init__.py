@@ -1,4 +1,4 @@
-from .models import User, Task, Subscription
+from .models import User, Task, TaskTombstone, Subscription, UserDailyCompletion, UserDailyTaskQuota, UserStreak, EventDailyRollup
 from .badge import Badge, UserBadge
 
-__all__ = ["User", "Task", "Subscription", "Badge", "UserBadge"]
\ No newline at end of file
+__all__ = ["User", "Task", "TaskTombstone", "Subscription", "UserDailyCompletion", "UserDailyTaskQuota", "UserStreak", "EventDailyRollup", "Badge", "UserBadge"]
\ No newline at end of file
@@ -2,11 +2,13 @@ from sqlalchemy import (
     Column,
     Integer,
     String,
+    Date,
     DateTime,
     ForeignKey,
     Boolean,
     CheckConstraint,
     JSON,
+    LargeBinary,
     Text,
     text,
     Index,
@@ -19,6 +21,12 @@ from app.database import Base
 class User(Base):
     __tablename__ = "users"
 
+    __table_args__ = (
+        # Case-insensitive login/token lookups filter on lower(username|email)
+        Index("ix_users_username_lower", func.lower(text("username"))),
+        Index("ix_users_email_lower", func.lower(text("email"))),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, nullable=False, index=True)
 
@@ -50,9 +58,16 @@ class Task(Base):
         Index("ix_tasks_user_streak", "user_id", "streak_bound", "completed"),
         Index("ix_tasks_user_completed_at", "user_id", "completed_at"),
         Index("ix_tasks_scheduled_for", "scheduled_for"),
+        # Keyset pagination seeks on (created_at, id) within a user
+        Index("ix_tasks_user_created_id", "user_id", "created_at", "id"),
+        # Delta sync reads a user's tasks changed since a token
+        Index("ix_tasks_user_updated", "user_id", "updated_at"),
         # Functional day index used by streak & daily grouping (UTC date of completed_at)
         Index("ix_tasks_user_day", "user_id", func.date(text("completed_at"))),
     )
+    # Server-generated values come back on the INSERT/UPDATE itself (RETURNING)
+    # rather than through a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -76,6 +91,71 @@ class Task(Base):
         return f"<Task id={self.id} title={self.title!r} user_id={self.user_id}>"
 
 
+class TaskTombstone(Base):
+    """Record of a deleted task so delta sync can report the deletion."""
+
+    __tablename__ = "task_tombstones"
+
+    __table_args__ = (
+        Index("ix_task_tombstones_user_deleted", "user_id", "deleted_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<TaskTombstone task_id={self.task_id} user_id={self.user_id} deleted_at={self.deleted_at}>"
+
+
+class UserDailyCompletion(Base):
+    """Per-user rollup of completed, streak-bound tasks per UTC day.
+
+    Maintained by the task write paths in the same transaction as the task
+    change so streak reads never have to scan the full task history.
+    """
+
+    __tablename__ = "user_daily_completions"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, server_default="0")
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<UserDailyCompletion user_id={self.user_id} day={self.day} count={self.count}>"
+
+
+class UserDailyTaskQuota(Base):
+    """Tasks a user has created per UTC day, claimed atomically before each insert."""
+
+    __tablename__ = "user_daily_task_quotas"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    created = Column(Integer, nullable=False, server_default="0")
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<UserDailyTaskQuota user_id={self.user_id} day={self.day} created={self.created}>"
+
+
+class UserStreak(Base):
+    """Persisted streak state, one row per user, updated incrementally on task writes."""
+
+    __tablename__ = "user_streaks"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    current_streak = Column(Integer, nullable=False, server_default="0")
+    last_qualifying_day = Column(Date, nullable=True)
+    today_day = Column(Date, nullable=True)
+    today_count = Column(Integer, nullable=False, server_default="0")
+    longest_streak = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<UserStreak user_id={self.user_id} current={self.current_streak} last={self.last_qualifying_day}>"
+
+
 class Subscription(Base):
     __tablename__ = "subscriptions"
 
@@ -152,3 +232,22 @@ class UserEvent(Base):
 
     def __repr__(self) -> str:  # pragma: no cover
         return f"<UserEvent id={self.id} name={self.name!r} user_id={self.user_id}>"
+
+
+class EventDailyRollup(Base):
+    """Per-UTC-day, per-event-name totals with a HyperLogLog of distinct users.
+
+    A row with ``name == "*"`` holds the day's totals across all names and
+    marks the day as built, including days with no events.
+    """
+
+    __tablename__ = "event_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    name = Column(String, primary_key=True)
+    events = Column(Integer, nullable=False, server_default="0")
+    users_hll = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<EventDailyRollup day={self.day} name={self.name!r} events={self.events}>"
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Request, Body
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
@@ -15,7 +16,21 @@ from app.schemas import (
     LoginRequest,
 )
 from app.database import get_db
-from app.utils.hash import get_password_hash, verify_password
+from app.services.principal_cache import (
+    UserPrincipal,
+    cache_principal,
+    claims_are_stale,
+    get_cached_principal,
+    invalidate_user,
+)
+from app.utils.hash import (
+    HashingBusyError,
+    get_password_hash,
+    hash_password_async,
+    needs_rehash,
+    verify_password,
+    verify_password_async,
+)
 
 router = APIRouter(
     prefix="/auth",
@@ -27,6 +42,8 @@ REFRESH_SECRET_KEY = os.getenv("REFRESH_SECRET_KEY", "fallback_refresh_secret")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+# Bump when the access-token claim layout changes; older tokens only carry "sub"
+ACCESS_TOKEN_VERSION = 2
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -56,6 +73,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def user_token_claims(user: User) -> dict:
+    """Access-token claims that let hot routes authorize without a users lookup."""
+    return {
+        "sub": user.username,
+        "uid": int(user.id),
+        "tier": user.tier,
+        "is_admin": bool(user.is_admin),
+        "ver": ACCESS_TOKEN_VERSION,
+        "iat": round(datetime.now(timezone.utc).timestamp(), 3),
+    }
+
+
 def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
@@ -84,8 +113,47 @@ def authenticate_user(db: Session, identifier: str, password: str) -> Optional[U
     return user
 
 
+def _commit_and_refresh(db: Session, obj) -> None:
+    db.commit()
+    db.refresh(obj)
+
+
+async def authenticate_user_async(db: Session, identifier: str, password: str) -> Optional[User]:
+    """Like authenticate_user, but awaits bcrypt on the hashing pool and upgrades
+    hashes made with an outdated cost factor while the plaintext is at hand.
+    """
+    user = await run_in_threadpool(get_user_by_identifier, db, identifier)
+    if not user or not await verify_password_async(password, user.hashed_password):
+        return None
+    if needs_rehash(user.hashed_password):
+        user.hashed_password = await hash_password_async(password)
+        await run_in_threadpool(_commit_and_refresh, db, user)
+    return user
+
+
+# Stored review hash already checked against REVIEW_PASSWORD in this process
+_verified_review_hash: Optional[str] = None
+
+
+def _review_hash_is_current(hashed_password: Optional[str]) -> bool:
+    global _verified_review_hash
+    if not hashed_password:
+        return False
+    if hashed_password == _verified_review_hash:
+        return True
+    if needs_rehash(hashed_password) or not verify_password(REVIEW_PASSWORD, hashed_password):
+        return False
+    _verified_review_hash = hashed_password
+    return True
+
+
 def ensure_review_user(db: Session, identifier: str, password: str) -> Optional[User]:
-    """Keep App Review credentials usable even if production seed data drifts."""
+    """Keep App Review credentials usable even if production seed data drifts.
+
+    Only drifted fields are rewritten, so a routine review login neither
+    rehashes the unchanged password nor commits.
+    """
+    global _verified_review_hash
     if not REVIEW_LOGIN_ENABLED:
         return None
 
@@ -95,6 +163,7 @@ def ensure_review_user(db: Session, identifier: str, password: str) -> Optional[
     if password != REVIEW_PASSWORD:
         return None
 
+    changed = False
     user = get_user_by_identifier(db, REVIEW_USERNAME)
     if user is None:
         user = User(
@@ -106,40 +175,77 @@ def ensure_review_user(db: Session, identifier: str, password: str) -> Optional[
         )
         db.add(user)
         db.flush()
+        _verified_review_hash = user.hashed_password
+        changed = True
     else:
-        user.username = REVIEW_USERNAME
-        user.email = REVIEW_EMAIL
-        user.hashed_password = get_password_hash(REVIEW_PASSWORD)
-        user.is_admin = False
-        user.tier = "Expired"
-
-    db.query(Subscription).filter(Subscription.user_id == user.id).delete(
-        synchronize_session=False,
-    )
-    db.add(
-        Subscription(
-            user_id=user.id,
-            tier="Expired",
-            active=False,
-        ),
+        expected = {
+            "username": REVIEW_USERNAME,
+            "email": REVIEW_EMAIL,
+            "is_admin": False,
+            "tier": "Expired",
+        }
+        for attr, value in expected.items():
+            if getattr(user, attr) != value:
+                setattr(user, attr, value)
+                changed = True
+        if not _review_hash_is_current(user.hashed_password):
+            user.hashed_password = get_password_hash(REVIEW_PASSWORD)
+            _verified_review_hash = user.hashed_password
+            changed = True
+
+    subscriptions = db.query(Subscription).filter(Subscription.user_id == user.id).all()
+    subscription_ok = (
+        len(subscriptions) == 1
+        and subscriptions[0].tier == "Expired"
+        and subscriptions[0].active is False
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    if not subscription_ok:
+        db.query(Subscription).filter(Subscription.user_id == user.id).delete(
+            synchronize_session=False,
+        )
+        db.add(
+            Subscription(
+                user_id=user.id,
+                tier="Expired",
+                active=False,
+            ),
+        )
+        changed = True
 
+    if changed:
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        invalidate_user(user.id)
+    return user
 
-@router.post("/register", response_model=TokenPair, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    username_norm = user_data.username.strip()
-    email_norm = user_data.email.strip().lower()
 
+def _ensure_identity_available(db: Session, username_norm: str, email_norm: str) -> None:
     if db.query(User).filter(func.lower(User.username) == username_norm.lower()).first():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
     if db.query(User).filter(func.lower(User.email) == email_norm).first():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
-    hashed_password = get_password_hash(user_data.password)
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests right now. Please try again.",
+        headers={"Retry-After": "1"},
+    )
+
+
+@router.post("/register", response_model=TokenPair, status_code=status.HTTP_201_CREATED)
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+    username_norm = user_data.username.strip()
+    email_norm = user_data.email.strip().lower()
+
+    await run_in_threadpool(_ensure_identity_available, db, username_norm, email_norm)
+
+    try:
+        hashed_password = await hash_password_async(user_data.password)
+    except HashingBusyError:
+        raise _hashing_busy()
     new_user = User(
         username=username_norm,
         email=email_norm,
@@ -148,20 +254,22 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         is_admin=False,
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(_commit_and_refresh, db, new_user)
 
-    access_token = create_access_token(data={"sub": new_user.username})
+    access_token = create_access_token(data=user_token_claims(new_user))
     refresh_token_value = create_refresh_token(data={"sub": new_user.username})
     return {"access_token": access_token, "refresh_token": refresh_token_value, "token_type": "bearer"}
 
 
 @router.post("/login", response_model=TokenPair)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     identifier = login_data.username_or_email.strip().lower()
-    user = ensure_review_user(db, identifier, login_data.password)
-    if user is None:
-        user = authenticate_user(db, identifier, login_data.password)
+    try:
+        user = await run_in_threadpool(ensure_review_user, db, identifier, login_data.password)
+        if user is None:
+            user = await authenticate_user_async(db, identifier, login_data.password)
+    except HashingBusyError:
+        raise _hashing_busy()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -169,7 +277,7 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(data={"sub": user.username}, expires_delta=access_token_expires)
+    access_token = create_access_token(data=user_token_claims(user), expires_delta=access_token_expires)
     refresh_token_value = create_refresh_token(data={"sub": user.username})
     return {"access_token": access_token, "refresh_token": refresh_token_value, "token_type": "bearer"}
 
@@ -202,10 +310,11 @@ def refresh_token(
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
-    if not get_user_by_identifier(db, username):
+    user = get_user_by_identifier(db, username)
+    if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    new_access_token = create_access_token(data={"sub": username})
+    new_access_token = create_access_token(data=user_token_claims(user))
     return {
         "access_token": new_access_token,
         "refresh_token": token,
@@ -213,13 +322,42 @@ def refresh_token(
     }
 
 
+def _load_user_for_subject(db: Session, subject: str) -> Optional[User]:
+    """Resolve a token subject to a user, preferring a cached id (primary-key read)
+    over the case-insensitive username/email lookup.
+
+    Routes that need the ORM ``User`` still pay that read; routes that only
+    need id/tier/admin go through ``_principal_for_subject`` instead.
+    """
+    principal = get_cached_principal(subject)
+    if principal is not None:
+        user = db.get(User, principal.id)
+        if user is not None and UserPrincipal.from_user(user).matches(subject):
+            cache_principal(subject, UserPrincipal.from_user(user))
+            return user
+
+    user = get_user_by_identifier(db, subject)
+    if user is not None:
+        cache_principal(subject, UserPrincipal.from_user(user))
+    return user
+
+
+def _principal_for_subject(db: Session, subject: str) -> Optional[UserPrincipal]:
+    """Serve the cached principal while it is fresh; look the user up only on a miss."""
+    principal = get_cached_principal(subject)
+    if principal is not None:
+        return principal
+    user = _load_user_for_subject(db, subject)
+    return UserPrincipal.from_user(user) if user is not None else None
+
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if not username:
             raise HTTPException(status_code=401, detail="Invalid token payload")
-        user = get_user_by_identifier(db, username)
+        user = _load_user_for_subject(db, username)
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
         return user
@@ -227,6 +365,60 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         raise HTTPException(status_code=403, detail="Token is invalid or expired")
 
 
+def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> UserPrincipal:
+    """Lightweight auth dependency for routes that only need id/tier/admin.
+
+    Current-format tokens are authorized from their claims with no database
+    round trip for TOKEN_CLAIMS_MAX_AGE_SECONDS after they are issued. Older
+    tokens, legacy ``sub``-only tokens, and tokens issued before the user's
+    last tier change fall back to the cached principal and only read
+    ``users`` when the cache misses.
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=403, detail="Token is invalid or expired")
+
+    username = payload.get("sub")
+    if not username:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+
+    uid = payload.get("uid")
+    if (
+        payload.get("ver") == ACCESS_TOKEN_VERSION
+        and isinstance(uid, int)
+        and not claims_are_stale(uid, payload.get("iat"))
+    ):
+        return UserPrincipal(
+            id=uid,
+            username=username,
+            email=None,
+            tier=payload.get("tier"),
+            is_admin=bool(payload.get("is_admin", False)),
+        )
+
+    principal = _principal_for_subject(db, username)
+    if principal is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    return principal
+
+
+def get_verified_principal(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> UserPrincipal:
+    """Auth dependency for admin-gated routes.
+
+    Reads the user row on every request instead of trusting token claims or
+    the principal cache, so a demotion or deletion applies immediately on
+    every worker.
+    """
+    return UserPrincipal.from_user(get_current_user(token, db))
+
+
 @router.get("/me", response_model=UserRead)
 def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models.models import User, UserEvent
-from app.routes.auth import get_current_user
-from app.schemas import EventCreate, EventRead
+from app.config.settings import settings
+from app.database import DbSession, get_async_db, run_db
+from app.models.models import UserEvent
+from app.routes.auth import get_current_principal, get_verified_principal
+from app.schemas import EventBatch, EventBatchResult, EventCreate, EventRead
+from app.services.event_buffer import event_buffer
+from app.services.event_rollup import ALL_EVENTS, summarize_events
+from app.services.principal_cache import UserPrincipal, user_must_exist
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
@@ -48,7 +51,7 @@ def _safe_properties(raw: dict[str, Any]) -> dict[str, Any]:
     return safe
 
 
-def _require_admin(current_user: User) -> None:
+def _require_admin(current_user: UserPrincipal) -> None:
     if not bool(getattr(current_user, "is_admin", False)):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -57,84 +60,119 @@ def _require_admin(current_user: User) -> None:
 
 
 @router.get("/summary")
-def event_summary(
+async def event_summary(
     days: int = Query(30, ge=1, le=120),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_verified_principal),
 ):
+    """
+    Event funnel for the last ``days`` days, served from daily rollups.
+
+    Event counts are exact; ``users`` and ``unique_users`` are HyperLogLog
+    estimates (exact for small numbers, ~1.6% error at scale).
+    """
     _require_admin(current_user)
     since = datetime.now(timezone.utc) - timedelta(days=days)
 
-    rows = (
-        db.query(
-            UserEvent.name,
-            func.count(UserEvent.id),
-            func.count(func.distinct(UserEvent.user_id)),
-        )
-        .filter(UserEvent.created_at >= since)
-        .group_by(UserEvent.name)
-        .order_by(UserEvent.name.asc())
-        .all()
-    )
-
-    counts = {
-        name: {"events": int(total), "users": int(users)}
-        for name, total, users in rows
-    }
-
-    funnel_order = [
-        "signup_completed",
-        "onboarding_started",
-        "dashboard_viewed",
-        "task_created",
-        "task_completed",
-        "subscription_screen_viewed",
-        "checkout_started",
-    ]
-
+    def run(db: Session):
+        tallies = summarize_events(db, since)
+        everyone = tallies.pop(ALL_EVENTS)
+
+        counts = {
+            name: {"events": tally.events, "users": tally.users.count()}
+            for name, tally in sorted(tallies.items())
+            if tally.events
+        }
+
+        funnel_order = [
+            "signup_completed",
+            "onboarding_started",
+            "dashboard_viewed",
+            "task_created",
+            "task_completed",
+            "subscription_screen_viewed",
+            "checkout_started",
+        ]
+
+        return {
+            "window_days": days,
+            "since": since.isoformat(),
+            "total_events": everyone.events,
+            "unique_users": everyone.users.count(),
+            "counts": counts,
+            "funnel": [
+                {
+                    "name": name,
+                    "events": counts.get(name, {}).get("events", 0),
+                    "users": counts.get(name, {}).get("users", 0),
+                }
+                for name in funnel_order
+            ],
+        }
+
+    return await run_db(session, run)
+
+
+def _event_row(
+    payload: EventCreate,
+    current_user: UserPrincipal,
+    user_agent: Optional[str],
+) -> dict[str, Any]:
+    name = payload.name.strip().lower()
+    if name not in ALLOWED_EVENTS:
+        name = "dashboard_viewed"
     return {
-        "window_days": days,
-        "since": since.isoformat(),
-        "total_events": sum(item["events"] for item in counts.values()),
-        "unique_users": int(
-            db.query(func.count(func.distinct(UserEvent.user_id)))
-            .filter(UserEvent.created_at >= since)
-            .scalar()
-            or 0
-        ),
-        "counts": counts,
-        "funnel": [
-            {
-                "name": name,
-                "events": counts.get(name, {}).get("events", 0),
-                "users": counts.get(name, {}).get("users", 0),
-            }
-            for name in funnel_order
-        ],
+        "user_id": current_user.id,
+        "name": name,
+        "source": payload.source.strip().lower()[:40] or "mobile",
+        "tier": str(current_user.tier or "free").lower(),
+        "properties": _safe_properties(payload.properties),
+        "user_agent": user_agent[:180] if user_agent else None,
     }
 
 
 @router.post("/", response_model=EventRead, status_code=status.HTTP_201_CREATED)
-def create_event(
+async def create_event(
     payload: EventCreate,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
-    name = payload.name.strip().lower()
-    if name not in ALLOWED_EVENTS:
-        name = "dashboard_viewed"
+    event = UserEvent(**_event_row(payload, current_user, request.headers.get("user-agent")))
+
+    def run(db: Session):
+        with user_must_exist(db, current_user.id):
+            db.add(event)
+            db.commit()
+        db.refresh(event)
+        return EventRead.model_validate(event)
+
+    return await run_db(session, run)
 
-    user_agent = request.headers.get("user-agent", "")
-    event = UserEvent(
-        user_id=current_user.id,
-        name=name,
-        source=payload.source.strip().lower()[:40] or "mobile",
-        tier=str(current_user.tier or "free").lower(),
-        properties=_safe_properties(payload.properties),
-        user_agent=user_agent[:180] if user_agent else None,
-    )
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    return event
+
+@router.post("/batch", response_model=EventBatchResult, status_code=status.HTTP_202_ACCEPTED)
+async def create_event_batch(
+    payload: EventBatch,
+    request: Request,
+    current_user: UserPrincipal = Depends(get_current_principal),
+):
+    """
+    Queue several events for write-behind insertion.
+
+    Returns once the events are buffered; they reach the database on the
+    next flush. ``dropped`` counts events refused because the buffer was full.
+    """
+    if len(payload.events) > settings.EVENT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.EVENT_BATCH_MAX_ITEMS} events per batch.",
+        )
+
+    user_agent = request.headers.get("user-agent")
+    created_at = datetime.now(timezone.utc)
+    rows = [
+        {**_event_row(item, current_user, user_agent), "created_at": created_at}
+        for item in payload.events
+    ]
+    accepted, dropped = event_buffer.enqueue(rows)
+    return EventBatchResult(accepted=accepted, dropped=dropped)
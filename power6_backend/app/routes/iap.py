@@ -1,4 +1,7 @@
+import importlib
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
@@ -6,7 +9,7 @@ from app.database import get_db
 from app.models.models import AppleIapTransaction, Subscription, User
 from app.routes.auth import get_current_user
 from app.schemas import UserRead
-from app.services.apple_iap_service import verify_apple_transaction
+from app.services.principal_cache import invalidate_user
 
 router = APIRouter(prefix="/iap", tags=["In-App Purchases"])
 
@@ -26,6 +29,23 @@ APPLE_PRODUCT_TIERS = {
 }
 
 
+async def verify_apple_transaction(
+    *,
+    product_id: str,
+    transaction_id: str | None,
+    signed_transaction_info: str | None,
+):
+    # httpx/jose and the App Store client load on the first purchase, not at
+    # boot, and off the event loop so other requests keep being served meanwhile
+    service = await run_in_threadpool(importlib.import_module, "app.services.apple_iap_service")
+
+    return await service.verify_apple_transaction(
+        product_id=product_id,
+        transaction_id=transaction_id,
+        signed_transaction_info=signed_transaction_info,
+    )
+
+
 class AppleActivateRequest(BaseModel):
     product_id: str = Field(min_length=1)
     transaction_id: str | None = None
@@ -89,5 +109,6 @@ async def activate_apple_purchase(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    invalidate_user(current_user.id)
 
     return UserRead.model_validate(current_user)
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.routes.auth import get_verified_principal
+from app.services.principal_cache import UserPrincipal
+from app.utils.metrics import collect_metrics
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/", summary="Runtime metrics for tuning (admin only)")
+def read_metrics(current_user: UserPrincipal = Depends(get_verified_principal)):
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Metrics require administrator privileges.",
+        )
+    return collect_metrics()
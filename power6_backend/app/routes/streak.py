@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import Dict
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import Date, cast, func
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models.models import Task, User
-from app.routes.auth import get_current_user
+from app.database import DbSession, get_async_db, run_db
+from app.routes.auth import get_current_principal
+from app.services.principal_cache import UserPrincipal
+from app.services.streak_service import read_streak_state, rebuild_streak_state
+from app.utils.etag import etag_matches, make_etag, not_modified, set_etag
 
 router = APIRouter(prefix="/streak", tags=["Streak"])
 
@@ -29,65 +29,21 @@ def _to_iso_date(dt: datetime) -> str:
     return dt.astimezone(timezone.utc).date().isoformat()
 
 
-def _daily_counts(db: Session, user_id: int) -> Dict[str, int]:
-    """Return a mapping { 'YYYY-MM-DD': completed_count } only for
-    completed & streak-bound tasks grouped by UTC day(completed_at).
-    """
-    rows = (
-        db.query(
-            cast(Task.completed_at, Date).label("day"),
-            func.count().label("cnt"),
-        )
-        .filter(
-            Task.user_id == user_id,
-            Task.completed.is_(True),
-            Task.streak_bound.is_(True),
-            Task.completed_at.isnot(None),
-        )
-        .group_by("day")
-        .all()
-    )
-    return {row.day.isoformat(): int(row.cnt) for row in rows if row.day is not None}
-
-
-essential_fields = [Task.user_id, Task.completed, Task.streak_bound, Task.completed_at]
-
-
-def _today_count(db: Session, user_id: int) -> int:
-    today = _now_utc().date()
-    q = (
-        db.query(func.count())
-        .filter(
-            Task.user_id == user_id,
-            Task.completed.is_(True),
-            Task.streak_bound.is_(True),
-            cast(Task.completed_at, Date) == today,
-        )
-    )
-    return int(q.scalar() or 0)
-
-
 def _compute_streak(db: Session, user_id: int) -> tuple[int, int, bool]:
-    counts = _daily_counts(db, user_id)
-    today = _now_utc().date()
-
-    # Compute today first
-    today_key = today.isoformat()
-    today_count = counts.get(today_key, 0)
-    has_completed_today = today_count >= STREAK_THRESHOLD
+    """Read the persisted streak state (single primary-key lookup)."""
+    return read_streak_state(
+        db,
+        user_id,
+        today=_now_utc().date(),
+        threshold=STREAK_THRESHOLD,
+    )
 
-    # Walk backward from today
-    streak = 0
-    cursor = today
-    while True:
-        key = cursor.isoformat()
-        if counts.get(key, 0) >= STREAK_THRESHOLD:
-            streak += 1
-            cursor = cursor - timedelta(days=1)
-        else:
-            break
 
-    return streak, today_count, has_completed_today
+def _reconcile_streak(db: Session, user_id: int) -> tuple[int, int, bool]:
+    """Rebuild the persisted streak state from the daily rollup, then read it."""
+    rebuild_streak_state(db, user_id, today=_now_utc().date(), threshold=STREAK_THRESHOLD)
+    db.commit()
+    return _compute_streak(db, user_id)
 
 
 # ----------------------------
@@ -95,11 +51,20 @@ def _compute_streak(db: Session, user_id: int) -> tuple[int, int, bool]:
 # ----------------------------
 
 @router.get("/", summary="Get current streak")
-def get_streak(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def get_streak(
+    request: Request,
+    response: Response,
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
-    streak_count, today_count, has_completed_today = _compute_streak(db, current_user.id)
+    streak_count, today_count, has_completed_today = await run_db(
+        session, _compute_streak, current_user.id
+    )
+    # the payload is a handful of ints, so it is its own version
+    etag = make_etag("streak", current_user.id, streak_count, today_count, has_completed_today, STREAK_THRESHOLD)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return {
         "streak_count": streak_count,
         "today_count": today_count,
@@ -109,11 +74,13 @@ def get_streak(
 
 
 @router.post("/refresh", summary="Recalculate streak (idempotent)")
-def refresh_streak(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def refresh_streak(
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
-    streak_count, today_count, has_completed_today = _compute_streak(db, current_user.id)
+    streak_count, today_count, has_completed_today = await run_db(
+        session, _reconcile_streak, current_user.id
+    )
     return {
         "ok": True,
         "streak_count": streak_count,
@@ -1,9 +1,16 @@
 ## stripe.py
 
+import importlib
+
 from fastapi import APIRouter, Request, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import stripe
-from app.services.stripe_service import settings, create_checkout_session
+from app.config.settings import settings
+
+# The stripe SDK is imported inside the handlers: it is only needed by the
+# billing endpoints and otherwise adds noticeably to worker cold start. The
+# import runs on the threadpool so the first billing request does not stall
+# the event loop.
 
 router = APIRouter()
 
@@ -14,6 +21,8 @@ class CheckoutRequest(BaseModel):
 
 @router.post("/webhook")
 async def stripe_webhook(request: Request):
+    stripe = await run_in_threadpool(importlib.import_module, "stripe")
+
     payload = await request.body()
     sig_header = request.headers.get('stripe-signature')
 
@@ -35,8 +44,14 @@ async def stripe_webhook(request: Request):
 
 @router.post("/create-checkout-session")
 async def create_checkout(data: CheckoutRequest):
+    def checkout():
+        from app.services.stripe_service import create_checkout_session
+
+        return create_checkout_session(data.user_id, f"{data.tier}:{data.interval}")
+
     try:
-        session = create_checkout_session(data.user_id, f"{data.tier}:{data.interval}")
+        # import and Stripe API call are both blocking
+        session = await run_in_threadpool(checkout)
         return {"checkout_url": session.url}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,20 +1,33 @@
 from __future__ import annotations
 
-import csv
-from datetime import date, datetime, timedelta, timezone
-from io import StringIO
+from datetime import date, datetime, timezone
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-from sqlalchemy import Date, and_, or_, cast as sa_cast
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models.models import Task as TaskModel
-from app.models.models import User
-from app.routes.auth import get_current_user
-from app.schemas import TaskCreate, TaskRead, TaskUpdate
+from app.config.settings import settings
+from app.database import DbSession, get_async_db, run_db
+from app.routes.auth import get_current_principal
+from app.schemas import TaskBulkRequest, TaskBulkResult, TaskChanges, TaskCreate, TaskRead, TaskUpdate
+from app.services import task_service
+from app.services.analytics_cache import cache_analytics, get_cached_analytics
+from app.services.principal_cache import UserPrincipal
+from app.services.task_export import (
+    COLUMNAR_FORMATS,
+    EXPORT_FORMATS,
+    accepts_gzip,
+    columnar_available,
+    gzip_chunks,
+    history_range,
+    stream_history,
+)
+from app.services.task_quota import daily_new_task_limit
+from app.services.task_service import ALLOWED_ORDER_FIELDS, CURSOR_ORDER_FIELDS
+from app.utils.cursor import decode_cursor, decode_sync_token
+from app.utils.etag import etag_matches, make_etag, not_modified, set_etag
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -22,19 +35,6 @@ router = APIRouter(prefix="/tasks", tags=["Tasks"])
 # Helpers
 # ----------------------------
 
-PRIORITY_MAP = {"low": 0, "normal": 1, "high": 2}
-ALLOWED_ORDER_FIELDS = {
-    "id",
-    "title",
-    "priority",
-    "completed",
-    "scheduled_for",
-    "created_at",
-    "completed_at",
-    "reviewed_at",
-    "streak_bound",
-}
-
 TIER_PRIORITY = {
     "free": 1,
     "expired": 1,
@@ -45,19 +45,7 @@ TIER_PRIORITY = {
 }
 
 
-def _priority_to_db(v: Any) -> int:
-    if isinstance(v, int):
-        return v if v in (0, 1, 2) else 1
-    if isinstance(v, str):
-        return PRIORITY_MAP.get(v.strip().lower(), 1)
-    return 1
-
-
-def _now_utc() -> datetime:
-    return datetime.now(timezone.utc)
-
-
-def _coerce_user_id(current_user: User) -> int:
+def _coerce_user_id(current_user: UserPrincipal) -> int:
     raw = getattr(current_user, "id", None)
     if raw is None:
         raise HTTPException(status_code=401, detail="Invalid user")
@@ -72,7 +60,7 @@ def _coerce_user_id(current_user: User) -> int:
         return int(digits)
 
 
-def _require_min_tier(current_user: User, required: str) -> None:
+def _require_min_tier(current_user: UserPrincipal, required: str) -> None:
     tier = str(getattr(current_user, "tier", "free") or "free").strip().lower()
     if bool(getattr(current_user, "is_admin", False)):
         tier = "admin"
@@ -83,115 +71,18 @@ def _require_min_tier(current_user: User, required: str) -> None:
         )
 
 
-def _compute_day_key(task: TaskModel) -> str:
-    dt = task.scheduled_for or task.created_at
-    if dt is None:
-        return _now_utc().date().isoformat()
-    return dt.astimezone(timezone.utc).date().isoformat()
-
-
-def _to_task_read(task: TaskModel) -> TaskRead:
-    return TaskRead(
-        id=task.id,
-        user_id=task.user_id,
-        title=task.title,
-        notes=task.notes,
-        completed=bool(task.completed),
-        priority=int(task.priority),
-        scheduled_for=task.scheduled_for,
-        created_at=task.created_at,
-        completed_at=task.completed_at,
-        reviewed_at=task.reviewed_at,
-        day_key=_compute_day_key(task),
-        streak_bound=bool(task.streak_bound),
-    )
-
-
-def _history_query(
-    db: Session,
-    uid: int,
-    from_date: Optional[date] = None,
-    to_date: Optional[date] = None,
-):
-    today = date.today()
-    from_date = from_date or (today - timedelta(days=30))
-    to_date = to_date or today
-
-    return (
-        db.query(TaskModel)
-        .filter(
-            TaskModel.user_id == uid,
-            TaskModel.completed.is_(True),
-            TaskModel.completed_at >= datetime.combine(
-                from_date, datetime.min.time(), tzinfo=timezone.utc
-            ),
-            TaskModel.completed_at <= datetime.combine(
-                to_date, datetime.max.time(), tzinfo=timezone.utc
-            ),
-        )
-        .order_by(TaskModel.completed_at.desc())
-    )
-
-
-def _check_daily_new_task_limit(db: Session, uid: int) -> None:
-    day_start, day_end = _utc_day_bounds()
-
-    count = (
-        db.query(TaskModel)
-        .filter(
-            TaskModel.user_id == uid,
-            TaskModel.created_at >= day_start,
-            TaskModel.created_at <= day_end,
-        )
-        .count()
-    )
-
-    if count >= 6:
-        raise HTTPException(
-            status_code=400,
-            detail="Daily new task limit reached (6). You can add more tasks tomorrow.",
-        )
+def _json_response(payload: Any, response: Optional[Response] = None) -> Response:
+    """Serialize service rows straight to JSON bytes.
 
-def _get_owned_task(db: Session, uid: int, task_id: int) -> TaskModel:
-    task: Optional[TaskModel] = (
-        db.query(TaskModel)
-        .filter(TaskModel.id == task_id, TaskModel.user_id == uid)
-        .first()
+    Returning a Response skips FastAPI's response_model validation, which
+    would otherwise rebuild every row as a TaskRead; response_model stays on
+    the route for the OpenAPI schema. Headers set on ``response`` carry over.
+    """
+    return Response(
+        content=task_service.dump_json(payload),
+        media_type="application/json",
+        headers=dict(response.headers) if response is not None else None,
     )
-    if task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
-    return task
-
-
-def _apply_task_update(task: TaskModel, payload_data: dict[str, Any]) -> None:
-    prev_completed = bool(getattr(task, "completed", False))
-
-    if "priority" in payload_data:
-        payload_data["priority"] = _priority_to_db(payload_data["priority"])
-
-    completed_provided = "completed" in payload_data
-    new_completed = payload_data.pop("completed", None)
-
-    # allow reviewed_at to be written directly from review screen
-    reviewed_at = payload_data.get("reviewed_at")
-
-    for key, value in payload_data.items():
-        setattr(task, key, value)
-
-    if completed_provided and new_completed is not None and new_completed != prev_completed:
-        if new_completed:
-            task.completed = True
-            if not getattr(task, "completed_at", None):
-                task.completed_at = _now_utc()
-        else:
-            task.completed = False
-            task.completed_at = None
-            # if task is reopened it should no longer count as reviewed
-            task.reviewed_at = None
-
-    # if review timestamp explicitly provided, persist it
-    if reviewed_at is not None:
-        task.reviewed_at = reviewed_at
 
 
 # ----------------------------
@@ -199,47 +90,70 @@ def _apply_task_update(task: TaskModel, payload_data: dict[str, Any]) -> None:
 # ----------------------------
 
 @router.get("/", response_model=List[TaskRead])
-def list_tasks(
+async def list_tasks(
+    response: Response,
     day: Optional[date] = Query(None, description="Filter by created_at date (UTC)"),
     completed: Optional[bool] = Query(None, description="Filter by completion state"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     order: str = Query("-created_at"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
-    uid = _coerce_user_id(current_user)
-    q = db.query(TaskModel).filter(TaskModel.user_id == uid)
-
-    if completed is not None:
-        q = q.filter(TaskModel.completed.is_(bool(completed)))
+    """
+    List tasks with either offset or keyset pagination.
 
-    if day is not None:
-        q = q.filter(sa_cast(TaskModel.created_at, Date) == day)
+    When the order field is non-null, a full page carries an ``X-Next-Cursor``
+    header. Passing it back as ``cursor`` seeks past the last row with a
+    (sort value, id) comparison instead of OFFSET, so deep pages stay cheap
+    and rows do not shift between pages.
+    """
+    uid = _coerce_user_id(current_user)
 
-    desc = order.startswith("-")
     field = order.lstrip("-")
     if field not in ALLOWED_ORDER_FIELDS:
         raise HTTPException(status_code=400, detail=f"Invalid order field: {field}")
 
-    col = getattr(TaskModel, field)
-    q = q.order_by(col.desc() if desc else col.asc())
-
-    tasks: List[Any] = q.offset(offset).limit(limit).all()
-    return [_to_task_read(t) for t in tasks]
-
-
-def _utc_day_bounds(target_day: Optional[date] = None) -> tuple[datetime, datetime]:
-    day = target_day or _now_utc().date()
-    start = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
-    end = datetime.combine(day, datetime.max.time(), tzinfo=timezone.utc)
-    return start, end
+    after: Optional[tuple[Any, int]] = None
+    if cursor is not None:
+        if field not in CURSOR_ORDER_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cursor pagination is not supported for order field: {field}",
+            )
+        if offset:
+            raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
+        try:
+            cursor_order, raw_value, last_id = decode_cursor(cursor)
+            if cursor_order != order:
+                raise ValueError("Cursor was issued for a different order")
+            after = (CURSOR_ORDER_FIELDS[field](raw_value), last_id)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    items, next_cursor = await run_db(
+        session,
+        task_service.list_tasks,
+        uid,
+        day=day,
+        completed=completed,
+        limit=limit,
+        offset=offset,
+        order=order,
+        after=after,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return _json_response(items, response)
 
 
 @router.get("/active", response_model=List[TaskRead])
-def get_active_tasks(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def get_active_tasks(
+    request: Request,
+    response: Response,
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     """
     Return the user's current working task set for the app.
@@ -252,240 +166,237 @@ def get_active_tasks(
     completed-today items do not disappear immediately after PATCH/toggle.
     """
     uid = _coerce_user_id(current_user)
-    day_start, day_end = _utc_day_bounds()
-
-    tasks: List[Any] = (
-        db.query(TaskModel)
-        .filter(
-            TaskModel.user_id == uid,
-            or_(
-                TaskModel.completed.is_(False),
-                and_(
-                    TaskModel.completed.is_(True),
-                    TaskModel.completed_at.is_not(None),
-                    TaskModel.completed_at >= day_start,
-                    TaskModel.completed_at <= day_end,
-                ),
-            ),
-        )
-        .order_by(
-            TaskModel.completed.asc(),
-            TaskModel.priority.desc(),
-            TaskModel.created_at.asc(),
-        )
-        .all()
-    )
-    return [_to_task_read(t) for t in tasks]
+
+    def run(db: Session):
+        etag = make_etag("active", uid, task_service.now_utc().date(), *task_service.task_set_version(db, uid))
+        if etag_matches(request, etag):
+            return etag, None
+        return etag, task_service.active_tasks(db, uid)
+
+    etag, items = await run_db(session, run)
+    if items is None:
+        return not_modified(etag)
+    set_etag(response, etag)
+    return _json_response(items, response)
+
+
+@router.get("/changes", response_model=TaskChanges)
+async def get_task_changes(
+    since: Optional[str] = Query(None, description="sync_token from the previous response"),
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
+):
+    """
+    Delta sync for the active task list.
+
+    Returns tasks created or updated and ids of tasks deleted since ``since``.
+    Without a usable token (missing, malformed, or issued on an earlier UTC
+    day, when completed-yesterday tasks drop out of the active set) the full
+    active set is returned with ``full_resync`` set. Deltas overlap the
+    previous window by SYNC_TOKEN_OVERLAP to cover in-flight commits, so
+    clients must apply them idempotently.
+    """
+    uid = _coerce_user_id(current_user)
+    issued_at = task_service.now_utc()
+
+    since_at: Optional[datetime] = None
+    if since:
+        try:
+            since_at = decode_sync_token(since)
+        except ValueError:
+            since_at = None
+        if since_at is not None and since_at.astimezone(timezone.utc).date() != issued_at.date():
+            since_at = None
+
+    return _json_response(await run_db(session, task_service.task_changes, uid, since_at, issued_at))
 
 
 @router.get("/history", response_model=List[TaskRead])
-def get_history(
+async def get_history(
+    request: Request,
+    response: Response,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     uid = _coerce_user_id(current_user)
-    tasks: List[Any] = _history_query(db, uid, from_date, to_date).all()
-    return [_to_task_read(t) for t in tasks]
+
+    def run(db: Session):
+        etag = make_etag(
+            "history",
+            uid,
+            task_service.now_utc().date(),
+            from_date,
+            to_date,
+            *task_service.task_set_version(db, uid),
+        )
+        if etag_matches(request, etag):
+            return etag, None
+        return etag, task_service.history(db, uid, from_date, to_date)
+
+    etag, items = await run_db(session, run)
+    if items is None:
+        return not_modified(etag)
+    set_etag(response, etag)
+    return _json_response(items, response)
 
 
 @router.get("/analytics")
-def get_task_analytics(
+async def get_task_analytics(
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     _require_min_tier(current_user, "pro")
     uid = _coerce_user_id(current_user)
-    tasks: List[Any] = _history_query(db, uid, from_date, to_date).all()
-
-    if not tasks:
-        return {
-            "completed_tasks": 0,
-            "streak_bound_completed": 0,
-            "completion_rate": 0,
-            "best_day": None,
-            "recent_trend": [],
-            "message": "No completed tasks in this period yet.",
-        }
-
-    by_day: dict[str, int] = {}
-    streak_bound = 0
-    for task in tasks:
-        when = task.completed_at or task.created_at
-        day_key = when.astimezone(timezone.utc).date().isoformat()
-        by_day[day_key] = by_day.get(day_key, 0) + 1
-        if bool(task.streak_bound):
-            streak_bound += 1
-
-    best_day_key, best_day_count = max(by_day.items(), key=lambda item: item[1])
-    recent_trend = [
-        {"day": day, "completed": count}
-        for day, count in sorted(by_day.items(), reverse=True)[:7]
-    ]
-
-    days = max(len(by_day), 1)
-    completion_rate = round(
-        min(sum(by_day.values()) / (days * 6), 1.0) * 100,
-        1,
-    )
+    range_start, range_end = history_range(from_date, to_date)
+
+    cached = get_cached_analytics(uid, range_start, range_end)
+    if cached is not None:
+        return cached
 
-    return {
-        "completed_tasks": len(tasks),
-        "streak_bound_completed": streak_bound,
-        "completion_rate": completion_rate,
-        "best_day": {"day": best_day_key, "completed": best_day_count},
-        "recent_trend": recent_trend,
+    payload = await run_db(session, task_service.analytics, uid, range_start, range_end)
+    cache_analytics(uid, range_start, range_end, payload)
+    return payload
+
+
+def _export_response(
+    request: Request,
+    fmt: str,
+    uid: int,
+    from_date: Optional[date],
+    to_date: Optional[date],
+) -> StreamingResponse:
+    media_type, extension, compressible = EXPORT_FORMATS[fmt]
+    chunks = stream_history(fmt, uid, from_date, to_date)
+    headers = {
+        "Content-Disposition": f'attachment; filename="power6-task-history.{extension}"',
+        "Vary": "Accept-Encoding",
     }
+    if compressible and accepts_gzip(request.headers.get("accept-encoding")):
+        headers["Content-Encoding"] = "gzip"
+        chunks = gzip_chunks(chunks)
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers=headers,
+    )
 
 
 @router.get("/export.csv")
-def export_task_history_csv(
+async def export_task_history_csv(
+    request: Request,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     _require_min_tier(current_user, "pro")
     uid = _coerce_user_id(current_user)
-    tasks: List[Any] = _history_query(db, uid, from_date, to_date).all()
-
-    buffer = StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(
-        [
-            "id",
-            "title",
-            "notes",
-            "priority",
-            "streak_bound",
-            "created_at",
-            "completed_at",
-            "reviewed_at",
-        ]
-    )
-    for task in tasks:
-        writer.writerow(
-            [
-                task.id,
-                task.title,
-                task.notes or "",
-                task.priority,
-                bool(task.streak_bound),
-                task.created_at.isoformat() if task.created_at else "",
-                task.completed_at.isoformat() if task.completed_at else "",
-                task.reviewed_at.isoformat() if task.reviewed_at else "",
-            ]
-        )
+    return _export_response(request, "csv", uid, from_date, to_date)
 
-    buffer.seek(0)
-    headers = {"Content-Disposition": 'attachment; filename="power6-task-history.csv"'}
-    return StreamingResponse(
-        iter([buffer.getvalue()]),
-        media_type="text/csv",
-        headers=headers,
-    )
+
+@router.get("/export")
+async def export_task_history(
+    request: Request,
+    format: str = Query("csv", description="csv, ndjson, arrow or parquet"),
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    current_user: UserPrincipal = Depends(get_current_principal),
+):
+    _require_min_tier(current_user, "pro")
+    uid = _coerce_user_id(current_user)
+
+    fmt = format.strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Invalid export format: {format}")
+    # the first call imports pyarrow, which takes a while; keep it off the event loop
+    if fmt in COLUMNAR_FORMATS and not await run_in_threadpool(columnar_available):
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{fmt} export is not available on this server",
+        )
+    return _export_response(request, fmt, uid, from_date, to_date)
 
 
 @router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     task: TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     uid = _coerce_user_id(current_user)
-    _check_daily_new_task_limit(db, uid)
-
-    completed_at = task.completed_at
-    if task.completed and completed_at is None:
-        completed_at = _now_utc()
-
-    db_task: TaskModel = TaskModel(
-        title=task.title,
-        notes=task.notes,
-        priority=_priority_to_db(task.priority),
-        scheduled_for=task.scheduled_for,
-        completed=task.completed,
-        streak_bound=task.streak_bound,
-        completed_at=completed_at,
-        user_id=uid,
-        created_at=_now_utc(),
+    return await run_db(
+        session,
+        task_service.create_task,
+        uid,
+        task,
+        daily_limit=daily_new_task_limit(current_user),
     )
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
-    return _to_task_read(db_task)
+
+
+@router.post("/bulk", response_model=TaskBulkResult)
+async def bulk_update_tasks(
+    payload: TaskBulkRequest,
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
+):
+    """Apply toggle / patch / delete operations to many tasks in one transaction.
+
+    Operations run in order; the same id may appear more than once. An id
+    that is not one of the caller's tasks (or was deleted earlier in the
+    batch) yields a per-item 404 without affecting the others.
+    """
+    if len(payload.operations) > settings.TASK_BULK_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.TASK_BULK_MAX_OPERATIONS} operations per request.",
+        )
+    uid = _coerce_user_id(current_user)
+    return await run_db(session, task_service.bulk_update, uid, payload.operations)
 
 
 @router.patch("/{task_id}", response_model=TaskRead)
-def patch_task(
+async def patch_task(
     task_id: int,
     payload: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     uid = _coerce_user_id(current_user)
-    task = _get_owned_task(db, uid, task_id)
     data = payload.model_dump(exclude_unset=True)
-
-    _apply_task_update(task, data)
-
-    db.commit()
-    db.refresh(task)
-    return _to_task_read(task)
+    return await run_db(session, task_service.update_task, uid, task_id, data)
 
 
 @router.post("/{task_id}/toggle", response_model=TaskRead)
-def toggle_task_completion(
+async def toggle_task_completion(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     uid = _coerce_user_id(current_user)
-    task = _get_owned_task(db, uid, task_id)
-
-    if task.completed:
-        task.completed = False
-        task.completed_at = None
-    else:
-        task.completed = True
-        if not getattr(task, "completed_at", None):
-            task.completed_at = _now_utc()
-
-    db.commit()
-    db.refresh(task)
-    return _to_task_read(task)
+    return await run_db(session, task_service.toggle_task, uid, task_id)
 
 
 @router.put("/{task_id}", response_model=TaskRead)
-def update_task(
+async def update_task(
     task_id: int,
     updated_task: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     uid = _coerce_user_id(current_user)
-    task = _get_owned_task(db, uid, task_id)
-    update_data = updated_task.model_dump(exclude_unset=True)
-
-    _apply_task_update(task, update_data)
-
-    db.commit()
-    db.refresh(task)
-    return _to_task_read(task)
+    data = updated_task.model_dump(exclude_unset=True)
+    return await run_db(session, task_service.update_task, uid, task_id, data)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    session: DbSession = Depends(get_async_db),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     uid = _coerce_user_id(current_user)
-    task = _get_owned_task(db, uid, task_id)
-
-    db.delete(task)
-    db.commit()
+    await run_db(session, task_service.delete_task, uid, task_id)
     return None
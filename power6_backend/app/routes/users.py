@@ -1,20 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.badge import BadgeAssignRequest, UserBadge
-from app.models.models import AdminMessage, Subscription, Task, User
+from app.models.models import AdminMessage, Subscription, Task, TaskTombstone, User, UserDailyCompletion, UserDailyTaskQuota, UserStreak
 from app.routes.auth import get_current_user
 from app.schemas import UserRead, UserTierUpdate  # Pydantic v2
+from app.services.analytics_cache import invalidate_analytics
+from app.services.principal_cache import invalidate_user
+from app.utils.etag import etag_matches, make_etag, not_modified, set_etag
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/me", response_model=UserRead, summary="Get the current user's profile")
 def get_me(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    etag = make_etag(
+        "me",
+        current_user.id,
+        current_user.username,
+        current_user.email,
+        current_user.tier,
+        current_user.is_admin,
+        current_user.created_at,
+        current_user.updated_at,
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return UserRead.model_validate(current_user)
 
 
@@ -45,6 +63,7 @@ def update_my_tier(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    invalidate_user(current_user.id)
 
     return UserRead.model_validate(current_user)
 
@@ -74,6 +93,18 @@ def delete_me(
         db.query(Task).filter(Task.user_id == user_id).delete(
             synchronize_session=False,
         )
+        db.query(TaskTombstone).filter(TaskTombstone.user_id == user_id).delete(
+            synchronize_session=False,
+        )
+        db.query(UserDailyCompletion).filter(
+            UserDailyCompletion.user_id == user_id,
+        ).delete(synchronize_session=False)
+        db.query(UserStreak).filter(UserStreak.user_id == user_id).delete(
+            synchronize_session=False,
+        )
+        db.query(UserDailyTaskQuota).filter(UserDailyTaskQuota.user_id == user_id).delete(
+            synchronize_session=False,
+        )
         db.query(Subscription).filter(Subscription.user_id == user_id).delete(
             synchronize_session=False,
         )
@@ -85,5 +116,7 @@ def delete_me(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Account deletion failed.",
         )
+    invalidate_user(user_id)
+    invalidate_analytics(user_id)
 
     return {"ok": True, "message": "Account deleted."}
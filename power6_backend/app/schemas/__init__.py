@@ -11,7 +11,14 @@ from .schemas import (
     TaskCreate,
     TaskUpdate,
     TaskRead,
+    TaskChanges,
+    TaskBulkOperation,
+    TaskBulkRequest,
+    TaskBulkItemResult,
+    TaskBulkResult,
     EventCreate,
+    EventBatch,
+    EventBatchResult,
     EventRead,
 )
 
@@ -47,7 +54,14 @@ __all__ = [
     "TaskCreate",
     "TaskUpdate",
     "TaskRead",
+    "TaskChanges",
+    "TaskBulkOperation",
+    "TaskBulkRequest",
+    "TaskBulkItemResult",
+    "TaskBulkResult",
     "EventCreate",
+    "EventBatch",
+    "EventBatchResult",
     "EventRead",
     *_BADGE_EXPORTS,
 ]
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Any, Optional, Union
+from typing import Any, List, Literal, Optional, Union
 
-from pydantic import BaseModel, EmailStr, Field, AliasChoices, field_validator
+from pydantic import BaseModel, EmailStr, Field, AliasChoices, field_validator, model_validator
 
 # ---------------------------------
 # Helper: UTC + Priority Normalizer
@@ -141,12 +141,59 @@ class TaskRead(TaskBase):
     model_config = {"from_attributes": True}
 
 
+class TaskChanges(BaseModel):
+    changed: List[TaskRead] = Field(default_factory=list)
+    deleted: List[int] = Field(default_factory=list)
+    sync_token: str
+    # True when ``changed`` is the full active set and local state should be replaced
+    full_resync: bool = False
+
+
+class TaskBulkOperation(BaseModel):
+    op: Literal["toggle", "patch", "delete"]
+    id: int
+    # required for "patch"; same semantics as PATCH /tasks/{id}
+    changes: Optional[TaskUpdate] = None
+
+    @model_validator(mode="after")
+    def _require_changes_for_patch(self):
+        if self.op == "patch" and self.changes is None:
+            raise ValueError("patch operations need 'changes'")
+        return self
+
+
+class TaskBulkRequest(BaseModel):
+    operations: List[TaskBulkOperation] = Field(min_length=1)
+
+
+class TaskBulkItemResult(BaseModel):
+    id: int
+    op: str
+    status: int
+    task: Optional[TaskRead] = None
+    error: Optional[str] = None
+
+
+class TaskBulkResult(BaseModel):
+    results: List[TaskBulkItemResult]
+    streak: dict[str, Any]
+
+
 class EventCreate(BaseModel):
     name: str = Field(min_length=2, max_length=80)
     source: str = Field(default="mobile", max_length=40)
     properties: dict[str, Any] = Field(default_factory=dict)
 
 
+class EventBatch(BaseModel):
+    events: List[EventCreate] = Field(min_length=1)
+
+
+class EventBatchResult(BaseModel):
+    accepted: int
+    dropped: int
+
+
 class EventRead(BaseModel):
     id: int
     name: str
@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.services.event_partitions import archive_expired_events, retention_cutoff
+
+
+def archive_user_events(archive_dir: Optional[str] = None) -> None:
+    """Archive user_events months older than EVENT_RETENTION_DAYS to gzip NDJSON."""
+    db: Session = SessionLocal()
+    try:
+        archived = archive_expired_events(db, archive_dir=Path(archive_dir) if archive_dir else None)
+        print(f"Retention cutoff {retention_cutoff()}: archived {len(archived)} month(s)")
+        for item in archived:
+            print(f"  {item['month']}: {item['rows']} rows -> {item['path']}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    archive_user_events(sys.argv[1] if len(sys.argv) > 1 else None)
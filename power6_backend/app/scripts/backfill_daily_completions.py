@@ -0,0 +1,22 @@
+import sys
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.services.streak_service import rebuild_daily_completions
+
+
+def backfill_daily_completions(user_id: Optional[int] = None) -> None:
+    db: Session = SessionLocal()
+    try:
+        written = rebuild_daily_completions(db, user_id)
+        db.commit()
+        scope = f"user {user_id}" if user_id is not None else "all users"
+        print(f"Daily completion rollup rebuilt for {scope}: {written} rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill_daily_completions(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,25 @@
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.services.event_rollup import build_day, closed_through
+
+
+def build_event_rollups(days: int = 120) -> None:
+    """Rebuild the event rollups for the last ``days`` closed UTC days."""
+    db: Session = SessionLocal()
+    try:
+        last_day = closed_through(datetime.now(timezone.utc))
+        rows = 0
+        for offset in range(days):
+            rows += build_day(db, last_day - timedelta(days=offset))
+            db.commit()
+        print(f"Event rollups rebuilt for {days} days through {last_day}: {rows} rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    build_event_rollups(int(sys.argv[1]) if len(sys.argv) > 1 else 120)
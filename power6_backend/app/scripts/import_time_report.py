@@ -0,0 +1,96 @@
+"""Import-time report for worker cold start.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter,
+parses the per-module timings and prints where start-up time goes, grouped by
+top-level package, plus the slowest individual modules. ``--runs`` also times
+the whole import wall-clock (median of N fresh processes).
+
+    python -m app.scripts.import_time_report            # import app.main
+    python -m app.scripts.import_time_report --module app.routes --top 15 --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    timings = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return timings
+
+
+def measure(module: str) -> list[ImportTiming]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr[-2000:])
+    return parse_importtime(result.stderr)
+
+
+def wall_clock(module: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True, env=os.environ.copy())
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def report(timings: list[ImportTiming], top: int) -> str:
+    by_package: dict[str, int] = defaultdict(int)
+    for timing in timings:
+        by_package[timing.module.split(".")[0]] += timing.self_us
+    total = sum(by_package.values()) or 1
+
+    lines = [f"total import time: {total / 1000:.1f} ms across {len(timings)} modules", ""]
+    lines.append(f"{'package':<32}{'self ms':>10}{'share':>8}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"{package:<32}{self_us / 1000:>10.1f}{self_us / total:>8.1%}")
+
+    lines += ["", f"{'module':<48}{'self ms':>10}{'cumul ms':>10}"]
+    for timing in sorted(timings, key=lambda t: -t.self_us)[:top]:
+        lines.append(f"{timing.module:<48}{timing.self_us / 1000:>10.1f}{timing.cumulative_us / 1000:>10.1f}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time report for worker cold start")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=0, help="also time N fresh imports (median)")
+    args = parser.parse_args()
+
+    print(report(measure(args.module), args.top))
+    if args.runs:
+        print(f"\nwall clock (median of {args.runs}): {wall_clock(args.module, args.runs) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
-from app.database import Base, engine
+from app.database import engine
+from app.migrations import upgrade
 
-Base.metadata.create_all(bind=engine)
+upgrade(engine)
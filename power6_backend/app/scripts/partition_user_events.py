@@ -0,0 +1,19 @@
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.services.event_partitions import convert_to_partitioned, ensure_partitions
+
+
+def partition_user_events() -> None:
+    """Convert user_events into monthly range partitions (Postgres, run once)."""
+    db: Session = SessionLocal()
+    try:
+        convert_to_partitioned(db)
+        created = ensure_partitions(db)
+        print(f"user_events is partitioned; created: {', '.join(created) or 'nothing'}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    partition_user_events()
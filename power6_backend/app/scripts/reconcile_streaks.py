@@ -0,0 +1,33 @@
+import sys
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.models import User
+from app.services.streak_service import rebuild_daily_completions, rebuild_streak_state
+
+
+def reconcile_streaks(user_id: Optional[int] = None) -> None:
+    """Recompute daily rollups and persisted streak state from Task rows."""
+    db: Session = SessionLocal()
+    try:
+        if user_id is not None:
+            user_ids = [user_id]
+        else:
+            user_ids = [row.id for row in db.query(User.id).order_by(User.id.asc())]
+
+        for uid in user_ids:
+            rebuild_daily_completions(db, uid)
+            state = rebuild_streak_state(db, uid)
+            db.commit()
+            print(
+                f"user {uid}: streak={state.current_streak} "
+                f"longest={state.longest_streak} last={state.last_qualifying_day}"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    reconcile_streaks(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,208 @@
+"""Per-user, per-range cache for /tasks/analytics payloads.
+
+Entries are keyed by ``(user_id, from_date, to_date)`` with the range already
+resolved, so default ranges roll over with the calendar. Task writes call
+``invalidate_analytics`` with the UTC completion days they touched, which
+drops only the cached ranges covering those days.
+
+The default in-process backend only invalidates on the worker that handled
+the write, so its entries expire after ANALYTICS_CACHE_LOCAL_TTL_SECONDS
+(15s); other workers may serve analytics that old. Set
+ANALYTICS_CACHE_REDIS_URL to share the cache, and its invalidations, between
+workers; shared entries live for ANALYTICS_CACHE_TTL_SECONDS.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from datetime import date, timezone
+from typing import Any, Iterable, Optional
+
+from app.config.settings import settings
+from app.utils.cache import TTLCache
+from app.utils.metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+RangeKey = tuple[int, date, date]
+
+
+def analytics_footprint(task: Any) -> Optional[tuple[date, bool]]:
+    """What a task contributes to analytics: (UTC completion day, streak_bound), or None."""
+    completed_at = getattr(task, "completed_at", None)
+    if not getattr(task, "completed", False) or completed_at is None:
+        return None
+    if completed_at.tzinfo is None:
+        completed_at = completed_at.replace(tzinfo=timezone.utc)
+    return completed_at.astimezone(timezone.utc).date(), bool(getattr(task, "streak_bound", True))
+
+
+class _LocalBackend:
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._cache: TTLCache[dict[str, Any]] = TTLCache(
+            maxsize=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+            ttl=settings.ANALYTICS_CACHE_LOCAL_TTL_SECONDS,
+        )
+
+    def get(self, key: RangeKey) -> Optional[dict[str, Any]]:
+        return self._cache.get(key)
+
+    def set(self, key: RangeKey, payload: dict[str, Any]) -> None:
+        self._cache.set(key, payload)
+
+    def invalidate(self, user_id: int, days: Optional[set[date]]) -> int:
+        def covers(key: Any, _payload: Any) -> bool:
+            uid, start, end = key
+            return uid == user_id and (days is None or any(start <= d <= end for d in days))
+
+        return self._cache.discard_where(covers)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return self._cache.stats()
+
+
+class _RedisBackend:
+    """Shared backend; a per-user set tracks cached ranges for targeted invalidation."""
+
+    name = "redis"
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+        self._ttl = max(int(settings.ANALYTICS_CACHE_TTL_SECONDS), 1)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def _entry(key: RangeKey) -> str:
+        uid, start, end = key
+        return f"p6:analytics:{uid}:{start.isoformat()}:{end.isoformat()}"
+
+    @staticmethod
+    def _index(user_id: int) -> str:
+        return f"p6:analytics:{user_id}:ranges"
+
+    def _count(self, attr: str) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def get(self, key: RangeKey) -> Optional[dict[str, Any]]:
+        try:
+            raw = self._client.get(self._entry(key))
+        except Exception as e:  # a cache outage must not fail the request
+            logger.warning("analytics cache get failed: %s", e)
+            self._count("errors")
+            return None
+        if raw is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return json.loads(raw)
+
+    def set(self, key: RangeKey, payload: dict[str, Any]) -> None:
+        entry = self._entry(key)
+        try:
+            pipe = self._client.pipeline()
+            pipe.setex(entry, self._ttl, json.dumps(payload))
+            pipe.sadd(self._index(key[0]), entry)
+            pipe.expire(self._index(key[0]), self._ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("analytics cache set failed: %s", e)
+            self._count("errors")
+
+    def invalidate(self, user_id: int, days: Optional[set[date]]) -> int:
+        index = self._index(user_id)
+        try:
+            members = [
+                m.decode() if isinstance(m, bytes) else m
+                for m in self._client.smembers(index)
+            ]
+            doomed = []
+            for entry in members:
+                start, end = (date.fromisoformat(part) for part in entry.rsplit(":", 2)[1:])
+                if days is None or any(start <= d <= end for d in days):
+                    doomed.append(entry)
+            if doomed:
+                pipe = self._client.pipeline()
+                pipe.delete(*doomed)
+                pipe.srem(index, *doomed)
+                pipe.execute()
+            return len(doomed)
+        except Exception as e:
+            logger.warning("analytics cache invalidate failed: %s", e)
+            self._count("errors")
+            return 0
+
+    def clear(self) -> None:
+        try:
+            keys = list(self._client.scan_iter("p6:analytics:*"))
+            if keys:
+                self._client.delete(*keys)
+        except Exception as e:
+            logger.warning("analytics cache clear failed: %s", e)
+            self._count("errors")
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "ttl_seconds": self._ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _make_backend() -> Any:
+    url = settings.ANALYTICS_CACHE_REDIS_URL
+    if url:
+        try:
+            import redis
+
+            return _RedisBackend(redis.Redis.from_url(url))
+        except ImportError:
+            logger.warning("ANALYTICS_CACHE_REDIS_URL is set but redis is not installed; using memory")
+    return _LocalBackend()
+
+
+_backend = _make_backend()
+
+
+def get_cached_analytics(user_id: int, start: date, end: date) -> Optional[dict[str, Any]]:
+    return _backend.get((user_id, start, end))
+
+
+def cache_analytics(user_id: int, start: date, end: date, payload: dict[str, Any]) -> None:
+    _backend.set((user_id, start, end), payload)
+
+
+def invalidate_analytics(user_id: int, days: Optional[Iterable[date]] = None) -> int:
+    """Drop cached ranges for ``user_id`` that cover any of ``days`` (all ranges if None)."""
+    return _backend.invalidate(user_id, None if days is None else set(days))
+
+
+def record_analytics_change(user_id: int, before: Any, after: Any) -> None:
+    """Invalidate after a task write given the ``analytics_footprint`` before and after it."""
+    if before == after:
+        return
+    invalidate_analytics(user_id, [fp[0] for fp in (before, after) if fp is not None])
+
+
+def clear_analytics_cache() -> None:
+    _backend.clear()
+
+
+def analytics_cache_stats() -> dict[str, Any]:
+    return {"backend": _backend.name, **_backend.stats()}
+
+
+register_metrics("analytics_cache", analytics_cache_stats)
@@ -0,0 +1,194 @@
+"""In-process write-behind buffer for analytics events.
+
+``POST /events/batch`` enqueues rows here and returns immediately. A daemon
+thread drains the queue with one bulk INSERT per batch whenever
+EVENT_FLUSH_BATCH_SIZE rows are waiting or EVENT_FLUSH_INTERVAL_SECONDS has
+passed. The queue is bounded: when it is full new events are dropped and
+counted rather than blocking requests. Events still queued when the process
+dies are lost, which is acceptable for analytics.
+
+A flush that fails because the database is unreachable (connection errors,
+pool timeouts) puts its batch back at the front of the queue and stops until
+the next interval. A batch rejected for its contents (IntegrityError, e.g. an
+event for a user deleted meanwhile) is split and retried until only the
+offending rows are left; those are dropped and counted as ``failed``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Iterable
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.config.settings import settings
+from app.database import engine
+from app.models.models import UserEvent
+from app.utils.metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class EventBuffer:
+    def __init__(
+        self,
+        max_events: int,
+        batch_size: int,
+        interval_seconds: float,
+    ) -> None:
+        self.max_events = max(int(max_events), 1)
+        self.batch_size = max(int(batch_size), 1)
+        self.interval_seconds = max(float(interval_seconds), 0.01)
+        self._queue: deque[dict[str, Any]] = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        # monotonic time before which the flusher thread does not retry after an outage
+        self._retry_at = 0.0
+        self._stats = {
+            "enqueued": 0,
+            "flushed": 0,
+            "dropped": 0,
+            "failed": 0,
+            "requeued": 0,
+            "flushes": 0,
+            "flush_ms_total": 0.0,
+            "flush_ms_max": 0.0,
+            "last_flush_ms": 0.0,
+        }
+
+    def enqueue(self, rows: Iterable[dict[str, Any]]) -> tuple[int, int]:
+        """Queue rows for insertion; returns (accepted, dropped)."""
+        accepted = dropped = 0
+        with self._cond:
+            for row in rows:
+                if self._closed or len(self._queue) >= self.max_events:
+                    dropped += 1
+                    continue
+                self._queue.append(row)
+                accepted += 1
+            self._stats["enqueued"] += accepted
+            self._stats["dropped"] += dropped
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        if accepted:
+            self._ensure_thread()
+        return accepted, dropped
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="event-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                backing_off = time.monotonic() < self._retry_at
+                if (backing_off or len(self._queue) < self.batch_size) and not self._closed:
+                    self._cond.wait(self.interval_seconds)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def _take_batch(self) -> list[dict[str, Any]]:
+        with self._cond:
+            count = min(len(self._queue), self.batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _insert(self, rows: list[dict[str, Any]]) -> int:
+        """Insert ``rows``, bisecting on IntegrityError; returns the rows written.
+
+        Other errors propagate so the caller can requeue the batch.
+        """
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(UserEvent.__table__), rows)
+            return len(rows)
+        except IntegrityError as e:
+            if len(rows) == 1:
+                logger.warning("event buffer: dropping event rejected by the database: %s", e.orig)
+                with self._cond:
+                    self._stats["failed"] += 1
+                return 0
+        middle = len(rows) // 2
+        return self._insert(rows[:middle]) + self._insert(rows[middle:])
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of rows inserted."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    return written
+                started = time.perf_counter()
+                try:
+                    inserted = self._insert(batch)
+                except SQLAlchemyError as e:
+                    # database unavailable: keep the events and retry next interval
+                    logger.warning("event buffer: requeueing %d events after failed flush: %s", len(batch), e)
+                    with self._cond:
+                        self._queue.extendleft(reversed(batch))
+                        self._stats["requeued"] += len(batch)
+                        self._retry_at = time.monotonic() + self.interval_seconds
+                    return written
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                written += inserted
+                with self._cond:
+                    self._stats["flushed"] += inserted
+                    self._stats["flushes"] += 1
+                    self._stats["flush_ms_total"] += elapsed_ms
+                    self._stats["flush_ms_max"] = max(self._stats["flush_ms_max"], elapsed_ms)
+                    self._stats["last_flush_ms"] = elapsed_ms
+
+    def close(self) -> None:
+        """Stop accepting events and flush what is queued."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=max(self.interval_seconds * 2, 5.0))
+        self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            snapshot = dict(self._stats)
+            depth = len(self._queue)
+        flushes = snapshot["flushes"] or 1
+        return {
+            "depth": depth,
+            "max_events": self.max_events,
+            "batch_size": self.batch_size,
+            "interval_seconds": self.interval_seconds,
+            "enqueued": snapshot["enqueued"],
+            "flushed": snapshot["flushed"],
+            "dropped": snapshot["dropped"],
+            "failed": snapshot["failed"],
+            "requeued": snapshot["requeued"],
+            "flushes": snapshot["flushes"],
+            "avg_flush_ms": round(snapshot["flush_ms_total"] / flushes, 2),
+            "max_flush_ms": round(snapshot["flush_ms_max"], 2),
+            "last_flush_ms": round(snapshot["last_flush_ms"], 2),
+        }
+
+
+event_buffer = EventBuffer(
+    max_events=settings.EVENT_BUFFER_MAX_EVENTS,
+    batch_size=settings.EVENT_FLUSH_BATCH_SIZE,
+    interval_seconds=settings.EVENT_FLUSH_INTERVAL_SECONDS,
+)
+atexit.register(event_buffer.close)
+
+register_metrics("event_buffer", event_buffer.stats)
@@ -0,0 +1,315 @@
+"""Monthly partitioning, retention and archival for ``user_events``.
+
+On Postgres, ``app/scripts/partition_user_events.py`` converts the table once
+into a ``PARTITION BY RANGE (created_at)`` parent. The existing rows become the
+``user_events_legacy`` partition, and new rows go to monthly
+``user_events_pYYYYMM`` partitions. Queries that filter on ``created_at``,
+which every summary and rollup query does, only touch the partitions they
+need. ``ensure_partitions`` creates upcoming months; it runs from
+``python -m app.migrations upgrade`` on each deploy and from the retention
+job (``app/scripts/archive_user_events.py``), which should be scheduled at
+least monthly. Worker boot never touches partitions. Rows
+that arrive before their month exists land in ``user_events_default`` instead
+of failing, and are moved into the month's partition once it is created.
+
+SQLite and unconverted Postgres databases keep the single table. Archival
+still works there, month by month with DELETE, so tests exercise the same
+retention job.
+
+``archive_expired_events`` writes each expired month to
+``EVENT_ARCHIVE_DIR/user_events_YYYYMM.ndjson.gz`` and then detaches and drops
+the partition, or deletes the rows. Funnel numbers for archived days survive
+in ``event_daily_rollups``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.models.models import UserEvent
+
+logger = logging.getLogger(__name__)
+
+PARENT = "user_events"
+LEGACY = "user_events_legacy"
+DEFAULT = "user_events_default"
+# composite indexes declared on models.UserEvent
+INDEXES = {
+    "ix_user_events_user_created": "user_id, created_at",
+    "ix_user_events_name_created": "name, created_at",
+}
+# /events/summary looks back at most this far, so retention never goes below it
+SUMMARY_MAX_DAYS = 120
+ARCHIVE_BATCH_SIZE = 5000
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _add_months(day: date, months: int) -> date:
+    years, month_index = divmod(day.month - 1 + months, 12)
+    return date(day.year + years, month_index + 1, 1)
+
+
+def _utc(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _bound(day: date) -> str:
+    # explicit offset so bounds do not depend on the session time zone
+    return f"'{day.isoformat()} 00:00:00+00'"
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_p{month:%Y%m}"
+
+
+def retention_cutoff(now: Optional[datetime] = None) -> date:
+    """First day of the oldest month that is kept; everything before it is archived."""
+    now = now or datetime.now(timezone.utc)
+    days = max(settings.EVENT_RETENTION_DAYS, SUMMARY_MAX_DAYS + 1)
+    return _month_start((now - timedelta(days=days)).date())
+
+
+# ---------------------------------------------------------------------------
+# Postgres partition management
+# ---------------------------------------------------------------------------
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(
+        db.execute(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :name AND pg_table_is_visible(c.oid))"
+            ),
+            {"name": PARENT},
+        ).scalar()
+    )
+
+
+def monthly_partitions(db: Session) -> list[tuple[date, str]]:
+    """(month, table name) for every attached monthly partition, oldest first."""
+    names = db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :name"
+        ),
+        {"name": PARENT},
+    ).scalars()
+    months = []
+    prefix = f"{PARENT}_p"
+    for name in names:
+        if name.startswith(prefix) and len(name) == len(prefix) + 6:
+            months.append((date(int(name[-6:-2]), int(name[-2:]), 1), name))
+    return sorted(months)
+
+
+def _create_month(db: Session, lo: date) -> str:
+    name = partition_name(lo)
+    bounds = f"FROM ({_bound(lo)}) TO ({_bound(_add_months(lo, 1))})"
+    in_range = f"created_at >= {_bound(lo)} AND created_at < {_bound(_add_months(lo, 1))}"
+    stray = db.execute(text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT} WHERE {in_range})")).scalar()
+    if not stray:
+        db.execute(text(f"CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES {bounds}"))
+        return name
+    # ATTACH refuses while the default partition still holds rows of this range,
+    # so move them into a standalone table first
+    db.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS)"))
+    db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT} WHERE {in_range} RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        )
+    )
+    db.execute(text(f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES {bounds}"))
+    return name
+
+
+def ensure_partitions(db: Session, today: Optional[date] = None) -> list[str]:
+    """Create missing monthly partitions from this month through EVENT_PARTITION_MONTHS_AHEAD.
+
+    Only reads the catalog when nothing is missing. Also creates ``user_events_default`` if an older
+    conversion left it out. Returns the tables it created.
+    """
+    if not is_partitioned(db):
+        return []
+    month = _month_start(today or datetime.now(timezone.utc).date())
+    existing = {name for _, name in monthly_partitions(db)}
+    created = []
+    if db.execute(text("SELECT to_regclass(:name)"), {"name": DEFAULT}).scalar() is None:
+        db.execute(text(f"LOCK TABLE {PARENT} IN SHARE ROW EXCLUSIVE MODE"))
+        db.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT} PARTITION OF {PARENT} DEFAULT"))
+        created.append(DEFAULT)
+    for offset in range(max(settings.EVENT_PARTITION_MONTHS_AHEAD, 0) + 1):
+        lo = _add_months(month, offset)
+        if partition_name(lo) in existing:
+            continue
+        # serialize with other workers booting at the same time
+        db.execute(text(f"LOCK TABLE {PARENT} IN SHARE ROW EXCLUSIVE MODE"))
+        if partition_name(lo) in {name for _, name in monthly_partitions(db)}:
+            continue
+        created.append(_create_month(db, lo))
+    db.commit()
+    return created
+
+
+def convert_to_partitioned(db: Session, today: Optional[date] = None) -> None:
+    """One-time conversion of an existing ``user_events`` table (Postgres only).
+
+    Existing rows stay in place as the ``user_events_legacy`` partition covering
+    everything before the current month, so no data is copied. Its indexes are
+    renamed and attached to the parent's, so every later partition gets them too.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        raise RuntimeError("Partitioning is only supported on Postgres")
+    if is_partitioned(db):
+        _repair_parent_indexes(db)
+        return
+
+    cutover = _month_start(today or datetime.now(timezone.utc).date())
+    statements = [
+        f"LOCK TABLE {PARENT} IN ACCESS EXCLUSIVE MODE",
+        f"ALTER TABLE {PARENT} RENAME TO {LEGACY}",
+        # RENAME TABLE keeps index names; free them up for the parent
+        f"ALTER INDEX IF EXISTS {PARENT}_pkey RENAME TO {LEGACY}_pkey",
+        *(f"ALTER INDEX {index} RENAME TO {index}_legacy" for index in INDEXES),
+        f"CREATE TABLE {PARENT} (LIKE {LEGACY} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)",
+        # partitioned unique keys must include the partition key
+        f"ALTER TABLE {PARENT} ADD PRIMARY KEY (id, created_at)",
+        f"ALTER TABLE {PARENT} ADD FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE",
+        # the CHECK lets ATTACH skip its validation scan of the legacy rows
+        f"ALTER TABLE {LEGACY} ADD CONSTRAINT {LEGACY}_range CHECK (created_at < {_bound(cutover)})",
+        f"ALTER TABLE {PARENT} ATTACH PARTITION {LEGACY} FOR VALUES FROM (MINVALUE) TO ({_bound(cutover)})",
+        *(f"CREATE INDEX {index} ON ONLY {PARENT} ({columns})" for index, columns in INDEXES.items()),
+        # reuse the legacy indexes instead of rebuilding them
+        *(f"ALTER INDEX {index} ATTACH PARTITION {index}_legacy" for index in INDEXES),
+        f"CREATE TABLE {DEFAULT} PARTITION OF {PARENT} DEFAULT",
+    ]
+    for statement in statements:
+        db.execute(text(statement))
+    db.commit()
+    ensure_partitions(db, today=cutover)
+
+
+def _repair_parent_indexes(db: Session) -> None:
+    """Add the parent indexes missing from tables converted before they were attached.
+
+    Earlier conversions left the index names on the legacy partition, so the
+    parent and every monthly partition ended up without them.
+    """
+    present = set(
+        db.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = :name"), {"name": PARENT}).scalars()
+    )
+    for index, columns in INDEXES.items():
+        if index in present:
+            continue
+        db.execute(text(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_legacy"))
+        # without ONLY this builds the index on every partition and attaches the legacy one
+        db.execute(text(f"CREATE INDEX {index} ON {PARENT} ({columns})"))
+    db.commit()
+
+
+# ---------------------------------------------------------------------------
+# Retention / archival
+# ---------------------------------------------------------------------------
+
+_ARCHIVE_COLUMNS = (
+    UserEvent.id,
+    UserEvent.user_id,
+    UserEvent.name,
+    UserEvent.source,
+    UserEvent.tier,
+    UserEvent.properties,
+    UserEvent.user_agent,
+    UserEvent.created_at,
+)
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _write_archive(db: Session, month: date, archive_dir: Path) -> tuple[Path, int]:
+    """Stream one month of events into a gzip NDJSON file; returns (path, rows)."""
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"{PARENT}_{month:%Y%m}.ndjson.gz"
+    suffix = 1
+    while path.exists():
+        # never overwrite an earlier archive of the same month
+        suffix += 1
+        path = archive_dir / f"{PARENT}_{month:%Y%m}-{suffix}.ndjson.gz"
+    tmp = path.with_name(path.name + ".tmp")
+    stmt = (
+        select(*_ARCHIVE_COLUMNS)
+        .where(UserEvent.created_at >= _utc(month), UserEvent.created_at < _utc(_add_months(month, 1)))
+        .order_by(UserEvent.created_at.asc(), UserEvent.id.asc())
+        .execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+    )
+    names = [column.key for column in _ARCHIVE_COLUMNS]
+    rows = 0
+    with gzip.open(tmp, "wt", encoding="utf-8") as out:
+        for partition in db.execute(stmt).partitions():
+            for row in partition:
+                out.write(json.dumps({k: _json_value(v) for k, v in zip(names, row)}) + "\n")
+                rows += 1
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp, path)
+    return path, rows
+
+
+def archive_expired_events(
+    db: Session,
+    now: Optional[datetime] = None,
+    archive_dir: Optional[Path] = None,
+) -> list[dict[str, Any]]:
+    """Archive and remove every whole month older than the retention window."""
+    cutoff = retention_cutoff(now)
+    archive_dir = Path(archive_dir or settings.EVENT_ARCHIVE_DIR)
+    archived: list[dict[str, Any]] = []
+
+    if is_partitioned(db):
+        for month, name in monthly_partitions(db):
+            if _add_months(month, 1) > cutoff:
+                break
+            path, rows = _write_archive(db, month, archive_dir)
+            db.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+            db.execute(text(f"DROP TABLE {name}"))
+            db.commit()
+            archived.append({"month": month.isoformat(), "rows": rows, "path": str(path), "dropped": name})
+
+    # plain table, or rows still held by the legacy partition
+    while True:
+        oldest = db.query(func.min(UserEvent.created_at)).filter(UserEvent.created_at < _utc(cutoff)).scalar()
+        if oldest is None:
+            break
+        month = _month_start(oldest.date())
+        path, rows = _write_archive(db, month, archive_dir)
+        db.query(UserEvent).filter(
+            UserEvent.created_at >= _utc(month),
+            UserEvent.created_at < _utc(_add_months(month, 1)),
+        ).delete(synchronize_session=False)
+        db.commit()
+        archived.append({"month": month.isoformat(), "rows": rows, "path": str(path), "dropped": None})
+
+    if is_partitioned(db):
+        ensure_partitions(db)
+    return archived
@@ -0,0 +1,137 @@
+"""Daily rollups of ``user_events`` for the admin funnel.
+
+Closed UTC days are summarized once into ``event_daily_rollups`` (exact event
+counts plus a HyperLogLog of distinct users per name). A summary over any
+window merges the rollup rows for its whole days and scans raw events only for
+the partial edges, so the work is bounded by roughly two days of raw events
+plus one row per (day, name). Missing days are built lazily on first read;
+``app/scripts/build_event_rollups.py`` pre-builds them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.models import EventDailyRollup, UserEvent
+from app.utils.hll import HyperLogLog
+
+ALL_EVENTS = "*"
+# late write-behind flushes can still land for this long after midnight
+ROLLUP_GRACE = timedelta(hours=1)
+
+
+@dataclass
+class _Tally:
+    events: int = 0
+    users: HyperLogLog = field(default_factory=HyperLogLog)
+
+    def merge(self, events: int, users: HyperLogLog) -> None:
+        self.events += events
+        self.users.merge(users)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def closed_through(now: datetime) -> date:
+    """Last UTC day whose rollup can no longer change."""
+    return (now - ROLLUP_GRACE).date() - timedelta(days=1)
+
+
+def _scan_raw(db: Session, start: datetime, end: datetime) -> dict[str, _Tally]:
+    """Tally raw events in [start, end) per name, plus ALL_EVENTS."""
+    tallies: dict[str, _Tally] = {ALL_EVENTS: _Tally()}
+    if start >= end:
+        return tallies
+    rows = (
+        db.query(UserEvent.name, UserEvent.user_id, func.count(UserEvent.id))
+        .filter(UserEvent.created_at >= start, UserEvent.created_at < end)
+        .group_by(UserEvent.name, UserEvent.user_id)
+        .all()
+    )
+    total = tallies[ALL_EVENTS]
+    for name, user_id, count in rows:
+        tally = tallies.setdefault(name, _Tally())
+        tally.events += int(count)
+        tally.users.add(user_id)
+        total.events += int(count)
+        total.users.add(user_id)
+    return tallies
+
+
+def build_day(db: Session, day: date) -> int:
+    """(Re)build the rollup rows for one UTC day; returns the number of rows written."""
+    tallies = _scan_raw(db, _day_start(day), _day_start(day + timedelta(days=1)))
+    db.query(EventDailyRollup).filter(EventDailyRollup.day == day).delete(
+        synchronize_session=False
+    )
+    db.add_all(
+        EventDailyRollup(
+            day=day,
+            name=name,
+            events=tally.events,
+            users_hll=tally.users.to_bytes(),
+        )
+        for name, tally in tallies.items()
+    )
+    db.flush()
+    return len(tallies)
+
+
+def ensure_rollups(db: Session, first_day: date, last_day: date) -> int:
+    """Build any missing days in [first_day, last_day]; returns days built."""
+    if first_day > last_day:
+        return 0
+    built = {
+        day
+        for (day,) in db.query(EventDailyRollup.day).filter(
+            EventDailyRollup.name == ALL_EVENTS,
+            EventDailyRollup.day >= first_day,
+            EventDailyRollup.day <= last_day,
+        )
+    }
+    missing = [
+        first_day + timedelta(days=offset)
+        for offset in range((last_day - first_day).days + 1)
+        if first_day + timedelta(days=offset) not in built
+    ]
+    if not missing:
+        return 0
+    try:
+        for day in missing:
+            build_day(db, day)
+        db.commit()
+    except IntegrityError:
+        # a concurrent request built the same day first; its rows are equivalent
+        db.rollback()
+    return len(missing)
+
+
+def summarize_events(db: Session, since: datetime, now: Optional[datetime] = None) -> dict[str, _Tally]:
+    """Per-name tallies (plus ALL_EVENTS) for events in [since, now)."""
+    now = now or datetime.now(timezone.utc)
+    first_full = since.date() if since == _day_start(since.date()) else since.date() + timedelta(days=1)
+    last_full = closed_through(now)
+
+    if first_full > last_full:
+        return _scan_raw(db, since, now)
+
+    ensure_rollups(db, first_full, last_full)
+    tallies = _scan_raw(db, since, _day_start(first_full))
+    for edge_name, edge in _scan_raw(db, _day_start(last_full + timedelta(days=1)), now).items():
+        tallies.setdefault(edge_name, _Tally()).merge(edge.events, edge.users)
+
+    rows = db.query(EventDailyRollup.name, EventDailyRollup.events, EventDailyRollup.users_hll).filter(
+        EventDailyRollup.day >= first_full,
+        EventDailyRollup.day <= last_full,
+    )
+    for name, events, users_hll in rows:
+        tallies.setdefault(name, _Tally()).merge(int(events), HyperLogLog.from_bytes(users_hll))
+    return tallies
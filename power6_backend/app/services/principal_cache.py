@@ -0,0 +1,132 @@
+"""Authenticated-user principals and access-token claim freshness.
+
+Both caches are per process. ``invalidate_user`` takes effect at once on the
+worker that made the change; other workers catch up when their cached
+principal expires (USER_CACHE_TTL_SECONDS) and when token claims age past
+TOKEN_CLAIMS_MAX_AGE_SECONDS. Admin-gated routes use
+``get_verified_principal`` and read the users row every time.
+
+So for up to about a minute after ``DELETE /users/me`` another worker may
+still authorize the deleted user. Writes made in that window run under
+``user_must_exist``, which turns the resulting foreign-key failure into a
+401 instead of a 500.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.utils.cache import TTLCache
+from app.utils.metrics import register_metrics
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """The slice of a user that request authorization needs."""
+
+    id: int
+    username: str
+    email: Optional[str]
+    tier: Optional[str]
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user: Any) -> "UserPrincipal":
+        return cls(
+            id=int(user.id),
+            username=str(user.username),
+            email=str(user.email),
+            tier=user.tier,
+            is_admin=bool(user.is_admin),
+        )
+
+    def matches(self, subject: str) -> bool:
+        ident = subject.strip().lower()
+        return ident in (self.username.lower(), (self.email or "").lower())
+
+
+_principals: TTLCache[UserPrincipal] = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_ENTRIES,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+# user id -> wall-clock time of the last tier/account change seen by this
+# worker; tokens issued before that moment must not be trusted for their claims.
+_changed_at: dict[int, float] = {}
+_changed_lock = threading.Lock()
+
+
+def _key(subject: str) -> str:
+    return subject.strip().lower()
+
+
+def get_cached_principal(subject: str) -> Optional[UserPrincipal]:
+    return _principals.get(_key(subject))
+
+
+def cache_principal(subject: str, principal: UserPrincipal) -> None:
+    _principals.set(_key(subject), principal)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Forget every cached principal for ``user_id`` (tier change, deletion, ...)
+    and stop trusting claims in access tokens issued before now.
+    """
+    _principals.discard_where(lambda _key, principal: principal.id == user_id)
+    now = time.time()
+    horizon = now - settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    with _changed_lock:
+        _changed_at[user_id] = now
+        for uid in [uid for uid, at in _changed_at.items() if at < horizon]:
+            del _changed_at[uid]
+
+
+def claims_are_stale(user_id: int, issued_at: Optional[float]) -> bool:
+    """True when a token's tier/admin claims must be re-checked.
+
+    Claims older than TOKEN_CLAIMS_MAX_AGE_SECONDS are always re-checked,
+    which bounds how long a change made on another worker goes unnoticed.
+    """
+    if issued_at is None:
+        return True
+    issued_at = float(issued_at)
+    if time.time() - issued_at > settings.TOKEN_CLAIMS_MAX_AGE_SECONDS:
+        return True
+    changed = _changed_at.get(user_id)
+    return changed is not None and issued_at < changed
+
+
+@contextmanager
+def user_must_exist(db: Session, user_id: int) -> Iterator[None]:
+    """Map an IntegrityError raised for a user deleted meanwhile to a 401.
+
+    Wrap writes that insert rows referencing ``users``; any other integrity
+    failure is re-raised unchanged.
+    """
+    try:
+        yield
+    except IntegrityError:
+        from app.models.models import User
+
+        db.rollback()
+        if db.get(User, user_id) is not None:
+            raise
+        invalidate_user(user_id)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+
+def principal_cache_stats() -> dict[str, Any]:
+    return _principals.stats()
+
+
+register_metrics("user_cache", principal_cache_stats)
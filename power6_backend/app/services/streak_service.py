@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import Dict, Tuple
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 
-from sqlalchemy import Date, cast, func
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.models.models import Task
+from app.models.models import Task, UserDailyCompletion, UserStreak
+from app.utils.sql import dialect_name, utc_date
 
 # ----------------------------
 # Config++
@@ -20,68 +21,346 @@ def now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def completion_day(task: Any) -> Optional[date]:
+    """Return the UTC day a task counts toward, or None if it does not count."""
+    completed_at = getattr(task, "completed_at", None)
+    if not getattr(task, "completed", False) or completed_at is None:
+        return None
+    if not getattr(task, "streak_bound", True):
+        return None
+    if completed_at.tzinfo is None:
+        completed_at = completed_at.replace(tzinfo=timezone.utc)
+    return completed_at.astimezone(timezone.utc).date()
+
+
+def bump_daily_completion(db: Session, user_id: int, day: date, delta: int) -> int:
+    """Add ``delta`` to the user's rollup row for ``day`` and return the new count."""
+    table = UserDailyCompletion.__table__
+    dialect = dialect_name(db)
+
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = (
+            insert(table)
+            .values(user_id=user_id, day=day, count=max(delta, 0))
+            .on_conflict_do_update(
+                index_elements=[table.c.user_id, table.c.day],
+                set_={"count": table.c.count + delta},
+            )
+            .returning(table.c.count)
+        )
+        return int(db.execute(stmt).scalar_one())
+
+    row = db.get(UserDailyCompletion, (user_id, day))
+    if row is None:
+        row = UserDailyCompletion(user_id=user_id, day=day, count=max(delta, 0))
+        db.add(row)
+    else:
+        row.count = int(row.count or 0) + delta
+    db.flush()
+    return int(row.count)
+
+
+def record_completion_change(
+    db: Session,
+    user_id: int,
+    before: Optional[date],
+    after: Optional[date],
+    *,
+    threshold: int = DEFAULT_STREAK_THRESHOLD,
+) -> None:
+    """Move a task's contribution between rollup days (None means no contribution)
+    and carry the change through to the persisted streak state.
+    """
+    if before == after:
+        return
+    # take the streak row lock before any rollup row, so concurrent writes for
+    # one user queue up here instead of deadlocking on each other's day rows
+    state = lock_streak_state(db, user_id)
+    if before is not None:
+        new_count = bump_daily_completion(db, user_id, before, -1)
+        apply_day_count_change(db, user_id, before, new_count + 1, new_count, threshold=threshold, state=state)
+    if after is not None:
+        new_count = bump_daily_completion(db, user_id, after, 1)
+        apply_day_count_change(db, user_id, after, new_count - 1, new_count, threshold=threshold, state=state)
+
+
+def _insert_streak_row(db: Session, user_id: int) -> None:
+    """Create an empty (never built) streak row unless one exists or is being created."""
+    table = UserStreak.__table__
+    dialect = dialect_name(db)
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        db.execute(insert(table).values(user_id=user_id).on_conflict_do_nothing(index_elements=[table.c.user_id]))
+        return
+
+    db.add(UserStreak(user_id=user_id))
+    db.flush()
+
+
+def lock_streak_state(db: Session, user_id: int) -> UserStreak:
+    """Load the user's streak row ``FOR UPDATE`` (a no-op lock on SQLite).
+
+    Held until commit, so two concurrent completion changes for the same user
+    apply one after the other instead of overwriting each other's update. A
+    missing row is inserted first (ON CONFLICT DO NOTHING), so a user's first
+    completions have a row to lock too; it stays empty until
+    ``apply_day_count_change`` rebuilds it. An instance already edited in
+    this transaction is returned as is; its row is locked already.
+    """
+    held = db.identity_map.get(db.identity_key(UserStreak, user_id))
+    if held is not None and held in db.dirty:
+        return held
+    state = db.get(UserStreak, user_id, with_for_update=True, populate_existing=True)
+    if state is None:
+        _insert_streak_row(db, user_id)
+        state = db.get(UserStreak, user_id, with_for_update=True, populate_existing=True)
+    return state
+
+
+def rebuild_streak_state(
+    db: Session,
+    user_id: int,
+    *,
+    today: Optional[date] = None,
+    threshold: int = DEFAULT_STREAK_THRESHOLD,
+) -> UserStreak:
+    """Recompute the user's persisted streak state from the daily rollup."""
+    today = today or now_utc().date()
+    qualifying = (
+        db.query(UserDailyCompletion.day)
+        .filter(
+            UserDailyCompletion.user_id == user_id,
+            UserDailyCompletion.count >= threshold,
+            UserDailyCompletion.day <= today,
+        )
+        .order_by(UserDailyCompletion.day.asc())
+    )
+
+    run = 0
+    longest = 0
+    last: Optional[date] = None
+    for row in qualifying:
+        run = run + 1 if last is not None and row.day == last + timedelta(days=1) else 1
+        longest = max(longest, run)
+        last = row.day
+
+    t_count = (
+        db.query(UserDailyCompletion.count)
+        .filter(
+            UserDailyCompletion.user_id == user_id,
+            UserDailyCompletion.day == today,
+        )
+        .scalar()
+    )
+
+    state = db.get(UserStreak, user_id)
+    if state is None:
+        state = UserStreak(user_id=user_id)
+        db.add(state)
+    state.current_streak = run if last is not None else 0
+    state.last_qualifying_day = last
+    state.today_day = today
+    state.today_count = int(t_count or 0)
+    state.longest_streak = longest
+    db.flush()
+    return state
+
+
+def apply_day_count_change(
+    db: Session,
+    user_id: int,
+    day: date,
+    old_count: int,
+    new_count: int,
+    *,
+    threshold: int = DEFAULT_STREAK_THRESHOLD,
+    state: Optional[UserStreak] = None,
+) -> None:
+    """Update the persisted streak state in O(1) after one day's count changed.
+
+    Changes at the head of the current run are applied directly. Anything
+    that edits the middle of a run, or shortens the run that holds
+    ``longest_streak``, falls back to a rebuild from the rollup. Callers pass
+    the ``state`` they locked with ``lock_streak_state``.
+    """
+    today = now_utc().date()
+    if day > today:
+        return
+
+    if state is None:
+        state = db.get(UserStreak, user_id)
+    if state is None or state.today_day is None:
+        # no row yet, or the empty one lock_streak_state just inserted
+        rebuild_streak_state(db, user_id, today=today, threshold=threshold)
+        return
+
+    if day == today:
+        state.today_day = today
+        state.today_count = new_count
+
+    crossed_up = old_count < threshold <= new_count
+    crossed_down = new_count < threshold <= old_count
+    if not (crossed_up or crossed_down):
+        return
+
+    last = state.last_qualifying_day
+    current = state.current_streak or 0
+    if crossed_up and (last is None or day > last):
+        state.current_streak = current + 1 if last == day - timedelta(days=1) else 1
+        state.last_qualifying_day = day
+        state.longest_streak = max(state.longest_streak or 0, state.current_streak)
+    elif crossed_down and day == last and (state.longest_streak or 0) > current:
+        # the record belongs to an older, longer run, so only the head moves
+        state.current_streak = current - 1
+        state.last_qualifying_day = day - timedelta(days=1) if state.current_streak else None
+    else:
+        rebuild_streak_state(db, user_id, today=today, threshold=threshold)
+
+
+def read_streak_state(
+    db: Session,
+    user_id: int,
+    *,
+    today: Optional[date] = None,
+    threshold: int = DEFAULT_STREAK_THRESHOLD,
+) -> Tuple[int, int, bool]:
+    """Return (streak_count, today_count, has_completed_today) from a single
+    primary-key read of the persisted state. A streak only counts while today
+    qualifies, matching the day-by-day walk it replaces.
+    """
+    today = today or now_utc().date()
+    state = db.get(UserStreak, user_id)
+    if state is None:
+        streak, t_count = trailing_streak(db, user_id, today=today, threshold=threshold)
+        return streak, t_count, t_count >= threshold
+
+    streak = int(state.current_streak or 0) if state.last_qualifying_day == today else 0
+    t_count = int(state.today_count or 0) if state.today_day == today else 0
+    return streak, t_count, t_count >= threshold
+
+
 def daily_counts(db: Session, user_id: int) -> Dict[str, int]:
     """Return {YYYY-MM-DD: count} for completed, streak-bound tasks grouped by UTC day.
-    We group on DATE(completed_at) to align with UI expectations and avoid TZ drift.
+    Served from the user_daily_completions rollup rather than the task table.
     """
     rows = (
-        db.query(
-            cast(Task.completed_at, Date).label("day"),
-            func.count().label("cnt"),
-        )
+        db.query(UserDailyCompletion.day, UserDailyCompletion.count)
         .filter(
-            Task.user_id == user_id,
-            Task.completed.is_(True),
-            Task.streak_bound.is_(True),
-            Task.completed_at.isnot(None),
+            UserDailyCompletion.user_id == user_id,
+            UserDailyCompletion.count > 0,
         )
-        .group_by("day")
         .all()
     )
-    return {r.day.isoformat(): int(r.cnt) for r in rows if r.day is not None}
+    return {r.day.isoformat(): int(r.count) for r in rows}
 
 
 def today_count(db: Session, user_id: int) -> int:
     today = now_utc().date()
-    q = (
-        db.query(func.count())
+    count = (
+        db.query(UserDailyCompletion.count)
         .filter(
-            Task.user_id == user_id,
-            Task.completed.is_(True),
-            Task.streak_bound.is_(True),
-            cast(Task.completed_at, Date) == today,
+            UserDailyCompletion.user_id == user_id,
+            UserDailyCompletion.day == today,
         )
+        .scalar()
     )
-    return int(q.scalar() or 0)
+    return int(count or 0)
 
 
-def compute_streak(
+def trailing_streak(
     db: Session,
     user_id: int,
     *,
+    today: Optional[date] = None,
     threshold: int = DEFAULT_STREAK_THRESHOLD,
-) -> Tuple[int, int, bool]:
-    """Compute (streak_count, today_count, has_completed_today) using consecutive-day logic.
-    A day counts if completed_count >= threshold.
-    """
-    counts = daily_counts(db, user_id)
-    today = now_utc().date()
+) -> Tuple[int, int]:
+    """Return (streak_count, today_count) reading only the trailing run of days.
 
-    t_key = today.isoformat()
-    t_count = counts.get(t_key, 0)
-    has_today = t_count >= threshold
+    Rows are read newest first in small pages and the scan stops at the first
+    gap or below-threshold day, so cost tracks the streak length, not the history.
+    """
+    today = today or now_utc().date()
+    page_size = 32
 
     streak = 0
-    cursor = today
+    t_count = 0
+    expected = today
     while True:
-        key = cursor.isoformat()
-        if counts.get(key, 0) >= threshold:
+        rows = (
+            db.query(UserDailyCompletion.day, UserDailyCompletion.count)
+            .filter(
+                UserDailyCompletion.user_id == user_id,
+                UserDailyCompletion.day <= expected,
+            )
+            .order_by(UserDailyCompletion.day.desc())
+            .limit(page_size)
+            .all()
+        )
+        for row in rows:
+            if row.day == today:
+                t_count = int(row.count)
+            if row.day != expected or int(row.count) < threshold:
+                return streak, t_count
             streak += 1
-            cursor = cursor - timedelta(days=1)
-        else:
-            break
+            expected = expected - timedelta(days=1)
+        if len(rows) < page_size:
+            return streak, t_count
+
+
+def rebuild_daily_completions(db: Session, user_id: Optional[int] = None) -> int:
+    """Recompute rollup rows from Task rows (all users, or one user). Returns rows written."""
+    day_col = utc_date(db, Task.completed_at)
+
+    delete_q = db.query(UserDailyCompletion)
+    source = db.query(
+        Task.user_id.label("user_id"),
+        day_col.label("day"),
+        func.count().label("cnt"),
+    ).filter(
+        Task.completed.is_(True),
+        Task.streak_bound.is_(True),
+        Task.completed_at.isnot(None),
+    )
+    if user_id is not None:
+        delete_q = delete_q.filter(UserDailyCompletion.user_id == user_id)
+        source = source.filter(Task.user_id == user_id)
+
+    delete_q.delete(synchronize_session=False)
 
-    return streak, t_count, has_today
+    written = 0
+    batch: list[dict] = []
+    for row in source.group_by(Task.user_id, day_col).yield_per(1000):
+        day = row.day if isinstance(row.day, date) else date.fromisoformat(str(row.day))
+        batch.append({"user_id": row.user_id, "day": day, "count": int(row.cnt)})
+        if len(batch) >= 1000:
+            db.execute(UserDailyCompletion.__table__.insert(), batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        db.execute(UserDailyCompletion.__table__.insert(), batch)
+        written += len(batch)
+    return written
+
+
+def compute_streak(
+    db: Session,
+    user_id: int,
+    *,
+    threshold: int = DEFAULT_STREAK_THRESHOLD,
+) -> Tuple[int, int, bool]:
+    """Compute (streak_count, today_count, has_completed_today) using consecutive-day logic.
+    A day counts if completed_count >= threshold.
+    """
+    return read_streak_state(db, user_id, threshold=threshold)
 
 
 # ----------------------------
@@ -103,6 +382,8 @@ def refresh_streak_payload(
     db: Session, user_id: int, *, threshold: int = DEFAULT_STREAK_THRESHOLD
 ) -> dict:
     # Idempotent recompute; return same shape with an ok flag
+    rebuild_streak_state(db, user_id, threshold=threshold)
+    db.commit()
     streak_count, t_count, has_today = compute_streak(db, user_id, threshold=threshold)
     return {
         "ok": True,
@@ -0,0 +1,303 @@
+"""Streaming task-history export (CSV, NDJSON, Arrow IPC stream, Parquet).
+
+Rows are read in ``EXPORT_BATCH_SIZE`` partitions from a streaming cursor
+over just the exported columns, and each partition is rendered and sent
+before the next is fetched, so memory stays flat regardless of export size.
+The generators open their own session because the response body outlives
+the request-scoped one.
+"""
+
+from __future__ import annotations
+
+import csv
+import functools
+import json
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from io import StringIO
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from app.database import AsyncSessionLocal, SessionLocal
+from app.models.models import Task
+
+
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "notes",
+    "priority",
+    "streak_bound",
+    "created_at",
+    "completed_at",
+    "reviewed_at",
+)
+EXPORT_BATCH_SIZE = 1000
+
+# format -> (media type, file extension, text format that may be gzip-encoded)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv", True),
+    "ndjson": ("application/x-ndjson", "ndjson", True),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows", False),
+    "parquet": ("application/vnd.apache.parquet", "parquet", False),
+}
+COLUMNAR_FORMATS = ("arrow", "parquet")
+
+
+def history_range(
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> tuple[date, date]:
+    today = datetime.now(timezone.utc).date()
+    return from_date or (today - timedelta(days=30)), to_date or today
+
+
+def history_criteria(
+    uid: int,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> list[Any]:
+    """WHERE clauses for completed tasks in [from_date, to_date] (default: last 30 days)."""
+    from_date, to_date = history_range(from_date, to_date)
+    return [
+        Task.user_id == uid,
+        Task.completed.is_(True),
+        Task.completed_at >= datetime.combine(from_date, datetime.min.time(), tzinfo=timezone.utc),
+        Task.completed_at <= datetime.combine(to_date, datetime.max.time(), tzinfo=timezone.utc),
+    ]
+
+
+def history_export_select(
+    uid: int,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+):
+    return (
+        select(*(getattr(Task, field) for field in EXPORT_FIELDS))
+        .where(*history_criteria(uid, from_date, to_date))
+        .order_by(Task.completed_at.desc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+async def iter_history_batches(
+    uid: int,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> AsyncIterator[Sequence[Any]]:
+    """Yield lists of export rows, one streaming-cursor partition at a time."""
+    stmt = history_export_select(uid, from_date, to_date)
+
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(stmt)
+            async for partition in result.partitions():
+                yield partition
+        return
+
+    # sync engine only: fetch each partition on the threadpool
+    db = SessionLocal()
+    try:
+        result = await run_in_threadpool(db.execute, stmt)
+        partitions = result.partitions()
+        while True:
+            partition = await run_in_threadpool(next, partitions, None)
+            if partition is None:
+                break
+            yield partition
+    finally:
+        await run_in_threadpool(db.close)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunk(rows: Sequence[Sequence[Any]]) -> str:
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_csv_value(v) for v in row])
+    return buffer.getvalue()
+
+
+async def stream_history_csv(
+    uid: int,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> AsyncIterator[str]:
+    yield _csv_chunk([EXPORT_FIELDS])
+    async for batch in iter_history_batches(uid, from_date, to_date):
+        yield _csv_chunk(batch)
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def stream_history_ndjson(
+    uid: int,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> AsyncIterator[str]:
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    async for batch in iter_history_batches(uid, from_date, to_date):
+        yield "".join(
+            dumps({field: _json_value(v) for field, v in zip(EXPORT_FIELDS, row)}) + "\n"
+            for row in batch
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _pyarrow():
+    """(pyarrow, pyarrow.parquet), imported on the first columnar export.
+
+    pyarrow is optional and slow to import, so it stays out of worker start-up.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:  # pragma: no cover - depends on the deployment
+        return None
+    return pyarrow, pyarrow.parquet
+
+
+def columnar_available() -> bool:
+    return _pyarrow() is not None
+
+
+def _arrow_schema():
+    pa, _ = _pyarrow()
+    timestamp = pa.timestamp("us", tz="UTC")
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("title", pa.string()),
+            ("notes", pa.string()),
+            ("priority", pa.int8()),
+            ("streak_bound", pa.bool_()),
+            ("created_at", timestamp),
+            ("completed_at", timestamp),
+            ("reviewed_at", timestamp),
+        ]
+    )
+
+
+class _ChunkSink:
+    """Write-only file object whose buffered bytes are drained between batches."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_history_columnar(
+    fmt: str,
+    uid: int,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> AsyncIterator[bytes]:
+    """Arrow IPC stream or Parquet, one record batch / row group per cursor partition.
+
+    Parquet cannot be read until its footer arrives, but row groups are
+    still flushed as they are written so server memory stays bounded.
+    """
+    if not columnar_available():
+        raise RuntimeError("pyarrow is not installed")
+    pa, pq = _pyarrow()
+
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+    out = pa.PythonFile(sink, mode="w")
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(out, schema)
+        write = writer.write_table
+    else:
+        writer = pa.ipc.new_stream(out, schema)
+        write = writer.write_batch
+
+    async for batch in iter_history_batches(uid, from_date, to_date):
+        columns = list(zip(*batch))
+        record_batch = pa.record_batch(
+            [pa.array(column, type=f.type) for column, f in zip(columns, schema)],
+            schema=schema,
+        )
+        write(pa.Table.from_batches([record_batch]) if fmt == "parquet" else record_batch)
+        data = sink.drain()
+        if data:
+            yield data
+
+    writer.close()
+    out.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def stream_history(
+    fmt: str,
+    uid: int,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> AsyncIterator[Any]:
+    if fmt == "csv":
+        return stream_history_csv(uid, from_date, to_date)
+    if fmt == "ndjson":
+        return stream_history_ndjson(uid, from_date, to_date)
+    return stream_history_columnar(fmt, uid, from_date, to_date)
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """True when an Accept-Encoding header allows gzip (q > 0)."""
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+async def gzip_chunks(chunks: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
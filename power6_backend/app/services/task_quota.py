@@ -0,0 +1,85 @@
+"""Per-user, per-UTC-day quota on newly created tasks.
+
+A quota row is claimed with a single upsert guarded by the limit
+(``INSERT ... ON CONFLICT DO UPDATE ... WHERE created < :limit RETURNING``),
+in the same transaction as the task insert. Concurrent creates serialize on
+the row, so they cannot race past the limit, and a rolled-back create gives
+its slot back. Deleting a task on the day it was created releases the slot,
+matching the old COUNT over today's tasks.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.models.models import UserDailyTaskQuota
+from app.utils.sql import dialect_name
+
+
+def daily_new_task_limit(principal: Any) -> int:
+    """The caller's limit: a per-tier override if configured, else the default."""
+    tier = str(getattr(principal, "tier", None) or "free").strip().lower()
+    if getattr(principal, "is_admin", False):
+        tier = "admin"
+    return settings.daily_new_task_limits.get(tier, settings.DAILY_NEW_TASK_LIMIT)
+
+
+def quota_day(created_at: Optional[datetime] = None) -> date:
+    created_at = created_at or datetime.now(timezone.utc)
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.astimezone(timezone.utc).date()
+
+
+def claim_new_task_slot(db: Session, user_id: int, limit: int, day: Optional[date] = None) -> bool:
+    """Take one of today's slots; False (and nothing written) when the limit is reached."""
+    if limit <= 0:
+        return False
+    day = day or quota_day()
+    table = UserDailyTaskQuota.__table__
+    dialect = dialect_name(db)
+
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = (
+            insert(table)
+            .values(user_id=user_id, day=day, created=1)
+            .on_conflict_do_update(
+                index_elements=[table.c.user_id, table.c.day],
+                set_={"created": table.c.created + 1},
+                where=table.c.created < limit,
+            )
+            .returning(table.c.created)
+        )
+        return db.execute(stmt).scalar_one_or_none() is not None
+
+    row = db.get(UserDailyTaskQuota, (user_id, day), with_for_update=True)
+    if row is None:
+        db.add(UserDailyTaskQuota(user_id=user_id, day=day, created=1))
+    elif int(row.created or 0) >= limit:
+        return False
+    else:
+        row.created = int(row.created or 0) + 1
+    db.flush()
+    return True
+
+
+def release_new_task_slot(db: Session, user_id: int, created_at: Optional[datetime]) -> None:
+    """Give back the slot of a task deleted on the UTC day it was created."""
+    if created_at is None or quota_day(created_at) != quota_day():
+        return
+    table = UserDailyTaskQuota.__table__
+    db.execute(
+        update(table)
+        .where(table.c.user_id == user_id, table.c.day == quota_day(created_at), table.c.created > 0)
+        .values(created=table.c.created - 1)
+    )
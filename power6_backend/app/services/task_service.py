@@ -1,26 +1,95 @@
+"""Task reads and writes shared by the /tasks routes.
+
+Functions take a sync ``Session`` so routes can hand them to ``run_db``. List
+reads select exactly the ``TaskRead`` fields (``day_key`` computed in SQL) as
+plain dicts that ``dump_json`` turns into response bytes without building or
+re-validating a model per row. Writes load the ORM instance, keep the streak
+rollup, daily quota and analytics cache in step, and build the response
+without reloading the row.
+"""
+
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta, timezone
-from typing import List, Optional #Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import Date, cast
+from pydantic_core import to_json
+from sqlalchemy import case, func, select, tuple_, union_all
 from sqlalchemy.orm import Session
 
-from app.models.models import Task as TaskModel
-from app.schemas import TaskCreate, TaskRead, TaskUpdate
+from app.models.models import Task as TaskModel, TaskTombstone
+from app.schemas import TaskBulkItemResult, TaskBulkOperation, TaskBulkResult, TaskCreate, TaskRead
+from app.services.analytics_cache import analytics_footprint, record_analytics_change
+from app.services.principal_cache import user_must_exist
+from app.services.streak_service import completion_day, get_streak_payload, record_completion_change
+from app.services.task_export import history_criteria
+from app.services.task_quota import claim_new_task_slot, release_new_task_slot
+from app.utils.cursor import encode_cursor, encode_sync_token
+from app.utils.sql import utc_date
 
 # ----------------------------
-# Helpers (UTC, priority, day_key)
+# Config
 # ----------------------------
 PRIORITY_MAP = {"low": 0, "normal": 1, "high": 2}
+ALLOWED_ORDER_FIELDS = {
+    "id",
+    "title",
+    "priority",
+    "completed",
+    "scheduled_for",
+    "created_at",
+    "completed_at",
+    "reviewed_at",
+    "streak_bound",
+}
+# Non-null order fields usable for keyset pagination, with the coercion
+# applied to the sort value decoded from a cursor.
+CURSOR_ORDER_FIELDS = {
+    "id": int,
+    "title": str,
+    "priority": int,
+    "completed": bool,
+    "streak_bound": bool,
+    "created_at": datetime.fromisoformat,
+}
+
+# Delta sync re-sends this much of the previous window so rows committed
+# just after a token was issued (with an earlier updated_at) are not missed.
+SYNC_TOKEN_OVERLAP = timedelta(seconds=5)
+TOMBSTONE_RETENTION = timedelta(days=2)
+
+# TaskRead's stored fields, in its field order; list reads add day_key in SQL
+TASK_READ_COLUMNS = (
+    TaskModel.title,
+    TaskModel.notes,
+    TaskModel.priority,
+    TaskModel.scheduled_for,
+    TaskModel.streak_bound,
+    TaskModel.id,
+    TaskModel.user_id,
+    TaskModel.completed,
+    TaskModel.created_at,
+    TaskModel.completed_at,
+    TaskModel.reviewed_at,
+)
 
 
+# ----------------------------
+# Helpers (UTC, priority, serialization)
+# ----------------------------
 def now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def priority_to_int(v) -> int:
+def utc_day_bounds(target_day: Optional[date] = None) -> Tuple[datetime, datetime]:
+    day = target_day or now_utc().date()
+    start = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+    end = datetime.combine(day, datetime.max.time(), tzinfo=timezone.utc)
+    return start, end
+
+
+def priority_to_int(v: Any) -> int:
     if isinstance(v, int):
         return v if v in (0, 1, 2) else 1
     if isinstance(v, str):
@@ -28,12 +97,18 @@ def priority_to_int(v) -> int:
     return 1
 
 
-def compute_day_key(task: TaskModel) -> str:
-    dt = task.scheduled_for or task.created_at or now_utc()
+def compute_day_key(task: Any) -> str:
+    dt = task.scheduled_for or task.created_at
+    if dt is None:
+        return now_utc().date().isoformat()
+    if dt.tzinfo is None:
+        # SQLite hands back naive values; they are stored as UTC
+        dt = dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc).date().isoformat()
 
 
-def to_task_read(task: TaskModel) -> TaskRead:
+def to_task_read(task: Any) -> TaskRead:
+    """Build TaskRead from a single Task instance (write responses)."""
     return TaskRead(
         id=task.id,
         user_id=task.user_id,
@@ -50,51 +125,45 @@ def to_task_read(task: TaskModel) -> TaskRead:
     )
 
 
-def check_daily_new_task_limit(db: Session, uid: int, limit: int = 6) -> None:
-    today = now_utc().date()
-    start_dt = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
-    end_dt = datetime.combine(today, datetime.max.time(), tzinfo=timezone.utc)
+def task_read_select(db: Session):
+    """SELECT of the TaskRead fields, with day_key as the UTC date in SQL."""
+    day_key = utc_date(db, func.coalesce(TaskModel.scheduled_for, TaskModel.created_at))
+    return select(*TASK_READ_COLUMNS, day_key.label("day_key"))
 
-    created_today_count = (
-        db.query(TaskModel)
-        .filter(
-            TaskModel.user_id == uid,
-            TaskModel.created_at >= start_dt,
-            TaskModel.created_at <= end_dt,
-        )
-        .count()
-    )
 
-    if created_today_count >= limit:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Daily new task limit reached ({limit}). You can add more tasks tomorrow.",
-        )
+def _fetch_dicts(db: Session, stmt: Any) -> List[Dict[str, Any]]:
+    result = db.execute(stmt)
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
 
 
-# ----------------------------
-# Service API
-# ----------------------------
-def create_task(db: Session, user_id: int, payload: TaskCreate) -> TaskRead:
-    check_daily_new_task_limit(db, user_id)
-
-    db_task = TaskModel(
-        title=payload.title,
-        notes=payload.notes,
-        priority=priority_to_int(payload.priority),
-        scheduled_for=payload.scheduled_for,
-        completed=payload.completed,
-        streak_bound=payload.streak_bound,
-        completed_at=payload.completed_at,
-        user_id=user_id,
-        created_at=now_utc(),
-    )
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
-    return to_task_read(db_task)
+def _read_rows(
+    db: Session,
+    *criteria: Any,
+    order_by: Sequence[Any] = (),
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    stmt = task_read_select(db).where(*criteria).order_by(*order_by)
+    if offset:
+        stmt = stmt.offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return _fetch_dicts(db, stmt)
+
+
+def dump_json(payload: Any) -> bytes:
+    """JSON bytes for rows from the read functions (or anything containing them).
+
+    Columns already have TaskRead's types, so pydantic-core serializes them
+    directly with the same datetime/date formatting TaskRead would produce.
+    """
+    return to_json(payload)
 
 
+# ----------------------------
+# Reads
+# ----------------------------
 def list_tasks(
     db: Session,
     user_id: int,
@@ -104,133 +173,396 @@ def list_tasks(
     limit: int = 50,
     offset: int = 0,
     order: str = "-created_at",
-) -> List[TaskRead]:
-    q = db.query(TaskModel).filter(TaskModel.user_id == user_id)
-
-    if completed is not None:
-        q = q.filter(TaskModel.completed.is_(bool(completed)))
-
-    if day is not None:
-        q = q.filter(cast(TaskModel.created_at, Date) == day)
+    after: Optional[Tuple[Any, int]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of task rows plus the cursor for the next page, if there is one.
 
+    ``after`` is a decoded (sort value, id) cursor; when given, the page
+    seeks past it instead of using OFFSET.
+    """
     desc = order.startswith("-")
     field = order.lstrip("-")
     col = getattr(TaskModel, field)
-    q = q.order_by(col.desc() if desc else col.asc())
 
-    rows = q.offset(offset).limit(limit).all()
-    return [to_task_read(t) for t in rows]
+    criteria: List[Any] = [TaskModel.user_id == user_id]
+    if completed is not None:
+        criteria.append(TaskModel.completed.is_(bool(completed)))
+    if day is not None:
+        criteria.append(utc_date(db, TaskModel.created_at) == day)
+    key = tuple_(col, TaskModel.id)
+    if after is not None:
+        criteria.append(key < tuple_(*after) if desc else key > tuple_(*after))
+
+    # id breaks ties so both pagination modes see a stable total order
+    order_by = (col.desc(), TaskModel.id.desc()) if desc else (col.asc(), TaskModel.id.asc())
+    rows = _read_rows(
+        db,
+        *criteria,
+        order_by=order_by,
+        limit=limit + 1,
+        offset=offset if after is None else 0,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more and field in CURSOR_ORDER_FIELDS:
+        last = rows[-1]
+        next_cursor = encode_cursor(order, last[field], last["id"])
+    return rows, next_cursor
+
+
+def task_set_version(db: Session, user_id: int) -> Tuple[Any, ...]:
+    """Cheap per-user version of the task set: (row count, max updated_at, max id).
+
+    Every write path bumps updated_at and deletes drop the count, so any
+    change to a user's tasks changes this tuple.
+    """
+    return tuple(
+        db.execute(
+            select(
+                func.count(TaskModel.id),
+                func.max(TaskModel.updated_at),
+                func.max(TaskModel.id),
+            ).where(TaskModel.user_id == user_id)
+        ).one()
+    )
 
 
-def get_today_tasks(db: Session, user_id: int) -> List[TaskRead]:
-    today = date.today()
-    rows = (
-        db.query(TaskModel)
-        .filter(
+def active_tasks(db: Session, user_id: int) -> List[Dict[str, Any]]:
+    """Incomplete tasks plus tasks completed today (UTC).
+
+    Two disjoint branches instead of one OR, so each is an index range
+    (user_id, completed) / (user_id, completed_at) rather than a scan of the
+    user's whole history.
+    """
+    day_start, day_end = utc_day_bounds()
+    active = union_all(
+        task_read_select(db).where(
             TaskModel.user_id == user_id,
             TaskModel.completed.is_(False),
-            cast(TaskModel.created_at, Date) <= today,
-        )
-        .order_by(TaskModel.priority.desc(), TaskModel.created_at.asc())
-        .all()
+        ),
+        task_read_select(db).where(
+            TaskModel.user_id == user_id,
+            TaskModel.completed.is_(True),
+            TaskModel.completed_at >= day_start,
+            TaskModel.completed_at <= day_end,
+        ),
+    ).subquery()
+    return _fetch_dicts(
+        db,
+        select(active).order_by(
+            active.c.completed.asc(),
+            active.c.priority.desc(),
+            active.c.created_at.asc(),
+        ),
     )
-    return [to_task_read(t) for t in rows]
 
 
-def get_history(
+def task_changes(
+    db: Session,
+    user_id: int,
+    since_at: Optional[datetime],
+    issued_at: datetime,
+) -> Dict[str, Any]:
+    """TaskChanges payload since ``since_at``; the full active set when it is None."""
+    if since_at is None:
+        return {
+            "changed": active_tasks(db, user_id),
+            "deleted": [],
+            "sync_token": encode_sync_token(issued_at),
+            "full_resync": True,
+        }
+
+    cutoff = since_at - SYNC_TOKEN_OVERLAP
+    changed = _read_rows(
+        db,
+        TaskModel.user_id == user_id,
+        TaskModel.updated_at > cutoff,
+        order_by=(TaskModel.updated_at.asc(), TaskModel.id.asc()),
+    )
+    deleted = db.execute(
+        select(TaskTombstone.task_id).where(
+            TaskTombstone.user_id == user_id,
+            TaskTombstone.deleted_at > cutoff,
+        )
+    ).scalars()
+    return {
+        "changed": changed,
+        "deleted": sorted(set(deleted)),
+        "sync_token": encode_sync_token(issued_at),
+        "full_resync": False,
+    }
+
+
+def history(
     db: Session,
     user_id: int,
-    *,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
-) -> List[TaskRead]:
-    today = date.today()
-    from_date = from_date or (today - timedelta(days=30))
-    to_date = to_date or today
+) -> List[Dict[str, Any]]:
+    return _read_rows(
+        db,
+        *history_criteria(user_id, from_date, to_date),
+        order_by=(TaskModel.completed_at.desc(),),
+    )
 
-    start_dt = datetime.combine(from_date, datetime.min.time(), tzinfo=timezone.utc)
-    end_dt = datetime.combine(to_date, datetime.max.time(), tzinfo=timezone.utc)
 
-    rows = (
-        db.query(TaskModel)
-        .filter(
-            TaskModel.user_id == user_id,
-            TaskModel.completed.is_(True),
-            TaskModel.completed_at >= start_dt,
-            TaskModel.completed_at <= end_dt,
+def analytics(db: Session, user_id: int, range_start: date, range_end: date) -> Dict[str, Any]:
+    # one row per UTC day, so the work scales with days in range, not tasks
+    day_col = utc_date(db, TaskModel.completed_at)
+    rows = db.execute(
+        select(
+            day_col.label("day"),
+            func.count(TaskModel.id),
+            func.sum(case((TaskModel.streak_bound.is_(True), 1), else_=0)),
         )
-        .order_by(TaskModel.completed_at.desc())
-        .all()
+        .where(*history_criteria(user_id, range_start, range_end))
+        .group_by(day_col)
+    ).all()
+
+    if not rows:
+        return {
+            "completed_tasks": 0,
+            "streak_bound_completed": 0,
+            "completion_rate": 0,
+            "best_day": None,
+            "recent_trend": [],
+            "message": "No completed tasks in this period yet.",
+        }
+
+    by_day: Dict[str, int] = {}
+    streak_bound = 0
+    for day, count, bound in rows:
+        day_key = day if isinstance(day, str) else day.isoformat()
+        by_day[day_key] = int(count)
+        streak_bound += int(bound or 0)
+
+    # ties go to the most recent day
+    best_day_key, best_day_count = max(by_day.items(), key=lambda item: (item[1], item[0]))
+    recent_trend = [
+        {"day": day, "completed": count}
+        for day, count in sorted(by_day.items(), reverse=True)[:7]
+    ]
+
+    completed_tasks = sum(by_day.values())
+    days = max(len(by_day), 1)
+    completion_rate = round(
+        min(completed_tasks / (days * 6), 1.0) * 100,
+        1,
     )
-    return [to_task_read(t) for t in rows]
 
+    return {
+        "completed_tasks": completed_tasks,
+        "streak_bound_completed": streak_bound,
+        "completion_rate": completion_rate,
+        "best_day": {"day": best_day_key, "completed": best_day_count},
+        "recent_trend": recent_trend,
+    }
+
+
+# ----------------------------
+# Writes
+# ----------------------------
+def check_daily_new_task_limit(db: Session, user_id: int, limit: int) -> None:
+    # claims the slot in this transaction; a failed create rolls it back
+    if not claim_new_task_slot(db, user_id, limit):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Daily new task limit reached ({limit}). You can add more tasks tomorrow.",
+        )
 
-def patch_task(db: Session, user_id: int, task_id: int, payload: TaskUpdate) -> TaskRead:
-    task = (
+
+def get_owned_task(db: Session, user_id: int, task_id: int) -> TaskModel:
+    task: Optional[TaskModel] = (
         db.query(TaskModel)
         .filter(TaskModel.id == task_id, TaskModel.user_id == user_id)
         .first()
     )
-    if not task:
+    if task is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    return task
+
+
+def apply_task_update(task: TaskModel, payload_data: Dict[str, Any]) -> None:
+    prev_completed = bool(getattr(task, "completed", False))
 
-    prev_completed = bool(task.completed)
-    data = payload.model_dump(exclude_unset=True)
+    if "priority" in payload_data:
+        payload_data["priority"] = priority_to_int(payload_data["priority"])
 
-    if "priority" in data:
-        data["priority"] = priority_to_int(data["priority"])
+    completed_provided = "completed" in payload_data
+    new_completed = payload_data.pop("completed", None)
 
-    completed_provided = "completed" in data
-    new_completed = data.pop("completed", None)
+    # allow reviewed_at to be written directly from review screen
+    reviewed_at = payload_data.get("reviewed_at")
 
-    for k, v in data.items():
-        setattr(task, k, v)
+    for key, value in payload_data.items():
+        setattr(task, key, value)
 
     if completed_provided and new_completed is not None and new_completed != prev_completed:
         if new_completed:
             task.completed = True
-            if not task.completed_at:
+            if not getattr(task, "completed_at", None):
                 task.completed_at = now_utc()
         else:
             task.completed = False
             task.completed_at = None
+            # if task is reopened it should no longer count as reviewed
+            task.reviewed_at = None
 
-    db.commit()
-    db.refresh(task)
-    return to_task_read(task)
+    # if review timestamp explicitly provided, persist it
+    if reviewed_at is not None:
+        task.reviewed_at = reviewed_at
 
+    # set in Python so delta sync compares like-for-like timestamps
+    task.updated_at = now_utc()
 
-def toggle_task_completion(db: Session, user_id: int, task_id: int) -> TaskRead:
-    task = (
-        db.query(TaskModel)
-        .filter(TaskModel.id == task_id, TaskModel.user_id == user_id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
 
+def toggle_completion(task: TaskModel) -> None:
     if task.completed:
         task.completed = False
         task.completed_at = None
     else:
         task.completed = True
-        if not task.completed_at:
+        if not getattr(task, "completed_at", None):
             task.completed_at = now_utc()
+    task.updated_at = now_utc()
 
-    db.commit()
-    db.refresh(task)
+
+def _remove(db: Session, user_id: int, task: TaskModel) -> None:
+    record_completion_change(db, user_id, completion_day(task), None)
+    release_new_task_slot(db, user_id, task.created_at)
+    db.delete(task)
+
+
+def _record_deletion(db: Session, user_id: int, task_ids: List[int]) -> None:
+    now = now_utc()
+    db.add_all(TaskTombstone(task_id=task_id, user_id=user_id, deleted_at=now) for task_id in task_ids)
+    # tokens from earlier days force a full resync, so old tombstones are dead weight
+    db.query(TaskTombstone).filter(
+        TaskTombstone.user_id == user_id,
+        TaskTombstone.deleted_at < now - TOMBSTONE_RETENTION,
+    ).delete(synchronize_session=False)
+
+
+def _commit_keeping_state(db: Session) -> None:
+    """Commit without expiring loaded attributes, so the response is built from
+    the instance just written instead of a reload SELECT. Scoped to this commit;
+    the async sessionmaker already never expires.
+    """
+    expire = db.expire_on_commit
+    db.expire_on_commit = False
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire
+
+
+def create_task(db: Session, user_id: int, payload: TaskCreate, *, daily_limit: int) -> TaskRead:
+    with user_must_exist(db, user_id):
+        check_daily_new_task_limit(db, user_id, daily_limit)
+
+        completed_at = payload.completed_at
+        if payload.completed and completed_at is None:
+            completed_at = now_utc()
+
+        now = now_utc()
+        db_task = TaskModel(
+            title=payload.title,
+            notes=payload.notes,
+            priority=priority_to_int(payload.priority),
+            scheduled_for=payload.scheduled_for,
+            completed=payload.completed,
+            streak_bound=payload.streak_bound,
+            completed_at=completed_at,
+            user_id=user_id,
+            created_at=now,
+            updated_at=now,
+        )
+        db.add(db_task)
+        record_completion_change(db, user_id, None, completion_day(db_task))
+        _commit_keeping_state(db)
+    record_analytics_change(user_id, None, analytics_footprint(db_task))
+    return to_task_read(db_task)
+
+
+def update_task(db: Session, user_id: int, task_id: int, data: Dict[str, Any]) -> TaskRead:
+    """PATCH/PUT: apply the fields the client sent."""
+    task = get_owned_task(db, user_id, task_id)
+    before = completion_day(task)
+    analytics_before = analytics_footprint(task)
+    apply_task_update(task, data)
+    record_completion_change(db, user_id, before, completion_day(task))
+
+    _commit_keeping_state(db)
+    record_analytics_change(user_id, analytics_before, analytics_footprint(task))
+    return to_task_read(task)
+
+
+def toggle_task(db: Session, user_id: int, task_id: int) -> TaskRead:
+    task = get_owned_task(db, user_id, task_id)
+    before = completion_day(task)
+    analytics_before = analytics_footprint(task)
+    toggle_completion(task)
+    record_completion_change(db, user_id, before, completion_day(task))
+
+    _commit_keeping_state(db)
+    record_analytics_change(user_id, analytics_before, analytics_footprint(task))
     return to_task_read(task)
 
 
 def delete_task(db: Session, user_id: int, task_id: int) -> None:
-    task = (
-        db.query(TaskModel)
-        .filter(TaskModel.id == task_id, TaskModel.user_id == user_id)
-        .first()
-    )
-    if not task:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    task = get_owned_task(db, user_id, task_id)
+    analytics_before = analytics_footprint(task)
+    _record_deletion(db, user_id, [task.id])
+    _remove(db, user_id, task)
+    db.commit()
+    record_analytics_change(user_id, analytics_before, None)
+
+
+def bulk_update(db: Session, user_id: int, operations: Sequence[TaskBulkOperation]) -> TaskBulkResult:
+    """Apply toggle / patch / delete operations in order, in one transaction."""
+    ids = {operation.id for operation in operations}
+    tasks = {
+        task.id: task
+        for task in db.query(TaskModel).filter(TaskModel.user_id == user_id, TaskModel.id.in_(ids))
+    }
+    # footprint before the batch per touched task, diffed once after commit
+    analytics_before: Dict[int, Any] = {}
+    deleted: List[int] = []
+    results: List[TaskBulkItemResult] = []
+
+    for operation in operations:
+        task = tasks.get(operation.id)
+        if task is None:
+            results.append(
+                TaskBulkItemResult(id=operation.id, op=operation.op, status=404, error="Task not found")
+            )
+            continue
+        analytics_before.setdefault(task.id, analytics_footprint(task))
+        if operation.op == "delete":
+            _remove(db, user_id, task)
+            del tasks[task.id]
+            deleted.append(task.id)
+            results.append(TaskBulkItemResult(id=task.id, op=operation.op, status=204))
+            continue
+        before = completion_day(task)
+        if operation.op == "toggle":
+            toggle_completion(task)
+        else:
+            apply_task_update(task, operation.changes.model_dump(exclude_unset=True))
+        record_completion_change(db, user_id, before, completion_day(task))
+        # read before commit: every column is already loaded, so no refresh round trip
+        results.append(
+            TaskBulkItemResult(id=task.id, op=operation.op, status=200, task=to_task_read(task))
+        )
 
-    db.delete(task)
+    if deleted:
+        _record_deletion(db, user_id, deleted)
+    changes = [
+        (footprint, analytics_footprint(tasks[task_id]) if task_id in tasks else None)
+        for task_id, footprint in analytics_before.items()
+    ]
     db.commit()
-    return None
+    for before, after in changes:
+        record_analytics_change(user_id, before, after)
+    return TaskBulkResult(results=results, streak=get_streak_payload(db, user_id))
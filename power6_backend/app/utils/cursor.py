@@ -0,0 +1,50 @@
+"""Opaque keyset-pagination cursors and delta-sync tokens.
+
+A cursor is URL-safe base64 of ``{"o": order, "k": [sort_value, id]}``.
+Clients treat it as an opaque string and hand it back unchanged.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+
+def encode_cursor(order: str, sort_value: Any, row_id: int) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps({"o": order, "k": [sort_value, row_id]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[str, Any, int]:
+    """Return ``(order, sort_value, id)``; raises ValueError on a malformed token."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        order = payload["o"]
+        sort_value, row_id = payload["k"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(order, str) or not isinstance(row_id, int) or isinstance(row_id, bool):
+        raise ValueError("Malformed cursor")
+    return order, sort_value, row_id
+
+
+def encode_sync_token(issued_at: datetime) -> str:
+    payload = json.dumps({"t": issued_at.isoformat()}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_sync_token(token: str) -> datetime:
+    """Return the timestamp a sync token was issued at; raises ValueError if malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        issued_at = datetime.fromisoformat(json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))["t"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Malformed sync token") from e
+    if issued_at.tzinfo is None:
+        raise ValueError("Malformed sync token")
+    return issued_at
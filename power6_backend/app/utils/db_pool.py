@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config.settings import settings
+
+
+class PoolWaitStats:
+    """Checkout wait-time counters shared by the instrumented pool classes."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    def record(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            attempts = (self.checkouts + self.timeouts) or 1
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_ms_total / attempts, 3),
+                "wait_ms_max": round(self.wait_ms_max, 3),
+            }
+
+
+def _timed_get(pool: Any, do_get) -> Any:
+    started = time.perf_counter()
+    try:
+        connection = do_get()
+    except PoolTimeoutError:
+        pool.wait_stats.record((time.perf_counter() - started) * 1000, timed_out=True)
+        raise
+    pool.wait_stats.record((time.perf_counter() - started) * 1000)
+    return connection
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def _do_get(self):
+        return _timed_get(self, super()._do_get)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool counterpart of InstrumentedQueuePool."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+    def _do_get(self):
+        return _timed_get(self, super()._do_get)
+
+
+def engine_options(backend: str, *, is_async: bool = False) -> dict[str, Any]:
+    """create_engine/create_async_engine kwargs for the configured pool.
+
+    SQLite keeps SQLAlchemy's defaults; its pool choice depends on the file
+    vs. memory database and sizing knobs do not apply.
+    """
+    if backend == "sqlite":
+        return {}
+
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    return options
+
+
+def statement_timeout_connect_args(backend: str, *, is_async: bool = False) -> dict[str, Any]:
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    if backend != "postgresql" or timeout_ms <= 0:
+        return {}
+    if is_async:
+        return {"server_settings": {"statement_timeout": str(timeout_ms)}}
+    return {"options": f"-c statement_timeout={timeout_ms}"}
+
+
+def pool_status(pool: Optional[Any]) -> dict[str, Any]:
+    """Checked-out / idle / overflow counts plus wait stats for one pool."""
+    if pool is None:
+        return {"enabled": False}
+
+    status: dict[str, Any] = {"enabled": True, "class": type(pool).__name__}
+    for key, attr in (
+        ("size", "size"),
+        ("checked_out", "checkedout"),
+        ("idle", "checkedin"),
+        ("overflow", "overflow"),
+    ):
+        method = getattr(pool, attr, None)
+        if callable(method):
+            status[key] = method()
+    if "overflow" in status:
+        # QueuePool reports unused base capacity as negative overflow
+        status["overflow"] = max(status["overflow"], 0)
+    timeout = getattr(pool, "timeout", None)
+    if callable(timeout):
+        status["timeout_seconds"] = timeout()
+    stats = getattr(pool, "wait_stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
@@ -1,8 +1,123 @@
+"""bcrypt helpers backed by a dedicated, size-capped worker pool.
+
+bcrypt is deliberately CPU-heavy (~250 ms at cost 12). Running it on a small
+executor keeps a login burst from occupying every request thread, and the
+async variants let ``async def`` routes await it without blocking the loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
 import bcrypt
 
+from app.config.settings import settings
+from app.utils.metrics import register_metrics
+
+BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when more hashing work is pending than HASH_MAX_PENDING allows."""
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=max(settings.HASH_WORKERS, 1),
+    thread_name_prefix="bcrypt",
+)
+_lock = threading.Lock()
+_stats = {
+    "pending": 0,
+    "max_pending_seen": 0,
+    "completed": 0,
+    "rejected": 0,
+    "wait_ms_total": 0.0,
+    "run_ms_total": 0.0,
+}
+
+
+def _submit(fn: Callable[..., Any], *args: Any) -> Future:
+    with _lock:
+        if _stats["pending"] >= settings.HASH_MAX_PENDING:
+            _stats["rejected"] += 1
+            raise HashingBusyError("Password hashing queue is full")
+        _stats["pending"] += 1
+        _stats["max_pending_seen"] = max(_stats["max_pending_seen"], _stats["pending"])
+
+    queued_at = time.perf_counter()
+
+    def run() -> Any:
+        started_at = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.perf_counter()
+            with _lock:
+                _stats["pending"] -= 1
+                _stats["completed"] += 1
+                _stats["wait_ms_total"] += (started_at - queued_at) * 1000
+                _stats["run_ms_total"] += (finished_at - started_at) * 1000
+
+    return _executor.submit(run)
+
+
+def _hash(password: str) -> str:
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    except ValueError:
+        # malformed/legacy hash string
+        return False
+
+
 def get_password_hash(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return _submit(_hash, password).result()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+    return _submit(_verify, plain_password, hashed_password).result()
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(_submit(_hash, password))
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.wrap_future(_submit(_verify, plain_password, hashed_password))
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True when a stored hash was made with a different bcrypt cost than configured."""
+    try:
+        cost = int(hashed_password.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return True
+    return cost != BCRYPT_ROUNDS
+
+
+def hashing_stats() -> dict[str, Any]:
+    with _lock:
+        snapshot = dict(_stats)
+    completed = snapshot["completed"] or 1
+    return {
+        "workers": _executor._max_workers,
+        "max_pending": settings.HASH_MAX_PENDING,
+        "rounds": BCRYPT_ROUNDS,
+        "pending": snapshot["pending"],
+        "max_pending_seen": snapshot["max_pending_seen"],
+        "completed": snapshot["completed"],
+        "rejected": snapshot["rejected"],
+        "avg_wait_ms": round(snapshot["wait_ms_total"] / completed, 2),
+        "avg_run_ms": round(snapshot["run_ms_total"] / completed, 2),
+    }
+
 
+register_metrics("password_hashing", hashing_stats)
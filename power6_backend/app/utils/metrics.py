@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict
+
+# name -> zero-arg callable returning a JSON-serializable snapshot
+_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_metrics(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """Expose ``provider()`` under ``name`` in the /metrics snapshot."""
+    _providers[name] = provider
+
+
+def collect_metrics() -> Dict[str, Any]:
+    snapshot: Dict[str, Any] = {}
+    for name, provider in sorted(_providers.items()):
+        try:
+            snapshot[name] = provider()
+        except Exception as exc:  # pragma: no cover - a broken provider must not break the rest
+            snapshot[name] = {"error": str(exc)}
+    return snapshot
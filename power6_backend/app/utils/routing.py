@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class ApiPrefixMiddleware:
+    """Serve ``/api/...`` from the same route table as the unprefixed paths.
+
+    Clients use both URL spaces. Instead of mounting every router twice (which
+    doubles the list Starlette scans on each request and the OpenAPI work), a
+    request under the prefix gets the prefix moved into ``root_path``. Starlette
+    routes on the remainder while ``request.url`` still shows the original
+    path, so redirects and logs are unaffected.
+    """
+
+    def __init__(self, app: ASGIApp, prefix: str = "/api") -> None:
+        self.app = app
+        self.prefix = prefix.rstrip("/")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            root_path = scope.get("root_path", "")
+            mounted = root_path + self.prefix
+            if scope["path"].startswith(mounted + "/"):
+                scope = dict(scope, root_path=mounted)
+        await self.app(scope, receive, send)
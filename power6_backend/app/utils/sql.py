@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from sqlalchemy import Date, cast, func
+from sqlalchemy.orm import Session
+
+
+def dialect_name(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+
+def utc_date(db: Session, column):
+    """Return a SQL expression for the UTC calendar day of a timestamp column.
+
+    SQLite stores timestamps as ISO strings, where CAST(... AS DATE) yields the
+    year only, so it needs DATE(). Postgres casts timestamptz in the session
+    time zone, so the value is shifted to UTC first; other backends keep the
+    plain cast.
+    """
+    name = dialect_name(db)
+    if name == "sqlite":
+        return func.date(column)
+    if name == "postgresql":
+        return cast(func.timezone("UTC", column), Date)
+    return cast(column, Date)
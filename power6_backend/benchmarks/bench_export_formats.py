@@ -0,0 +1,113 @@
+"""Throughput of the task-history export formats.
+
+Seeds one user with N completed tasks in a scratch SQLite database (or the
+DATABASE_URL you pass in) and drains each export generator, reporting rows/s
+and output size. Columnar formats are skipped when pyarrow is missing.
+
+    python -m benchmarks.bench_export_formats --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--formats", default="csv,ndjson,arrow,parquet")
+    parser.add_argument("--gzip", action="store_true", help="also gzip text formats")
+    return parser.parse_args()
+
+
+def _seed(rows: int) -> int:
+    from sqlalchemy import insert
+
+    from app.database import Base, SessionLocal, engine
+    from app.models.models import Task, User
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(username="bench_export", email="bench_export@example.com", hashed_password="x", tier="pro")
+        db.add(user)
+        db.flush()
+        now = datetime.now(timezone.utc)
+        step = timedelta(days=29) / max(rows, 1)
+        for start in range(0, rows, 10_000):
+            db.execute(
+                insert(Task),
+                [
+                    {
+                        "user_id": user.id,
+                        "title": f"Benchmark task {i}",
+                        "notes": "notes" if i % 3 else None,
+                        "priority": i % 3,
+                        "completed": True,
+                        "streak_bound": bool(i % 2),
+                        "created_at": now - step * i - timedelta(hours=1),
+                        "completed_at": now - step * i,
+                    }
+                    for i in range(start, min(start + 10_000, rows))
+                ],
+            )
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+async def _drain(chunks) -> int:
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+    return size
+
+
+def main() -> None:
+    args = _parse_args()
+    if "DATABASE_URL" not in os.environ:
+        scratch = Path(tempfile.mkdtemp()) / "bench_export.sqlite"
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch}"
+
+    from app.services import task_export
+
+    if args.batch_size:
+        task_export.EXPORT_BATCH_SIZE = args.batch_size
+
+    uid = _seed(args.rows)
+    print(f"rows={args.rows} batch_size={task_export.EXPORT_BATCH_SIZE}")
+
+    for fmt in args.formats.split(","):
+        if fmt in task_export.COLUMNAR_FORMATS and not task_export.columnar_available():
+            print(f"{fmt:>12}: skipped (pyarrow not installed)")
+            continue
+        variants = [(fmt, False)]
+        if args.gzip and task_export.EXPORT_FORMATS[fmt][2]:
+            variants.append((f"{fmt}+gzip", True))
+        for label, compress in variants:
+            chunks = task_export.stream_history(fmt, uid)
+            if compress:
+                chunks = task_export.gzip_chunks(chunks)
+            started = time.perf_counter()
+            size = asyncio.run(_drain(chunks))
+            elapsed = time.perf_counter() - started
+            print(
+                f"{label:>12}: {elapsed:7.3f}s  {args.rows / elapsed:12,.0f} rows/s  "
+                f"{size / 1_048_576:8.2f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
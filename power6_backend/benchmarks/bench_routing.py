@@ -0,0 +1,119 @@
+"""Per-request routing overhead: double-mounted routers vs. the /api prefix middleware.
+
+Builds two apps from the real routers without touching the database: the old
+layout (every router included at "" and "/api") and the current one (included
+once, ApiPrefixMiddleware in front). Each request is driven straight through
+the ASGI interface to an endpoint that does no work, so the timings are
+dominated by middleware and route matching. OpenAPI generation is timed too.
+
+    python -m benchmarks.bench_routing --requests 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+PATHS = ("/health", "/api/health", "/metrics/unknown", "/api/metrics/unknown")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    return parser.parse_args()
+
+
+def _build(layout: str):
+    from fastapi import FastAPI
+
+    from app.routes import api_router
+    from app.routes.stripe import router as stripe_router
+    from app.utils.routing import ApiPrefixMiddleware
+
+    application = FastAPI()
+    if layout == "double":
+        application.include_router(api_router, prefix="")
+        application.include_router(api_router, prefix="/api")
+        application.include_router(stripe_router, prefix="/stripe")
+        application.include_router(stripe_router, prefix="/api/stripe")
+    else:
+        application.add_middleware(ApiPrefixMiddleware, prefix="/api")
+        application.include_router(api_router)
+        application.include_router(stripe_router, prefix="/stripe")
+
+    @application.get("/health")
+    def health() -> dict[str, str]:
+        return {"status": "ok"}
+
+    if layout == "double":
+        @application.get("/api/health")
+        def api_health() -> dict[str, str]:
+            return {"status": "ok"}
+
+    return application
+
+
+async def _drive(application, path: str, requests: int) -> tuple[float, int]:
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    await application(dict(scope), receive, send)  # warm-up builds the middleware stack
+    started = time.perf_counter()
+    for _ in range(requests):
+        await application(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests * 1e6, status
+
+
+def main() -> None:
+    args = _parse_args()
+    if "DATABASE_URL" not in os.environ:
+        scratch = Path(tempfile.mkdtemp()) / "bench_routing.sqlite"
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch}"
+
+    apps = {layout: _build(layout) for layout in ("double", "single")}
+    print(f"requests per path={args.requests}")
+    print(f"{'path':<24}{'double us':>12}{'single us':>12}{'status':>8}")
+    for path in PATHS:
+        double_us, status = asyncio.run(_drive(apps["double"], path, args.requests))
+        single_us, single_status = asyncio.run(_drive(apps["single"], path, args.requests))
+        assert status == single_status, (path, status, single_status)
+        print(f"{path:<24}{double_us:>12.1f}{single_us:>12.1f}{status:>8}")
+
+    for layout, application in apps.items():
+        application.openapi_schema = None
+        started = time.perf_counter()
+        schema = application.openapi()
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"openapi ({layout}): {elapsed:7.1f} ms, {len(schema['paths'])} paths")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Rows/s for 200-row TaskRead pages: ORM + per-row TaskRead vs. the column-projected fast path.
+
+"before" is the previous list pipeline: hydrate Task ORM objects, build
+TaskRead per row (day_key in Python), then let a TypeAdapter validate and
+dump the list the way FastAPI's response_model handling does. "after" is
+task_service.list_tasks (TaskRead columns plus day_key from SQL, as dicts)
+followed by task_service.dump_json. Both read the same pages from a scratch
+SQLite database.
+
+    python -m benchmarks.bench_task_serialization --tasks 20000 --pages 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+PAGE_SIZE = 200
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--pages", type=int, default=200, help="pages timed per path")
+    parser.add_argument("--rounds", type=int, default=3)
+    return parser.parse_args()
+
+
+def _seed(tasks: int) -> int:
+    from sqlalchemy import insert
+
+    from app.database import Base, SessionLocal, engine
+    from app.models.models import Task, User
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(username="bench_serialize", email="bench_serialize@example.com", hashed_password="x", tier="pro")
+        db.add(user)
+        db.flush()
+        now = datetime.now(timezone.utc)
+        for start in range(0, tasks, 10_000):
+            db.execute(
+                insert(Task),
+                [
+                    {
+                        "user_id": user.id,
+                        "title": f"Benchmark task {i}",
+                        "notes": "notes" if i % 3 else None,
+                        "priority": i % 3,
+                        "scheduled_for": now + timedelta(days=i % 5) if i % 4 == 0 else None,
+                        "completed": bool(i % 2),
+                        "streak_bound": bool(i % 3),
+                        "created_at": now - timedelta(minutes=i),
+                        "updated_at": now - timedelta(minutes=i),
+                        "completed_at": now - timedelta(minutes=i) if i % 2 else None,
+                    }
+                    for i in range(start, min(start + 10_000, tasks))
+                ],
+            )
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def main() -> None:
+    args = _parse_args()
+    if "DATABASE_URL" not in os.environ:
+        scratch = Path(tempfile.mkdtemp()) / "bench_serialize.sqlite"
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch}"
+
+    from pydantic import TypeAdapter
+
+    from app.database import SessionLocal
+    from app.models.models import Task
+    from app.schemas import TaskRead
+    from app.services import task_service
+
+    uid = _seed(args.tasks)
+    response_adapter = TypeAdapter(List[TaskRead])
+    offsets = [(page * PAGE_SIZE) % max(args.tasks - PAGE_SIZE, 1) for page in range(args.pages)]
+
+    def before(offset: int) -> bytes:
+        db = SessionLocal()
+        try:
+            tasks = (
+                db.query(Task)
+                .filter(Task.user_id == uid)
+                .order_by(Task.created_at.desc(), Task.id.desc())
+                .offset(offset)
+                .limit(PAGE_SIZE)
+                .all()
+            )
+            items = [task_service.to_task_read(task) for task in tasks]
+            # FastAPI: dump the returned models, validate against response_model, serialize
+            validated = response_adapter.validate_python([item.model_dump() for item in items])
+            return response_adapter.dump_json(validated)
+        finally:
+            db.close()
+
+    def after(offset: int) -> bytes:
+        db = SessionLocal()
+        try:
+            rows, _ = task_service.list_tasks(db, uid, limit=PAGE_SIZE, offset=offset)
+            return task_service.dump_json(rows)
+        finally:
+            db.close()
+
+    assert response_adapter.validate_json(before(0)) == response_adapter.validate_json(after(0))
+
+    print(f"tasks={args.tasks} page_size={PAGE_SIZE} pages={args.pages} rounds={args.rounds}")
+    rates = {}
+    for label, fn in (("before", before), ("after", after)):
+        samples = []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            for offset in offsets:
+                fn(offset)
+            samples.append(time.perf_counter() - started)
+        elapsed = statistics.median(samples)
+        rates[label] = args.pages * PAGE_SIZE / elapsed
+        print(f"{label:>7}: {elapsed / args.pages * 1000:7.2f} ms/page  {rates[label]:12,.0f} rows/s")
+    print(f"speedup: {rates['after'] / rates['before']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
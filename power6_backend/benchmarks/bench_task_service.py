@@ -0,0 +1,222 @@
+"""Latency and SQL statement counts per task_service operation.
+
+Seeds one user with 10k / 100k (and, with ``--bench-1m``, 1M) tasks in
+scratch SQLite files that are reused across runs, plus the matching
+``user_daily_completions`` rollup and ``user_streaks`` row so writes do the
+same streak upkeep as for a real user with that history. Then times each service
+call the /tasks routes make and counts the statements it issues. Counts must
+not grow with the dataset; each operation has a budget so a regression (an
+N+1, a reload after commit) fails the run.
+
+    python -m pytest benchmarks/bench_task_service.py -q
+    python -m pytest benchmarks/bench_task_service.py -q --bench-1m --bench-json bench.json
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+_SCRATCH = Path(os.getenv("POWER6_BENCH_DIR", tempfile.gettempdir()))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_SCRATCH / 'power6_bench_app.sqlite'}")
+
+import pytest
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.models import Task, User
+from app.schemas import TaskBulkOperation, TaskCreate
+from app.services import task_service
+from app.services.streak_service import rebuild_daily_completions, rebuild_streak_state
+from app.services.task_export import history_range
+
+SIZES = (10_000, 100_000, 1_000_000)
+SEED_BATCH = 10_000
+# bump when _seed changes so stale scratch files are not reused
+SEED_VERSION = 2
+OPEN_TASKS = 40
+
+# Statements per call; writes include the quota, tombstone and streak-rollup upkeep
+STATEMENT_BUDGET = {
+    "list_first_page": 1,
+    "list_keyset_deep": 1,
+    "list_offset_deep": 1,
+    "task_set_version": 1,
+    "active_tasks": 1,
+    "task_changes": 2,
+    "history_30d": 1,
+    "analytics_30d": 1,
+    "create_task": 2,
+    "update_task": 2,
+    "toggle_task": 8,
+    "delete_task": 5,
+    "bulk_6_toggles": 26,
+}
+
+
+def _seed(engine, size: int) -> int:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    # spread over a year, newest first; the most recent OPEN_TASKS stay open
+    step = timedelta(days=365) / size
+    with engine.begin() as conn:
+        uid = conn.execute(
+            insert(User).values(
+                username=f"bench_{size}", email=f"bench_{size}@example.com", hashed_password="x", tier="pro"
+            )
+        ).inserted_primary_key[0]
+        for start in range(0, size, SEED_BATCH):
+            rows = []
+            for i in range(start, min(start + SEED_BATCH, size)):
+                created = now - step * i - timedelta(minutes=5)
+                done = i >= OPEN_TASKS
+                rows.append(
+                    {
+                        "user_id": uid,
+                        "title": f"Benchmark task {i}",
+                        "notes": "notes" if i % 3 else None,
+                        "priority": i % 3,
+                        "completed": done,
+                        "streak_bound": bool(i % 2),
+                        "created_at": created,
+                        "updated_at": created,
+                        "completed_at": created + timedelta(minutes=1) if done else None,
+                    }
+                )
+            conn.execute(insert(Task), rows)
+    _seed_rollup(engine, uid)
+    return uid
+
+
+def _seed_rollup(engine, uid: int) -> None:
+    """Build the streak rollup and state from the seeded tasks, as the backfill scripts do."""
+    with Session(engine) as db:
+        rebuild_daily_completions(db, uid)
+        rebuild_streak_state(db, uid)
+        db.commit()
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"{n // 1000}k")
+def dataset(request):
+    size = request.param
+    if size >= 1_000_000 and not request.config.getoption("--bench-1m"):
+        pytest.skip("1M-task dataset runs with --bench-1m")
+    engine = create_engine(f"sqlite:///{_SCRATCH / f'power6_bench_{size}_v{SEED_VERSION}.sqlite'}")
+    with Session(engine) as db:
+        try:
+            uid = db.execute(select(User.id).where(User.username == f"bench_{size}")).scalar_one_or_none()
+        except Exception:
+            uid = None
+    if uid is None:
+        uid = _seed(engine, size)
+    yield size, engine, uid
+    engine.dispose()
+
+
+def _count_statements(engine):
+    counter = {"n": 0}
+
+    def count(*_args):
+        counter["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    return counter, lambda: event.remove(engine, "before_cursor_execute", count)
+
+
+def _new_task_ids(db: Session, uid: int, count: int) -> list[int]:
+    return [
+        task_service.create_task(db, uid, TaskCreate(title="bench scratch"), daily_limit=10**9).id
+        for _ in range(count)
+    ]
+
+
+def _operations(uid: int, engine):
+    with Session(engine) as db:
+        middle = db.execute(
+            select(Task.created_at, Task.id).where(Task.user_id == uid).order_by(Task.id).offset(5_000).limit(1)
+        ).one()
+    since = datetime.now(timezone.utc) - timedelta(minutes=1)
+    toggle_ids: list[int] = []
+
+    def toggle_setup(db):
+        if not toggle_ids:
+            toggle_ids.extend(_new_task_ids(db, uid, 6))
+        return ()
+
+    return {
+        "list_first_page": (None, lambda db: task_service.list_tasks(db, uid, limit=50)),
+        "list_keyset_deep": (
+            None,
+            lambda db: task_service.list_tasks(db, uid, limit=50, after=(middle.created_at, middle.id)),
+        ),
+        "list_offset_deep": (None, lambda db: task_service.list_tasks(db, uid, limit=50, offset=5_000)),
+        "task_set_version": (None, lambda db: task_service.task_set_version(db, uid)),
+        "active_tasks": (None, lambda db: task_service.active_tasks(db, uid)),
+        "task_changes": (None, lambda db: task_service.task_changes(db, uid, since, datetime.now(timezone.utc))),
+        "history_30d": (None, lambda db: task_service.history(db, uid)),
+        "analytics_30d": (None, lambda db: task_service.analytics(db, uid, *history_range())),
+        "create_task": (
+            None,
+            lambda db: task_service.create_task(db, uid, TaskCreate(title="bench create"), daily_limit=10**9),
+        ),
+        "update_task": (
+            lambda db: tuple(_new_task_ids(db, uid, 1)),
+            lambda db, task_id: task_service.update_task(db, uid, task_id, {"title": "bench patched"}),
+        ),
+        "toggle_task": (
+            lambda db: tuple(_new_task_ids(db, uid, 1)),
+            lambda db, task_id: task_service.toggle_task(db, uid, task_id),
+        ),
+        "delete_task": (
+            lambda db: tuple(_new_task_ids(db, uid, 1)),
+            lambda db, task_id: task_service.delete_task(db, uid, task_id),
+        ),
+        "bulk_6_toggles": (
+            toggle_setup,
+            lambda db: task_service.bulk_update(
+                db, uid, [TaskBulkOperation(op="toggle", id=task_id) for task_id in toggle_ids]
+            ),
+        ),
+    }
+
+
+@pytest.mark.parametrize("operation", list(STATEMENT_BUDGET))
+def test_task_service_operation(dataset, operation, bench_results, pytestconfig):
+    size, engine, uid = dataset
+    setup, call = _operations(uid, engine)[operation]
+    repeat = max(pytestconfig.getoption("--bench-repeat"), 1)
+
+    samples: list[float] = []
+    statements: list[int] = []
+    for _ in range(repeat):
+        with Session(engine, expire_on_commit=False) as db:
+            args = setup(db) if setup else ()
+            db.commit()
+            counter, stop = _count_statements(engine)
+            started = time.perf_counter()
+            try:
+                call(db, *args)
+            finally:
+                elapsed = time.perf_counter() - started
+                stop()
+            samples.append(elapsed * 1000)
+            statements.append(counter["n"])
+
+    bench_results.append(
+        {
+            "tasks": size,
+            "operation": operation,
+            "median_ms": statistics.median(samples),
+            "min_ms": min(samples),
+            "statements": max(statements),
+        }
+    )
+    assert max(statements) <= STATEMENT_BUDGET[operation], (operation, statements)
@@ -0,0 +1,47 @@
+"""pytest options and the summary table for the benchmark suites in this folder.
+
+    python -m pytest benchmarks/bench_task_service.py -q [--bench-1m] [--bench-json out.json]
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+_RESULTS = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("power6 benchmarks")
+    group.addoption("--bench-1m", action="store_true", help="also run the 1,000,000-task dataset")
+    group.addoption("--bench-repeat", type=int, default=5, help="timed calls per operation")
+    group.addoption("--bench-json", default=None, help="write the results table to this file")
+
+
+def pytest_configure(config):
+    config.stash[_RESULTS] = []
+
+
+@pytest.fixture(scope="session")
+def bench_results(pytestconfig) -> list:
+    return pytestconfig.stash[_RESULTS]
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    results = config.stash.get(_RESULTS, [])
+    if not results:
+        return
+    terminalreporter.section("task service benchmarks")
+    terminalreporter.write_line(
+        f"{'tasks':>9}  {'operation':<22}{'median ms':>11}{'min ms':>9}{'stmts':>7}"
+    )
+    for row in results:
+        terminalreporter.write_line(
+            f"{row['tasks']:>9,}  {row['operation']:<22}{row['median_ms']:>11.2f}"
+            f"{row['min_ms']:>9.2f}{row['statements']:>7}"
+        )
+    path = config.getoption("--bench-json")
+    if path:
+        Path(path).write_text(json.dumps(results, indent=2))
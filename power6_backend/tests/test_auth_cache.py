@@ -0,0 +1,233 @@
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_auth_cache.sqlite")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from fastapi.testclient import TestClient
+
+from app.database import Base, engine
+from app.main import build_app
+from app.models.models import User
+from app.routes.auth import create_access_token
+from app.services.principal_cache import get_cached_principal
+from app.utils.hash import get_password_hash
+
+
+def test_current_user_cache_is_invalidated_on_tier_change():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user = User(
+            username="Cache_Admin",
+            email="cache_admin@example.com",
+            hashed_password=get_password_hash("Password123!"),
+            tier="Free",
+            is_admin=True,
+        )
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    finally:
+        db.close()
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'cache_admin'})}"}
+
+    response = client.get("/users/me", headers=headers)
+    assert response.status_code == 200
+    principal = get_cached_principal("cache_admin")
+    assert principal is not None
+    assert principal.id == user_id
+
+    response = client.patch("/users/me/tier", headers=headers, json={"tier": "Pro"})
+    assert response.status_code == 200
+    assert get_cached_principal("cache_admin") is None
+
+    response = client.get("/users/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["tier"] == "pro"
+    assert get_cached_principal("cache_admin").tier == "pro"
+
+
+def test_claims_token_authorizes_hot_routes_without_users_lookup():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+
+    response = client.post(
+        "/auth/register",
+        json={
+            "username": "claims_user",
+            "email": "claims_user@example.com",
+            "password": "Password123!",
+        },
+    )
+    assert response.status_code == 201
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    from sqlalchemy import event
+
+    from app.database import async_engine
+
+    statements: list[str] = []
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lower())
+
+    for bound in engines:
+        event.listen(bound, "before_cursor_execute", _record)
+    try:
+        assert client.get("/tasks/active", headers=headers).status_code == 200
+        assert client.get("/streak/", headers=headers).status_code == 200
+    finally:
+        for bound in engines:
+            event.remove(bound, "before_cursor_execute", _record)
+
+    assert statements
+    assert not any("from users" in statement for statement in statements)
+
+
+def test_legacy_token_is_served_from_principal_cache():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.add(
+            User(
+                username="legacy_user",
+                email="legacy_user@example.com",
+                hashed_password=get_password_hash("Password123!"),
+                tier="Free",
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    # sub-only tokens carry no claims, so authorization needs the principal
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'legacy_user'})}"}
+    assert client.get("/tasks/active", headers=headers).status_code == 200
+    assert get_cached_principal("legacy_user") is not None
+
+    from sqlalchemy import event
+
+    from app.database import async_engine
+
+    statements: list[str] = []
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lower())
+
+    for bound in engines:
+        event.listen(bound, "before_cursor_execute", _record)
+    try:
+        assert client.get("/tasks/active", headers=headers).status_code == 200
+    finally:
+        for bound in engines:
+            event.remove(bound, "before_cursor_execute", _record)
+
+    assert not any("from users" in statement for statement in statements)
+
+
+def test_aged_claims_and_admin_routes_are_checked_against_users():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+
+    from datetime import datetime, timedelta, timezone
+
+    from app.config.settings import settings
+    from app.database import SessionLocal
+    from app.routes.auth import user_token_claims
+
+    db = SessionLocal()
+    try:
+        user = User(
+            username="demoted_admin",
+            email="demoted_admin@example.com",
+            hashed_password=get_password_hash("Password123!"),
+            tier="Pro",
+            is_admin=True,
+        )
+        db.add(user)
+        db.commit()
+        claims = user_token_claims(user)
+        # demoted by another worker: this worker's caches never heard about it
+        user.is_admin = False
+        user.tier = "Free"
+        db.commit()
+    finally:
+        db.close()
+
+    fresh = {"Authorization": f"Bearer {create_access_token(claims)}"}
+    assert client.get("/events/summary", headers=fresh).status_code == 403
+    assert client.get("/metrics/", headers=fresh).status_code == 403
+
+    # within the claims window the token's own "Pro" claim still authorizes
+    assert client.get("/tasks/analytics", headers=fresh).status_code == 200
+
+    issued = datetime.now(timezone.utc) - timedelta(seconds=settings.TOKEN_CLAIMS_MAX_AGE_SECONDS + 5)
+    aged = {"Authorization": f"Bearer {create_access_token({**claims, 'iat': issued.timestamp()})}"}
+    # analytics is Pro-only; the aged token's "Pro" claim is no longer trusted
+    assert client.get("/tasks/analytics", headers=aged).status_code == 403
+
+
+def test_writes_for_a_user_deleted_on_another_worker_get_401():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    from sqlalchemy import event
+
+    from app.database import SessionLocal, async_engine
+    from app.routes.auth import user_token_claims
+
+    # SQLite only enforces foreign keys when asked to
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+
+    def _foreign_keys(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    for bound in engines:
+        event.listen(bound, "connect", _foreign_keys)
+        bound.dispose()
+    try:
+        client = TestClient(build_app())
+        db = SessionLocal()
+        try:
+            user = User(
+                username="gone_user",
+                email="gone_user@example.com",
+                hashed_password=get_password_hash("Password123!"),
+                tier="Pro",
+            )
+            db.add(user)
+            db.commit()
+            headers = {"Authorization": f"Bearer {create_access_token(user_token_claims(user))}"}
+            # deleted elsewhere: this worker still trusts the fresh token's claims
+            db.delete(user)
+            db.commit()
+        finally:
+            db.close()
+
+        assert client.post("/tasks/", headers=headers, json={"title": "After delete"}).status_code == 401
+        assert client.post("/events/", headers=headers, json={"name": "task_created"}).status_code == 401
+    finally:
+        for bound in engines:
+            event.remove(bound, "connect", _foreign_keys)
+            bound.dispose()
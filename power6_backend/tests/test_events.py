@@ -135,3 +135,241 @@ def test_event_summary_blocks_non_admins():
     )
 
     assert response.status_code == 403
+
+
+def test_event_batch_is_buffered_then_bulk_inserted():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    username, user_id = _seed_user(username="batch_user")
+    token = create_access_token({"sub": username})
+
+    from app.database import SessionLocal
+    from app.services.event_buffer import event_buffer
+
+    response = client.post(
+        "/events/batch",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "events": [
+                {"name": "dashboard_viewed", "properties": {"count": 1, "title": "secret"}},
+                {"name": "task_created"},
+                {"name": "not_a_known_event"},
+            ]
+        },
+    )
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 3, "dropped": 0}
+
+    event_buffer.flush()
+    db = SessionLocal()
+    try:
+        events = db.query(UserEvent).filter(UserEvent.user_id == user_id).order_by(UserEvent.id).all()
+    finally:
+        db.close()
+    assert [e.name for e in events] == ["dashboard_viewed", "task_created", "dashboard_viewed"]
+    assert events[0].properties == {"count": 1}
+    assert events[0].tier == "pro"
+
+    stats = event_buffer.stats()
+    assert stats["depth"] == 0
+    assert stats["flushed"] >= 3
+
+    response = client.post(
+        "/events/batch",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"events": []},
+    )
+    assert response.status_code == 422
+
+
+def test_event_summary_merges_daily_rollups_with_raw_edges():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    admin_username, admin_id = _seed_user(username="rollup_admin", is_admin=True)
+    _, member_id = _seed_user(username="rollup_member")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': admin_username})}"}
+
+    from datetime import datetime, timedelta, timezone
+
+    from app.database import SessionLocal
+    from app.models.models import EventDailyRollup
+
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        for days_ago, user_id, name in [
+            (5, member_id, "signup_completed"),
+            (5, member_id, "dashboard_viewed"),
+            (3, admin_id, "dashboard_viewed"),
+            (0, member_id, "task_created"),
+        ]:
+            db.add(UserEvent(user_id=user_id, name=name, created_at=now - timedelta(days=days_ago)))
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.get("/events/summary?days=30", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_events"] == 4
+    assert body["unique_users"] == 2
+    assert body["counts"]["dashboard_viewed"] == {"events": 2, "users": 2}
+
+    db = SessionLocal()
+    try:
+        assert db.query(EventDailyRollup).filter(EventDailyRollup.name == "*").count() >= 29
+    finally:
+        db.close()
+
+    # a second read is served from the stored rollups
+    again = client.get("/events/summary?days=30", headers=headers).json()
+    assert again["counts"] == body["counts"]
+    assert again["unique_users"] == 2
+
+
+def test_archive_expired_events_writes_gzip_months_and_deletes_rows(tmp_path):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    _, user_id = _seed_user(username="archive_user")
+
+    import gzip
+    import json
+    from datetime import datetime, timedelta, timezone
+
+    from app.database import SessionLocal
+    from app.services.event_partitions import archive_expired_events, retention_cutoff
+
+    now = datetime.now(timezone.utc)
+    cutoff = retention_cutoff(now)
+    expired_at = datetime(cutoff.year, cutoff.month, 1, tzinfo=timezone.utc) - timedelta(days=40)
+
+    db = SessionLocal()
+    try:
+        db.add_all(
+            [
+                UserEvent(user_id=user_id, name="dashboard_viewed", created_at=expired_at),
+                UserEvent(user_id=user_id, name="task_created", created_at=expired_at + timedelta(hours=1)),
+                UserEvent(user_id=user_id, name="task_created", created_at=now),
+            ]
+        )
+        db.commit()
+
+        archived = archive_expired_events(db, now=now, archive_dir=tmp_path)
+        assert [item["rows"] for item in archived] == [2]
+        with gzip.open(archived[0]["path"], "rt", encoding="utf-8") as archive:
+            rows = [json.loads(line) for line in archive]
+        assert [row["name"] for row in rows] == ["dashboard_viewed", "task_created"]
+        assert rows[0]["user_id"] == user_id
+
+        remaining = db.query(UserEvent).all()
+        assert [event.created_at.date() for event in remaining] == [now.date()]
+        assert archive_expired_events(db, now=now, archive_dir=tmp_path) == []
+    finally:
+        db.close()
+
+
+def test_partition_conversion_keeps_indexes_and_default_partition():
+    # needs a scratch Postgres database, e.g. TEST_POSTGRES_URL=postgresql://localhost/power6_test
+    import pytest
+
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+
+    from datetime import date, datetime, timezone
+
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+
+    from app.services.event_partitions import (
+        DEFAULT,
+        INDEXES,
+        convert_to_partitioned,
+        ensure_partitions,
+        partition_name,
+    )
+
+    pg_engine = create_engine(url)
+    Base.metadata.drop_all(bind=pg_engine)
+    Base.metadata.create_all(bind=pg_engine)
+    today = date(2026, 5, 10)
+    try:
+        with Session(pg_engine) as db:
+            user = User(username="partition_user", email="partition_user@example.com", hashed_password="x")
+            db.add(user)
+            db.commit()
+            db.add(UserEvent(user_id=user.id, name="task_created", created_at=datetime(2026, 4, 2, tzinfo=timezone.utc)))
+            db.commit()
+
+            convert_to_partitioned(db, today=today)
+
+            def indexes(table: str) -> set[str]:
+                return set(
+                    db.execute(text("SELECT indexdef FROM pg_indexes WHERE tablename = :t"), {"t": table}).scalars()
+                )
+
+            parent = indexes("user_events")
+            for index in INDEXES:
+                assert any(f" {index} " in definition for definition in parent)
+            for table in ("user_events_legacy", partition_name(date(2026, 5, 1)), DEFAULT):
+                definitions = indexes(table)
+                assert any("(user_id, created_at)" in definition for definition in definitions), table
+                assert any("(name, created_at)" in definition for definition in definitions), table
+
+            # a row past the pre-created months lands in the default partition ...
+            far = datetime(2030, 1, 15, tzinfo=timezone.utc)
+            db.add(UserEvent(user_id=user.id, name="task_created", created_at=far))
+            db.commit()
+            assert db.execute(text(f"SELECT count(*) FROM {DEFAULT}")).scalar() == 1
+
+            # ... and moves into its month once that partition is created
+            assert partition_name(date(2030, 1, 1)) in ensure_partitions(db, today=far.date())
+            assert db.execute(text(f"SELECT count(*) FROM {DEFAULT}")).scalar() == 0
+            assert db.execute(text("SELECT count(*) FROM user_events_p203001")).scalar() == 1
+            assert ensure_partitions(db, today=far.date()) == []
+    finally:
+        Base.metadata.drop_all(bind=pg_engine)
+        pg_engine.dispose()
+
+
+def test_event_buffer_requeues_on_outage_and_drops_only_bad_rows(monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    _, user_id = _seed_user(username="flush_user")
+
+    from datetime import datetime, timezone
+
+    from sqlalchemy.exc import OperationalError
+
+    from app.database import SessionLocal
+    from app.services import event_buffer as buffer_module
+
+    buffer = buffer_module.EventBuffer(max_events=100, batch_size=10, interval_seconds=60)
+    now = datetime.now(timezone.utc)
+    good = [{"user_id": user_id, "name": "task_created", "source": "mobile", "created_at": now} for _ in range(5)]
+    bad = {"user_id": user_id, "name": None, "source": "mobile", "created_at": now}  # NOT NULL violation
+    buffer._queue.extend(good[:2] + [bad] + good[2:])
+
+    class _Down:
+        def begin(self):
+            raise OperationalError("INSERT", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(buffer_module, "engine", _Down())
+    assert buffer.flush() == 0
+    stats = buffer.stats()
+    assert stats["depth"] == 6 and stats["requeued"] == 6 and stats["failed"] == 0
+
+    monkeypatch.setattr(buffer_module, "engine", engine)
+    assert buffer.flush() == 5
+    stats = buffer.stats()
+    assert stats["depth"] == 0 and stats["failed"] == 1
+
+    db = SessionLocal()
+    try:
+        assert db.query(UserEvent).filter(UserEvent.user_id == user_id).count() == 5
+    finally:
+        db.close()
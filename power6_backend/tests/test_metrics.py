@@ -0,0 +1,57 @@
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_metrics.sqlite")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from fastapi.testclient import TestClient
+
+from app.database import Base, engine
+from app.main import build_app
+from app.models.models import User
+from app.routes.auth import create_access_token
+from app.utils.hash import get_password_hash
+
+
+def _seed_user(username: str, *, is_admin: bool) -> str:
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.add(
+            User(
+                username=username,
+                email=f"{username}@example.com",
+                hashed_password=get_password_hash("Password123!"),
+                tier="Free",
+                is_admin=is_admin,
+            ),
+        )
+        db.commit()
+        return username
+    finally:
+        db.close()
+
+
+def test_metrics_reports_pool_hashing_and_cache_sections_for_admins():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    admin = _seed_user("metrics_admin", is_admin=True)
+    member = _seed_user("metrics_member", is_admin=False)
+
+    response = client.get(
+        "/metrics/",
+        headers={"Authorization": f"Bearer {create_access_token({'sub': admin})}"},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["db_pool"]["sync"]["enabled"] is True
+    assert "pending" in body["password_hashing"]
+    assert "hit_ratio" in body["user_cache"]
+
+    response = client.get(
+        "/metrics/",
+        headers={"Authorization": f"Bearer {create_access_token({'sub': member})}"},
+    )
+    assert response.status_code == 403
@@ -0,0 +1,47 @@
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_migrations.sqlite")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from sqlalchemy import create_engine, event, inspect, text
+
+from app.migrations import HEAD_VERSION, check_schema, current_version, upgrade
+
+
+def test_upgrade_brings_a_legacy_database_to_head_once(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.sqlite'}")
+    with legacy.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR NOT NULL, email VARCHAR NOT NULL)"))
+        conn.execute(
+            text(
+                "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, "
+                "priority INTEGER NOT NULL DEFAULT 1, completed BOOLEAN NOT NULL DEFAULT 0, "
+                "created_at DATETIME NOT NULL, user_id INTEGER NOT NULL)"
+            )
+        )
+
+    assert current_version(legacy) is None
+    assert upgrade(legacy) == list(range(1, HEAD_VERSION + 1))
+    assert current_version(legacy) == HEAD_VERSION
+
+    columns = {c["name"] for c in inspect(legacy).get_columns("tasks")}
+    assert {"reviewed_at", "scheduled_for", "streak_bound", "completed_at", "updated_at"} <= columns
+    with legacy.connect() as conn:
+        indexes = set(conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+    assert "ix_tasks_user_updated" in indexes
+
+    assert upgrade(legacy) == []
+
+
+def test_boot_check_is_a_single_query_when_schema_is_current(tmp_path):
+    db_engine = create_engine(f"sqlite:///{tmp_path / 'current.sqlite'}")
+    upgrade(db_engine)
+
+    statements: list[str] = []
+    event.listen(
+        db_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    assert check_schema(db_engine) == HEAD_VERSION
+    assert len(statements) == 1
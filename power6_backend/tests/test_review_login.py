@@ -86,3 +86,75 @@ def test_review_login_repairs_stale_password_and_tier():
         assert user.is_admin is False
     finally:
         db.close()
+
+
+def test_repeat_review_login_keeps_stored_hash():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    credentials = {
+        "username_or_email": "app_review_expired",
+        "password": "Power6Review!2026",
+    }
+
+    assert client.post("/auth/login", json=credentials).status_code == 200
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        first_hash = db.query(User).filter(User.username == "app_review_expired").one().hashed_password
+    finally:
+        db.close()
+
+    assert client.post("/auth/login", json=credentials).status_code == 200
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == "app_review_expired").one()
+        assert user.hashed_password == first_hash
+    finally:
+        db.close()
+
+
+def test_login_rehashes_password_made_with_old_cost():
+    import bcrypt
+
+    from app.utils.hash import BCRYPT_ROUNDS
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    from app.database import SessionLocal
+
+    old_hash = bcrypt.hashpw(b"Password123!", bcrypt.gensalt(rounds=4)).decode("utf-8")
+    db = SessionLocal()
+    try:
+        db.add(
+            User(
+                username="low_cost_user",
+                email="low_cost_user@example.com",
+                hashed_password=old_hash,
+                tier="Free",
+            ),
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    app = build_app()
+    client = TestClient(app)
+    response = client.post(
+        "/auth/login",
+        json={"username_or_email": "low_cost_user", "password": "Password123!"},
+    )
+    assert response.status_code == 200
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == "low_cost_user").one()
+        assert user.hashed_password != old_hash
+        assert user.hashed_password.split("$")[2] == f"{BCRYPT_ROUNDS:02d}"
+    finally:
+        db.close()
@@ -0,0 +1,39 @@
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_routing.sqlite")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from fastapi.testclient import TestClient
+
+from app.database import Base, SessionLocal, engine
+from app.main import build_app
+from app.models.models import Task, User
+from app.routes.auth import create_access_token
+
+
+def test_api_prefix_serves_the_same_routes_from_one_table():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(username="routing_user", email="routing_user@example.com", hashed_password="x", tier="Free")
+        db.add(user)
+        db.flush()
+        db.add(Task(title="Route me", priority=1, user_id=user.id))
+        db.commit()
+    finally:
+        db.close()
+
+    app = build_app()
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'routing_user'})}"}
+
+    plain = client.get("/tasks/active", headers=headers)
+    prefixed = client.get("/api/tasks/active", headers=headers)
+    assert plain.status_code == prefixed.status_code == 200
+    assert plain.json() == prefixed.json()
+
+    assert client.get("/health").json() == client.get("/api/health").json() == {"status": "ok"}
+    assert client.get("/apitasks/active", headers=headers).status_code == 404
+
+    assert not any(path.startswith("/api/") for path in app.openapi()["paths"])
@@ -0,0 +1,192 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_streak_rollup.sqlite")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from fastapi.testclient import TestClient
+
+from app.database import Base, engine
+from app.main import build_app
+from app.models.models import Task, User, UserDailyCompletion, UserStreak
+from app.routes.auth import create_access_token
+from app.services.streak_service import rebuild_daily_completions, rebuild_streak_state
+from app.utils.hash import get_password_hash
+
+
+def _seed_user(username: str = "streak_user") -> int:
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user = User(
+            username=username,
+            email=f"{username}@example.com",
+            hashed_password=get_password_hash("Password123!"),
+            tier="Free",
+        )
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def _rollup(user_id: int) -> dict[str, int]:
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        rows = db.query(UserDailyCompletion).filter(
+            UserDailyCompletion.user_id == user_id,
+        )
+        return {row.day.isoformat(): row.count for row in rows}
+    finally:
+        db.close()
+
+
+def test_task_writes_keep_daily_rollup_and_streak_in_sync():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    user_id = _seed_user()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'streak_user'})}"}
+    today = datetime.now(timezone.utc).date().isoformat()
+
+    task_ids = []
+    for index in range(6):
+        response = client.post("/tasks/", headers=headers, json={"title": f"Task {index}"})
+        assert response.status_code == 201
+        task_ids.append(response.json()["id"])
+
+    for task_id in task_ids:
+        assert client.post(f"/tasks/{task_id}/toggle", headers=headers).status_code == 200
+
+    assert _rollup(user_id) == {today: 6}
+    streak = client.get("/streak/", headers=headers).json()
+    assert streak["streak_count"] == 1
+    assert streak["today_count"] == 6
+    assert streak["has_completed_today"] is True
+
+    response = client.patch(
+        f"/tasks/{task_ids[0]}",
+        headers=headers,
+        json={"streak_bound": False},
+    )
+    assert response.status_code == 200
+    assert client.delete(f"/tasks/{task_ids[1]}", headers=headers).status_code == 204
+
+    assert _rollup(user_id) == {today: 4}
+    streak = client.get("/streak/", headers=headers).json()
+    assert streak["streak_count"] == 0
+    assert streak["today_count"] == 4
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        state = db.get(UserStreak, user_id)
+        assert state.current_streak == 0
+        # the only qualifying day no longer qualifies, so the record goes with it
+        assert state.longest_streak == 0
+        assert state.today_count == 4
+        incremental = (state.current_streak, state.longest_streak, state.last_qualifying_day)
+        rebuilt = rebuild_streak_state(db, user_id)
+        assert (rebuilt.current_streak, rebuilt.longest_streak, rebuilt.last_qualifying_day) == incremental
+    finally:
+        db.close()
+
+
+def test_rebuild_daily_completions_backfills_from_tasks():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    user_id = _seed_user("streak_backfill")
+    now = datetime.now(timezone.utc)
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        for days_ago in (0, 1):
+            for index in range(6):
+                db.add(
+                    Task(
+                        user_id=user_id,
+                        title=f"Backfill {days_ago}-{index}",
+                        completed=True,
+                        streak_bound=True,
+                        created_at=now - timedelta(days=days_ago),
+                        completed_at=now - timedelta(days=days_ago),
+                    ),
+                )
+        db.commit()
+
+        assert rebuild_daily_completions(db, user_id) == 2
+        db.commit()
+    finally:
+        db.close()
+
+    rollup = _rollup(user_id)
+    assert rollup[now.date().isoformat()] == 6
+    assert rollup[(now - timedelta(days=1)).date().isoformat()] == 6
+
+    app = build_app()
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'streak_backfill'})}"}
+    assert client.get("/streak/", headers=headers).json()["streak_count"] == 2
+
+    refreshed = client.post("/streak/refresh", headers=headers).json()
+    assert refreshed["ok"] is True
+    assert refreshed["streak_count"] == 2
+
+    db = SessionLocal()
+    try:
+        state = db.get(UserStreak, user_id)
+        assert state.current_streak == 2
+        assert state.longest_streak == 2
+    finally:
+        db.close()
+
+
+def test_uncompleting_the_head_of_a_shorter_run_skips_the_rebuild():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    user_id = _seed_user("streak_head")
+    today = datetime.now(timezone.utc).date()
+
+    from sqlalchemy import event
+
+    from app.database import SessionLocal
+    from app.services.streak_service import record_completion_change
+
+    db = SessionLocal()
+    try:
+        # a 3-day record run ending a week ago, and a 2-day run ending today
+        for days_ago in (9, 8, 7, 1, 0):
+            db.add(UserDailyCompletion(user_id=user_id, day=today - timedelta(days=days_ago), count=6))
+        db.commit()
+        rebuild_streak_state(db, user_id)
+        db.commit()
+
+        rollup_reads: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT") and "user_daily_completions" in statement:
+                rollup_reads.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            record_completion_change(db, user_id, today, None)
+            db.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+
+        assert rollup_reads == []
+        state = db.get(UserStreak, user_id)
+        assert (state.current_streak, state.longest_streak) == (1, 3)
+        assert state.last_qualifying_day == today - timedelta(days=1)
+        rebuilt = rebuild_streak_state(db, user_id)
+        assert (rebuilt.current_streak, rebuilt.longest_streak) == (1, 3)
+    finally:
+        db.close()
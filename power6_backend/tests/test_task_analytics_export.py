@@ -1,3 +1,4 @@
+import json
 import os
 from datetime import datetime, timedelta, timezone
 
@@ -10,6 +11,7 @@ from app.database import Base, engine
 from app.main import build_app
 from app.models.models import Task, User
 from app.routes.auth import create_access_token
+from app.services.analytics_cache import analytics_cache_stats, clear_analytics_cache
 from app.utils.hash import get_password_hash
 
 
@@ -60,6 +62,7 @@ def _seed_user_with_tasks(tier: str = "pro") -> str:
 def test_pro_task_analytics_returns_summary():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    clear_analytics_cache()
     app = build_app()
     client = TestClient(app)
     username = _seed_user_with_tasks("pro")
@@ -111,3 +114,196 @@ def test_task_analytics_blocks_free_users():
     )
 
     assert response.status_code == 403
+
+
+def test_task_csv_export_streams_in_batches_with_optional_gzip(monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    username = _seed_user_with_tasks("pro")
+    token = create_access_token({"sub": username})
+
+    from app.services import task_export
+
+    monkeypatch.setattr(task_export, "EXPORT_BATCH_SIZE", 1)
+    batch_sizes: list[int] = []
+    iter_batches = task_export.iter_history_batches
+
+    async def counting_batches(*args, **kwargs):
+        async for batch in iter_batches(*args, **kwargs):
+            batch_sizes.append(len(batch))
+            yield batch
+
+    monkeypatch.setattr(task_export, "iter_history_batches", counting_batches)
+
+    response = client.get(
+        "/tasks/export.csv",
+        headers={"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    lines = response.text.strip().splitlines()
+    assert lines[0] == "id,title,notes,priority,streak_bound,created_at,completed_at,reviewed_at"
+    assert len(lines) == 3
+    # one cursor partition per row, each sent as its own chunk
+    assert batch_sizes == [1, 1]
+
+    response = client.get(
+        "/tasks/export.csv",
+        headers={"Authorization": f"Bearer {token}", "Accept-Encoding": "identity"},
+    )
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert "Inbox zero" in response.text
+
+
+def test_task_export_formats_share_the_history_filter():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    username = _seed_user_with_tasks("pro")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+    response = client.get("/tasks/export", headers=headers, params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert {row["title"] for row in rows} == {"Close priority proposal", "Inbox zero"}
+    assert isinstance(rows[0]["streak_bound"], bool)
+
+    response = client.get("/tasks/export", headers=headers, params={"format": "xml"})
+    assert response.status_code == 400
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        response = client.get("/tasks/export", headers=headers, params={"format": "parquet"})
+        assert response.status_code == 501
+        return
+
+    response = client.get("/tasks/export", headers=headers, params={"format": "arrow"})
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 2
+    assert table.schema.field("priority").type == pa.int8()
+
+    response = client.get("/tasks/export", headers=headers, params={"format": "parquet"})
+    assert response.status_code == 200
+    table = pq.read_table(pa.BufferReader(response.content))
+    assert sorted(table.column("title").to_pylist()) == ["Close priority proposal", "Inbox zero"]
+
+
+def test_task_analytics_groups_by_utc_day_in_sql():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    clear_analytics_cache()
+    app = build_app()
+    client = TestClient(app)
+    username = _seed_user_with_tasks("pro")
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == username).one()
+        now = datetime.now(timezone.utc)
+        db.add_all(
+            [
+                Task(
+                    user_id=user.id,
+                    title=f"Older {i}",
+                    priority=1,
+                    completed=True,
+                    streak_bound=True,
+                    created_at=now - timedelta(days=3, hours=1),
+                    completed_at=now - timedelta(days=3),
+                )
+                for i in range(2)
+            ]
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.get(
+        "/tasks/analytics",
+        headers={"Authorization": f"Bearer {create_access_token({'sub': username})}"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["completed_tasks"] == 4
+    assert data["streak_bound_completed"] == 3
+    newest = (datetime.now(timezone.utc) - timedelta(days=1)).date().isoformat()
+    # two days tie on count; the most recent one wins
+    assert data["best_day"] == {"day": newest, "completed": 2}
+    assert [point["completed"] for point in data["recent_trend"]] == [2, 2]
+    assert data["recent_trend"][0]["day"] == newest
+
+
+def test_task_analytics_cache_hits_until_a_task_write_touches_the_range():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    clear_analytics_cache()
+    app = build_app()
+    client = TestClient(app)
+    username = _seed_user_with_tasks("pro")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+    first = client.get("/tasks/analytics", headers=headers).json()
+    hits = analytics_cache_stats()["hits"]
+    assert client.get("/tasks/analytics", headers=headers).json() == first
+    assert analytics_cache_stats()["hits"] == hits + 1
+
+    # completions outside the cached range leave it alone
+    old_range = {"from_date": "2020-01-01", "to_date": "2020-01-31"}
+    assert client.get("/tasks/analytics", headers=headers, params=old_range).status_code == 200
+
+    created = client.post("/tasks/", headers=headers, json={"title": "Fresh"}).json()
+    assert client.get("/tasks/analytics", headers=headers).json() == first
+
+    assert client.post(f"/tasks/{created['id']}/toggle", headers=headers).status_code == 200
+    updated = client.get("/tasks/analytics", headers=headers).json()
+    assert updated["completed_tasks"] == first["completed_tasks"] + 1
+
+
+class _FrozenClock(datetime):
+    """datetime whose now() is 2026-03-01 23:30 UTC, late enough that most zones are on another day."""
+
+    @classmethod
+    def now(cls, tz=None):
+        frozen = datetime(2026, 3, 1, 23, 30, tzinfo=timezone.utc)
+        return frozen.astimezone(tz) if tz is not None else frozen.replace(tzinfo=None)
+
+
+def test_history_criteria_default_window_ends_on_the_utc_day(monkeypatch):
+    from app.services import task_export
+
+    monkeypatch.setattr(task_export, "datetime", _FrozenClock)
+    bounds = [clause.right.value for clause in task_export.history_criteria(1)[2:]]
+    assert bounds[0] == datetime(2026, 1, 30, tzinfo=timezone.utc)
+    assert bounds[1].date().isoformat() == "2026-03-01"
+    assert bounds[1].tzinfo is not None
+
+
+def test_analytics_cache_keys_default_range_on_the_utc_day(monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    clear_analytics_cache()
+    client = TestClient(build_app())
+    username = _seed_user_with_tasks("pro")
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+    from datetime import date
+
+    from app.services import task_export
+    from app.services.analytics_cache import get_cached_analytics
+    from app.services.principal_cache import get_cached_principal
+
+    monkeypatch.setattr(task_export, "datetime", _FrozenClock)
+    assert client.get("/tasks/analytics", headers=headers).status_code == 200
+
+    uid = get_cached_principal(username).id
+    assert get_cached_analytics(uid, date(2026, 1, 30), date(2026, 3, 1)) is not None
@@ -0,0 +1,71 @@
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_task_bulk.sqlite")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from fastapi.testclient import TestClient
+
+from app.database import Base, SessionLocal, engine
+from app.main import build_app
+from app.models.models import Task, TaskTombstone, User
+from app.routes.auth import create_access_token
+from app.services.analytics_cache import clear_analytics_cache
+
+
+def _seed() -> tuple[str, list[int], int]:
+    db = SessionLocal()
+    try:
+        user = User(username="bulk_user", email="bulk_user@example.com", hashed_password="x", tier="pro")
+        other = User(username="bulk_other", email="bulk_other@example.com", hashed_password="x", tier="pro")
+        db.add_all([user, other])
+        db.flush()
+        tasks = [Task(user_id=user.id, title=f"Bulk {i}", priority=1) for i in range(8)]
+        foreign = Task(user_id=other.id, title="Not yours", priority=1)
+        db.add_all([*tasks, foreign])
+        db.commit()
+        return user.username, [t.id for t in tasks], foreign.id
+    finally:
+        db.close()
+
+
+def test_bulk_applies_operations_in_one_request_with_per_item_results():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    clear_analytics_cache()
+    client = TestClient(build_app())
+    username, ids, foreign_id = _seed()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+    operations = [{"op": "toggle", "id": task_id} for task_id in ids[:6]]
+    operations += [
+        {"op": "patch", "id": ids[6], "changes": {"title": "Renamed", "priority": "high"}},
+        {"op": "delete", "id": ids[7]},
+        {"op": "toggle", "id": ids[7]},
+        {"op": "delete", "id": foreign_id},
+    ]
+    response = client.post("/tasks/bulk", headers=headers, json={"operations": operations})
+    assert response.status_code == 200
+    body = response.json()
+
+    statuses = [item["status"] for item in body["results"]]
+    assert statuses == [200] * 7 + [204, 404, 404]
+    assert all(item["task"]["completed"] for item in body["results"][:6])
+    assert body["results"][6]["task"]["title"] == "Renamed"
+    assert body["results"][6]["task"]["priority"] == 2
+    assert body["streak"]["today_count"] == 6
+    assert body["streak"]["has_completed_today"] is True
+
+    db = SessionLocal()
+    try:
+        assert db.get(Task, ids[7]) is None
+        assert db.get(Task, foreign_id) is not None
+        assert db.query(TaskTombstone).filter(TaskTombstone.task_id == ids[7]).count() == 1
+        assert all(db.get(Task, task_id).completed for task_id in ids[:6])
+    finally:
+        db.close()
+
+    streak = client.get("/streak/", headers=headers).json()
+    assert streak["today_count"] == 6
+
+    invalid = client.post("/tasks/bulk", headers=headers, json={"operations": [{"op": "patch", "id": ids[0]}]})
+    assert invalid.status_code == 422
@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_task_quota.sqlite")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.database import Base, SessionLocal, engine
+from app.main import build_app
+from app.models.models import User, UserDailyTaskQuota
+from app.routes.auth import create_access_token
+from app.services.task_quota import claim_new_task_slot, quota_day
+
+
+def _seed_user(username: str, tier: str) -> int:
+    db = SessionLocal()
+    try:
+        user = User(username=username, email=f"{username}@example.com", hashed_password="x", tier=tier)
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def test_daily_quota_blocks_the_seventh_create_and_frees_a_slot_on_delete(monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(settings, "DAILY_NEW_TASK_LIMITS", "pro=8")
+    client = TestClient(build_app())
+    _seed_user("quota_free", "Free")
+    _seed_user("quota_pro", "pro")
+    free = {"Authorization": f"Bearer {create_access_token({'sub': 'quota_free'})}"}
+    pro = {"Authorization": f"Bearer {create_access_token({'sub': 'quota_pro'})}"}
+
+    ids = [client.post("/tasks/", headers=free, json={"title": f"Free {i}"}).json()["id"] for i in range(6)]
+    blocked = client.post("/tasks/", headers=free, json={"title": "One too many"})
+    assert blocked.status_code == 400
+    assert "(6)" in blocked.json()["detail"]
+
+    assert client.delete(f"/tasks/{ids[0]}", headers=free).status_code == 204
+    assert client.post("/tasks/", headers=free, json={"title": "Replacement"}).status_code == 201
+    assert client.post("/tasks/", headers=free, json={"title": "Still blocked"}).status_code == 400
+
+    statuses = [client.post("/tasks/", headers=pro, json={"title": f"Pro {i}"}).status_code for i in range(9)]
+    assert statuses == [201] * 8 + [400]
+
+
+def test_concurrent_claims_never_exceed_the_limit():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    uid = _seed_user("quota_race", "Free")
+
+    def claim(_):
+        db = SessionLocal()
+        try:
+            claimed = claim_new_task_slot(db, uid, 6)
+            db.commit()
+            return claimed
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(claim, range(16)))
+
+    assert results.count(True) == 6
+    db = SessionLocal()
+    try:
+        assert db.get(UserDailyTaskQuota, (uid, quota_day())).created == 6
+    finally:
+        db.close()
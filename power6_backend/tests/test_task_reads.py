@@ -0,0 +1,201 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_task_reads.sqlite")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from fastapi.testclient import TestClient
+
+from app.database import Base, engine
+from app.main import build_app
+from app.models.models import Task, User
+from app.routes.auth import create_access_token
+from app.utils.hash import get_password_hash
+
+
+def _seed_user_with_tasks(count: int) -> str:
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        user = User(
+            username="cursor_user",
+            email="cursor_user@example.com",
+            hashed_password=get_password_hash("Password123!"),
+            tier="pro",
+        )
+        db.add(user)
+        db.flush()
+
+        base = datetime.now(timezone.utc) - timedelta(days=1)
+        db.add_all(
+            [
+                Task(
+                    user_id=user.id,
+                    title=f"Task {i}",
+                    priority=i % 3,
+                    # pairs share a timestamp so the id tiebreaker matters
+                    created_at=base + timedelta(minutes=i // 2),
+                    updated_at=base + timedelta(minutes=i // 2),
+                )
+                for i in range(count)
+            ]
+        )
+        db.commit()
+        return user.username
+    finally:
+        db.close()
+
+
+def test_cursor_pages_cover_every_task_once_and_ignore_new_rows():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    username = _seed_user_with_tasks(7)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+    response = client.get("/tasks/", headers=headers, params={"limit": 3})
+    assert response.status_code == 200
+    seen = [t["id"] for t in response.json()]
+    cursor = response.headers["X-Next-Cursor"]
+
+    # a task created mid-scan sorts before the cursor and must not shift later pages
+    assert client.post("/tasks/", headers=headers, json={"title": "Late arrival"}).status_code == 201
+
+    while cursor:
+        response = client.get("/tasks/", headers=headers, params={"limit": 3, "cursor": cursor})
+        assert response.status_code == 200
+        seen.extend(t["id"] for t in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+
+    offset_page = client.get("/tasks/", headers=headers, params={"limit": 3, "offset": 3})
+    assert offset_page.status_code == 200
+    assert len(offset_page.json()) == 3
+
+    response = client.get("/tasks/", headers=headers, params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    response = client.get(
+        "/tasks/",
+        headers=headers,
+        params={"order": "completed_at", "cursor": cursor or "x"},
+    )
+    assert response.status_code == 400
+
+
+def test_changes_returns_full_set_then_only_deltas_and_tombstones():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    username = _seed_user_with_tasks(3)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+    response = client.get("/tasks/changes", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["full_resync"] is True
+    assert len(body["changed"]) == 3
+    first_id = body["changed"][0]["id"]
+
+    created = client.post("/tasks/", headers=headers, json={"title": "Fresh"}).json()
+    assert client.delete(f"/tasks/{first_id}", headers=headers).status_code == 204
+
+    response = client.get("/tasks/changes", headers=headers, params={"since": body["sync_token"]})
+    assert response.status_code == 200
+    delta = response.json()
+    assert delta["full_resync"] is False
+    assert [t["id"] for t in delta["changed"]] == [created["id"]]
+    assert delta["deleted"] == [first_id]
+
+    response = client.get("/tasks/changes", headers=headers, params={"since": "garbage"})
+    assert response.json()["full_resync"] is True
+
+
+def test_polled_reads_answer_304_until_tasks_change():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    username = _seed_user_with_tasks(2)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+    for path in ("/tasks/active", "/tasks/history", "/streak/", "/users/me"):
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        response = client.get(path, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+    etag = client.get("/tasks/active", headers=headers).headers["ETag"]
+    assert client.post("/tasks/", headers=headers, json={"title": "Changes the set"}).status_code == 201
+    response = client.get("/tasks/active", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_list_reads_serialize_like_task_read():
+    from app.database import SessionLocal
+    from app.services.task_service import to_task_read
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    username = _seed_user_with_tasks(5)
+
+    db = SessionLocal()
+    try:
+        tasks = db.query(Task).order_by(Task.id).all()
+        # day_key follows scheduled_for when set, even across a day boundary
+        tasks[0].scheduled_for = datetime.now(timezone.utc) + timedelta(days=2)
+        tasks[1].notes = "with notes"
+        tasks[2].completed = True
+        tasks[2].completed_at = datetime.now(timezone.utc)
+        db.commit()
+    finally:
+        db.close()
+    db = SessionLocal()
+    try:
+        # what the ORM path returned: TaskRead built from freshly loaded rows
+        expected = {t.id: to_task_read(t).model_dump(mode="json") for t in db.query(Task).all()}
+    finally:
+        db.close()
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+    listed = client.get("/tasks/", headers=headers, params={"limit": 10}).json()
+    active = client.get("/tasks/active", headers=headers).json()
+    changes = client.get("/tasks/changes", headers=headers).json()
+
+    assert {row["id"]: row for row in listed} == expected
+    assert {row["id"]: row for row in active} == expected
+    assert {row["id"]: row for row in changes["changed"]} == expected
+    assert list(listed[0]) == list(expected[listed[0]["id"]])
+
+
+def test_history_etag_rolls_over_at_utc_midnight(monkeypatch):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = build_app()
+    client = TestClient(app)
+    username = _seed_user_with_tasks(2)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+    from app.services import task_service
+
+    clock = {"now": datetime(2026, 3, 1, 23, 30, tzinfo=timezone.utc)}
+    monkeypatch.setattr(task_service, "now_utc", lambda: clock["now"])
+
+    etag = client.get("/tasks/history", headers=headers).headers["ETag"]
+    clock["now"] += timedelta(minutes=20)
+    # same UTC day: the default range has not moved
+    assert client.get("/tasks/history", headers={**headers, "If-None-Match": etag}).status_code == 304
+    clock["now"] += timedelta(minutes=20)
+    # past UTC midnight the default 30-day window shifts, whatever the server's local zone
+    response = client.get("/tasks/history", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
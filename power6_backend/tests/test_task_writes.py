@@ -0,0 +1,72 @@
+import os
+import re
+from contextlib import contextmanager
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_task_writes.sqlite")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import Base, SessionLocal, async_engine, engine
+from app.main import build_app
+from app.models.models import User
+from app.routes.auth import create_access_token
+
+_TASKS_TABLE = re.compile(r"\btasks\b")
+
+
+@contextmanager
+def _task_statements():
+    """Collect the leading keyword of every statement that touches ``tasks``."""
+    seen: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if _TASKS_TABLE.search(statement):
+            seen.append(statement.split(None, 1)[0].upper())
+
+    engines = [engine] + ([async_engine.sync_engine] if async_engine is not None else [])
+    for target in engines:
+        event.listen(target, "before_cursor_execute", record)
+    try:
+        yield seen
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", record)
+
+
+def test_task_writes_issue_no_reload_select_after_the_write():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add(User(username="writes_user", email="writes_user@example.com", hashed_password="x", tier="pro"))
+        db.commit()
+    finally:
+        db.close()
+    client = TestClient(build_app())
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'writes_user'})}"}
+
+    with _task_statements() as statements:
+        created = client.post("/tasks/", headers=headers, json={"title": "Write once", "priority": "high"})
+    assert created.status_code == 201
+    task = created.json()
+    assert task["id"] and task["created_at"] and task["priority"] == 2
+    # the daily limit is a quota-row upsert, so the INSERT is the only tasks statement
+    assert statements == ["INSERT"]
+
+    for method, path, body in (
+        ("patch", f"/tasks/{task['id']}", {"title": "Patched"}),
+        ("put", f"/tasks/{task['id']}", {"notes": "Updated"}),
+        ("post", f"/tasks/{task['id']}/toggle", None),
+    ):
+        with _task_statements() as statements:
+            response = client.request(method.upper(), path, headers=headers, json=body)
+        assert response.status_code == 200, (method, response.text)
+        # owned-task lookup + UPDATE, and nothing re-reading the row afterwards
+        assert statements == ["SELECT", "UPDATE"], (method, statements)
+
+    final = response.json()
+    assert final["title"] == "Patched"
+    assert final["notes"] == "Updated"
+    assert final["completed"] is True and final["completed_at"] is not None